@@ -0,0 +1,63 @@
+"""
+Benchmark: time to first answer token (TTFAT) — waiting for the consolidated
+ANSWER event vs reading ANSWER_DELTA events as the model generates. A fake
+LangGraph stream replays a tool call followed by an answer of --tokens tokens
+arriving every --token-ms milliseconds; no LLM or database calls are made.
+
+Run from api/:  python benchmarks/bench_answer_streaming.py [--tokens N] [--token-ms MS]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath("."))
+
+from src.agent.event_bus import EventBus
+from src.agent.events import EventType
+from src.utils.streaming import stream_agent_events
+
+
+class Chunk:
+    def __init__(self, content: str) -> None:
+        self.content = content
+
+
+async def fake_graph(tokens: int, token_ms: float):
+    yield {"event": "on_chat_model_stream", "data": {"chunk": Chunk("Plan: run one query.")}}
+    yield {"event": "on_tool_start", "name": "task"}
+    yield {"event": "on_tool_end", "name": "task"}
+    for i in range(tokens):
+        await asyncio.sleep(token_ms / 1e3)
+        yield {"event": "on_chat_model_stream", "data": {"chunk": Chunk(f"word{i} ")}}
+
+
+async def measure(tokens: int, token_ms: float) -> tuple[float, float, float]:
+    """Return (first delta, consolidated answer, total) in ms."""
+    started = time.perf_counter()
+    first_delta = answer = 0.0
+    async for event in stream_agent_events(fake_graph(tokens, token_ms), "q", EventBus(), []):
+        elapsed = (time.perf_counter() - started) * 1e3
+        if event.type == EventType.ANSWER_DELTA and not first_delta:
+            first_delta = elapsed
+        elif event.type == EventType.ANSWER:
+            answer = elapsed
+    return first_delta, answer, (time.perf_counter() - started) * 1e3
+
+
+def main(tokens: int, token_ms: float) -> None:
+    first_delta, answer, total = asyncio.run(measure(tokens, token_ms))
+    print(f"Answer of {tokens} tokens at {token_ms} ms/token")
+    print(f"  TTFAT, ANSWER only    {answer:10.1f} ms")
+    print(f"  TTFAT, ANSWER_DELTA   {first_delta:10.1f} ms")
+    print(f"  stream total          {total:10.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--token-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    main(args.tokens, args.token_ms)
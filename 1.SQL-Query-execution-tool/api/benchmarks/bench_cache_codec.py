@@ -0,0 +1,73 @@
+"""
+Benchmark: decoding cached result sets — legacy JSON text vs the binary codec
+(uncompressed, zlib, and lz4 when installed). Also reports stored size.
+
+Run from api/:  python benchmarks/bench_cache_codec.py [--rows N] [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.append(os.path.abspath("."))
+
+from src.cache import codec
+from src.db.result import ColumnarResult
+from src.utils import serializer
+
+
+def make_result(rows: int) -> ColumnarResult:
+    started = datetime(2024, 1, 1)
+    return ColumnarResult(
+        columns=["id", "customer", "region", "amount", "created_at"],
+        rows=[
+            (i, f"customer-{i % 5000}", ("north", "south", "east", "west")[i % 4],
+             Decimal(i % 10000) / 100, started + timedelta(minutes=i))
+            for i in range(rows)
+        ],
+    )
+
+
+def best_of(repeat: int, fn) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main(rows: int, repeat: int) -> None:
+    result = make_result(rows)
+    # What set_cached_result stored before the codec: JSON text of the payload.
+    legacy = json.dumps(json.loads(serializer.dumps(result.to_payload())))
+    blobs = {"legacy json": legacy.encode()}
+    for compression in ("none", "zlib", "lz4"):
+        if compression == "lz4" and codec.lz4_frame is None:
+            continue
+        blobs[f"codec {compression}"] = codec.encode(result, compression=compression, min_compress_bytes=0)
+
+    print(f"Cache codec benchmark | rows={rows}")
+    for name, blob in blobs.items():
+        decode = best_of(repeat, lambda: codec.decode(blob))
+        encode = (
+            best_of(repeat, lambda: json.dumps(result.to_payload(), default=serializer._default))
+            if name == "legacy json"
+            else best_of(repeat, lambda: codec.encode(result, compression=name.split()[1], min_compress_bytes=0))
+        )
+        print(
+            f"{name:<12} size {len(blob) / 1e6:6.2f} MB | "
+            f"encode {encode * 1000:7.1f} ms | decode {decode * 1000:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
@@ -0,0 +1,52 @@
+"""
+Benchmark: per-request setup cost of the supervisor graph — building it on
+every request (the previous DeepAgent behaviour) vs the compiled-graph cache.
+No LLM or database calls are made; only graph construction is timed.
+
+Run from api/:  python benchmarks/bench_graph_cache.py [--iterations N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath("."))
+# Client construction needs a key; nothing is sent to the provider.
+os.environ.setdefault("LLM_API_KEY", "sk-benchmark")
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from src.agent.deepagent_builder import build_supervisor_graph, clear_graph_cache, get_supervisor_graph
+
+
+def per_request(iterations: int, fn) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations
+
+
+def main(iterations: int) -> None:
+    checkpointer = InMemorySaver()
+    runtime = {"enabled_skills": [], "skill_dirs": [], "mcp_servers": []}
+
+    print(f"Supervisor graph setup per request | iterations={iterations}")
+    started = time.perf_counter()
+    build_supervisor_graph("postgresql", checkpointer, runtime)
+    print(f"  first build       {(time.perf_counter() - started) * 1e3:10.2f} ms")
+
+    rebuild = per_request(iterations, lambda: build_supervisor_graph("postgresql", checkpointer, runtime))
+    clear_graph_cache()
+    get_supervisor_graph("postgresql", checkpointer, runtime)  # compile once
+    cached = per_request(iterations * 100, lambda: get_supervisor_graph("postgresql", checkpointer, runtime))
+    print(f"  build per request {rebuild * 1e3:10.2f} ms")
+    print(f"  cached lookup     {cached * 1e3:10.4f} ms")
+    print(f"  speed-up          {rebuild / cached:10.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+    main(args.iterations)
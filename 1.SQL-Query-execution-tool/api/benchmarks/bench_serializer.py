@@ -0,0 +1,77 @@
+"""
+Benchmark: src.utils.serializer vs stdlib json on a 100k-row result payload
+with Decimal, datetime, UUID and bytes columns (the shape execute_sql returns).
+
+Run from api/:  python benchmarks/bench_serializer.py [--rows N] [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.append(os.path.abspath("."))
+
+from src.agent.events import AgentEvent, EventType, to_wire
+from src.utils import serializer
+
+
+def make_payload(rows: int) -> dict:
+    started = datetime(2024, 1, 1)
+    return {
+        "columns": ["id", "customer", "amount", "created_at", "ref", "blob"],
+        "rows": [
+            (
+                i,
+                f"customer-{i}",
+                Decimal(i) / 100,
+                started + timedelta(minutes=i),
+                uuid.UUID(int=i),
+                i.to_bytes(4, "big"),
+            )
+            for i in range(rows)
+        ],
+        "row_count": rows,
+        "truncated": False,
+    }
+
+
+def best_of(repeat: int, fn) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main(rows: int, repeat: int) -> None:
+    payload = make_payload(rows)
+    event = AgentEvent(type=EventType.RESULT, columns=payload["columns"], rows=payload["rows"], row_count=rows)
+
+    print(f"Serializer benchmark | rows={rows} backend={'orjson' if serializer.orjson else 'json'}")
+    cases = {
+        "result payload": payload,
+        "SSE event (records)": to_wire(event, "records"),
+        "SSE event (columnar)": to_wire(event, "columnar"),
+    }
+    for name, obj in cases.items():
+        baseline = best_of(repeat, lambda: json.dumps(obj, default=serializer._default))
+        fast = best_of(repeat, lambda: serializer.dumps(obj))
+        size = len(serializer.dumps_bytes(obj))
+        print(
+            f"{name:<22} json {baseline * 1000:8.1f} ms | serializer {fast * 1000:8.1f} ms"
+            f" | {baseline / fast:5.1f}x | {size / 1e6:.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
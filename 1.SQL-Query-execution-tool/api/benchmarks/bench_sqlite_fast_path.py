@@ -0,0 +1,100 @@
+"""
+Micro-benchmark: SQLiteAdapter raw driver paths vs the SQLAlchemy paths they
+replace, on a temporary SQLite file: execute_query vs an AsyncSession, and
+_fetch_bounded (what execute_sql runs) over the raw execute_query_stream vs
+SQLAlchemy's conn.stream().
+
+Run from api/:  python benchmarks/bench_sqlite_fast_path.py [--rows N] [--iterations N]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath("."))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from src.config.settings import get_settings
+from src.db.adapters.base import DatabaseAdapter
+from src.db.adapters.sqlite import SQLiteAdapter
+from src.db.result import ColumnarResult
+from src.tools.execute_sql import _fetch_bounded
+
+QUERIES = {
+    "point lookup": "SELECT id, name, amount FROM bench WHERE id = 42",
+    "full scan": "SELECT id, name, amount FROM bench",
+}
+
+
+async def session_path(factory: sessionmaker, sql: str) -> ColumnarResult:
+    """The pre-fast-path execute_query: ORM session + SQLAlchemy Result."""
+    async with factory() as session:
+        result = await session.execute(text(sql))
+        columns = list(result.keys())
+        rows = [tuple(row) for row in result.fetchall()]
+        return ColumnarResult(columns=columns, rows=rows)
+
+
+class SQLAlchemyStreamAdapter(SQLiteAdapter):
+    """execute_query_stream through SQLAlchemy Row objects (the pre-fast-path stream)."""
+
+    _stream_batches = DatabaseAdapter._stream_batches
+
+
+async def timed(label: str, iterations: int, call) -> float:
+    await call()  # warm-up
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await call()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<10} {elapsed / iterations * 1e6:10.1f} us/query")
+    return elapsed
+
+
+async def main(rows: int, iterations: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        adapter = SQLiteAdapter(dsn=f"sqlite+aiosqlite:///{tmp}/bench.db")
+        await adapter.connect()
+        async with adapter._engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE bench (id INTEGER PRIMARY KEY, name TEXT, amount REAL)"))
+            await conn.execute(
+                text("INSERT INTO bench VALUES (:id, :name, :amount)"),
+                [{"id": i, "name": f"row-{i}", "amount": i * 1.5} for i in range(rows)],
+            )
+        factory = sessionmaker(bind=adapter._engine, class_=AsyncSession, expire_on_commit=False)
+
+        print(f"SQLite execute_query | rows={rows} iterations={iterations}")
+        for name, sql in QUERIES.items():
+            n = iterations if name == "point lookup" else max(iterations // 50, 5)
+            print(f"{name}:")
+            slow = await timed("session", n, lambda: session_path(factory, sql))
+            fast = await timed("raw", n, lambda: adapter.execute_query(sql))
+            print(f"  speed-up   {slow / fast:10.2f}x")
+
+        settings = get_settings()
+        batch_size, max_rows = settings.sql_stream_batch_size, settings.sql_max_result_rows
+        generic = SQLAlchemyStreamAdapter(dsn=adapter._dsn)
+        await generic.connect()
+        print(f"_fetch_bounded | batch_size={batch_size} max_rows={max_rows}")
+        for name, sql in QUERIES.items():
+            n = iterations if name == "point lookup" else max(iterations // 50, 5)
+            print(f"{name}:")
+            slow = await timed("sqlalchemy", n, lambda: _fetch_bounded(generic, sql, batch_size, max_rows))
+            fast = await timed("raw", n, lambda: _fetch_bounded(adapter, sql, batch_size, max_rows))
+            print(f"  speed-up   {slow / fast:10.2f}x")
+        await generic.disconnect()
+        await adapter.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--iterations", type=int, default=2_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.iterations))
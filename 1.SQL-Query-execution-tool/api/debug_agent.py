@@ -5,6 +5,8 @@ import os
 sys.path.append(os.path.abspath("."))
 
 from src.agent.deepagent_builder import build_supervisor_graph
+from src.agent.event_bus import EventBus
+from src.agent.run_context import RunContext, bind_run
 from src.db.adapters.factory import get_adapter
 from src.semantic.layer import SemanticLayer
 from src.agent.events import AgentEvent
@@ -33,7 +35,7 @@ async def debug_tools():
     print("Testing tool types...")
     adapter = get_adapter()
     semantic_layer = SemanticLayer(adapter)
-    captured_events = []
+    events = EventBus()
     checkpointer = InMemorySaver()
     
     # Check dependencies
@@ -41,12 +43,8 @@ async def debug_tools():
     check_for_runnable_binding(adapter, "adapter")
     check_for_runnable_binding(semantic_layer, "semantic_layer")
     
-    agent = build_supervisor_graph(
-        adapter,
-        semantic_layer,
-        captured_events,
-        checkpointer
-    )
+    bind_run(RunContext(adapter, semantic_layer, events))
+    agent = build_supervisor_graph(adapter.dialect, checkpointer)
     print("Agent built successfully!")
     
     # Try to find the tool in the graph's tool node
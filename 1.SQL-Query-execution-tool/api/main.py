@@ -1,11 +1,12 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from src.api.routes import agent_config, auth, chat, health, schema
+from src.api.routes import agent_config, auth, cache, chat, health, schema
 from src.config.settings import get_settings
-from src.db.adapters.factory import get_adapter
+from src.db.adapters.factory import get_datasource_registry
 from src.utils.db import check_db_connection
 
 settings = get_settings()
@@ -13,19 +14,43 @@ settings = get_settings()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Connect the database adapter on startup, disconnect on shutdown."""
-    adapter = get_adapter()
-    await adapter.connect()
+    """Connect the default datasource on startup, disconnect all on shutdown."""
+    registry = get_datasource_registry()
+    adapter = await registry.acquire()
 
     # Verify the connection is actually alive before accepting traffic
     await check_db_connection(adapter)
 
+    # Named datasources connect on first use; idle ones are disconnected.
+    background = [asyncio.create_task(registry.run_evictor())]
+
+    if settings.result_cache_version_poll_seconds > 0:
+        from src.cache.invalidation import TableVersionPoller
+        poller = TableVersionPoller(registry, settings.result_cache_version_poll_seconds)
+        background.append(asyncio.create_task(poller.run()))
+
+    # Warm the result cache from the query log while traffic is already served.
+    if settings.result_cache_warmup_queries > 0:
+        from src.cache.warmup import warm_cache
+        background.append(asyncio.create_task(warm_cache(
+            adapter,
+            settings.result_cache_warmup_queries,
+            settings.result_cache_warmup_concurrency,
+            settings.result_cache_warmup_max_ms,
+        )))
+
     yield
-    await adapter.disconnect()
+    for task in background:
+        task.cancel()
+    await asyncio.gather(*background, return_exceptions=True)
+    await registry.close_all()
 
     from src.cache.redis_client import close_redis
     await close_redis()
 
+    from src.llm.llm_factory import close_llm_clients
+    await close_llm_clients()
+
 
 def create_app() -> FastAPI:
     mcp_app = None
@@ -56,6 +81,7 @@ def create_app() -> FastAPI:
     app.include_router(chat.router,   prefix="/api")
     app.include_router(agent_config.router, prefix="/api")
     app.include_router(health.router, prefix="/api")
+    app.include_router(cache.router,  prefix="/api")
     app.include_router(schema.router, prefix="/api")
 
     if mcp_app is not None:
@@ -1,18 +1,29 @@
 import uuid
+from contextlib import aclosing
 from typing import Any, AsyncGenerator
 
 from langgraph.types import Command
 
 from src.log import get_logger
 from src.agent.checkpointer import get_checkpointer
-from src.agent.deepagent_builder import build_supervisor_graph
+from src.agent.deepagent_builder import get_supervisor_graph
+from src.agent.event_bus import EventBus
+from src.agent.run_context import RunContext, bind_run
 from src.agent.events import AgentEvent, EventType
 from src.config.settings import get_settings
 from src.db.adapters.base import DatabaseAdapter
+from src.db.adapters.factory import acquire_adapter, hold_adapter
 from src.semantic.layer import SemanticLayer
 from src.utils.streaming import stream_agent_events
 from src.utils.history import build_chat_messages, save_chat_response
 from src.cache.redis_client import get_session_history
+from src.cache.question_cache import (
+    get_cached_answer,
+    question_scope,
+    recall_thread,
+    remember_thread,
+    set_cached_answer,
+)
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -25,12 +36,21 @@ class DeepAgent:
         self._adapter = adapter
         self._semantic_layer = SemanticLayer(adapter)
         self._checkpointer = get_checkpointer(settings)
-        self._captured_events: list[AgentEvent] = []
         self._thread_map: dict[str, str] = {}
         self._reject_counts: dict[str, int] = {}
         self._session_last_query: dict[str, str] = {}
         logger.info("DeepAgent initialised | dialect=%s", adapter.dialect)
 
+    @classmethod
+    async def for_datasource(cls, datasource_id: str | None = None) -> "DeepAgent":
+        """DeepAgent bound to a datasource from the registry (connected lazily)."""
+        return cls(await acquire_adapter(datasource_id))
+
+    def _graph(self, runtime_config: dict[str, list[str]] | None, events: EventBus):
+        """Bind this run's state (and its event bus) and return the shared graph."""
+        bind_run(RunContext(self._adapter, self._semantic_layer, events))
+        return get_supervisor_graph(self._adapter.dialect, self._checkpointer, runtime_config)
+
     async def run(
         self,
         query: str,
@@ -38,6 +58,33 @@ class DeepAgent:
         runtime_config: dict[str, list[str]] | None = None,
     ) -> AsyncGenerator[AgentEvent, None]:
         """Run the supervisor pipeline and yield AgentEvents via SSE."""
+        # The lease keeps the datasource from being evicted mid-run.
+        async with hold_adapter(self._adapter), aclosing(
+            self._run(query, session_id, runtime_config)
+        ) as events:
+            async for event in events:
+                yield event
+
+    async def resume(
+        self,
+        thread_id: str,
+        session_id: str,
+        decisions: list[dict[str, Any]],
+        runtime_config: dict[str, list[str]] | None = None,
+    ) -> AsyncGenerator[AgentEvent, None]:
+        """Resume the graph after HITL interrupt; yield continuation events."""
+        async with hold_adapter(self._adapter), aclosing(
+            self._resume(thread_id, session_id, decisions, runtime_config)
+        ) as events:
+            async for event in events:
+                yield event
+
+    async def _run(
+        self,
+        query: str,
+        session_id: str,
+        runtime_config: dict[str, list[str]] | None,
+    ) -> AsyncGenerator[AgentEvent, None]:
         if session_id not in self._thread_map:
             self._thread_map[session_id] = uuid.uuid4().hex
         thread_id = self._thread_map[session_id]
@@ -46,25 +93,31 @@ class DeepAgent:
         logger.info("run | session=%s thread=%s query=%s",
                     session_id, thread_id, query[:80])
 
-        graph = build_supervisor_graph(
-            self._adapter,
-            self._semantic_layer,
-            self._captured_events,
-            self._checkpointer,
-            runtime_config=runtime_config,
-        )
-
         messages = await build_chat_messages(session_id, query)
 
+        # Only first-turn questions are cached: later turns depend on the history.
+        scope = None
+        if settings.question_cache_enabled and len(messages) == 1:
+            scope = await question_scope(self._adapter, runtime_config)
+            cached = await get_cached_answer(scope, query) if scope else None
+            if cached is not None:
+                async for event in self._replay(session_id, messages, cached):
+                    yield event
+                return
+
+        events = EventBus()
+        graph = self._graph(runtime_config, events)
+
         config = {"configurable": {"thread_id": thread_id}}
         input_payload = {"messages": messages}
         full_response_parts: list[str] = []
+        emitted: list[AgentEvent] = []
 
         graph_stream = graph.astream_events(
             input_payload, config=config, version="v2")
 
         async for event in stream_agent_events(
-            graph_stream, query, self._captured_events, full_response_parts
+            graph_stream, query, events, full_response_parts
         ):
             if event.type == EventType.INTERRUPT:
                 event = AgentEvent(
@@ -73,8 +126,15 @@ class DeepAgent:
                     nl_query=event.nl_query,
                     thread_id=thread_id,
                 )
+            emitted.append(event)
             yield event
 
+        if scope is not None:
+            if any(e.type == EventType.INTERRUPT for e in emitted):
+                await remember_thread(thread_id, scope, query)
+            else:
+                await set_cached_answer(scope, query, emitted, self._adapter.cache_namespace)
+
         full_response = "".join(full_response_parts)
         await save_chat_response(session_id, messages, full_response)
         logger.info("run complete | session=%s response_len=%d",
@@ -82,14 +142,13 @@ class DeepAgent:
 
         yield AgentEvent(type=EventType.DONE)
 
-    async def resume(
+    async def _resume(
         self,
         thread_id: str,
         session_id: str,
         decisions: list[dict[str, Any]],
-        runtime_config: dict[str, list[str]] | None = None,
+        runtime_config: dict[str, list[str]] | None,
     ) -> AsyncGenerator[AgentEvent, None]:
-        """Resume the graph after HITL interrupt; yield continuation events."""
         logger.info("resume | session=%s thread=%s", session_id, thread_id)
 
         # Allow limited replans on reject before bailing out.
@@ -125,13 +184,8 @@ class DeepAgent:
             self._thread_map[session_id] = new_thread_id
             self._reject_counts[new_thread_id] = count  # carry over count
 
-            graph = build_supervisor_graph(
-                self._adapter,
-                self._semantic_layer,
-                self._captured_events,
-                self._checkpointer,
-                runtime_config=runtime_config,
-            )
+            events = EventBus()
+            graph = self._graph(runtime_config, events)
             messages = await build_chat_messages(session_id, original_query)
             config = {"configurable": {"thread_id": new_thread_id}}
             full_response_parts: list[str] = []
@@ -141,7 +195,7 @@ class DeepAgent:
             )
 
             async for event in stream_agent_events(
-                graph_stream, original_query, self._captured_events, full_response_parts
+                graph_stream, original_query, events, full_response_parts
             ):
                 if event.type == EventType.INTERRUPT:
                     event = AgentEvent(
@@ -157,16 +211,13 @@ class DeepAgent:
             yield AgentEvent(type=EventType.DONE)
             return
 
-        graph = build_supervisor_graph(
-            self._adapter,
-            self._semantic_layer,
-            self._captured_events,
-            self._checkpointer,
-            runtime_config=runtime_config,
-        )
+        events = EventBus()
+        graph = self._graph(runtime_config, events)
         config = {"configurable": {"thread_id": thread_id}}
         hitl_response = {"decisions": decisions}
         full_response_parts: list[str] = []
+        emitted: list[AgentEvent] = []
+        pending = await recall_thread(thread_id) if settings.question_cache_enabled else None
 
         graph_stream = graph.astream_events(
             Command(resume=hitl_response),
@@ -175,8 +226,29 @@ class DeepAgent:
         )
 
         async for event in stream_agent_events(
-            graph_stream, "", self._captured_events, full_response_parts
+            graph_stream, "", events, full_response_parts
         ):
+            emitted.append(event)
             yield event
 
+        # An edited statement is not what the question asked for; only cache plain approvals.
+        approved = bool(decisions) and all(d.get("type") == "approve" for d in decisions)
+        if pending is not None and approved and not any(
+            e.type == EventType.INTERRUPT for e in emitted
+        ):
+            scope, question = pending
+            await set_cached_answer(scope, question, emitted, self._adapter.cache_namespace)
+
+        yield AgentEvent(type=EventType.DONE)
+
+    async def _replay(
+        self, session_id: str, messages: list[dict], events: list[AgentEvent]
+    ) -> AsyncGenerator[AgentEvent, None]:
+        """Yield a cached answer as if the pipeline had produced it."""
+        yield AgentEvent(type=EventType.THINKING, content="Answered from the question cache.")
+        for event in events:
+            yield event
+        answer = "".join(e.content or "" for e in events if e.type == EventType.ANSWER)
+        await save_chat_response(session_id, messages, answer)
+        logger.info("run replayed from question cache | session=%s", session_id)
         yield AgentEvent(type=EventType.DONE)
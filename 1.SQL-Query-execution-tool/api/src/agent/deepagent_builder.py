@@ -1,4 +1,18 @@
-"""Agent graph builder module."""
+"""Agent graph builder module.
+
+Compiling the supervisor graph instantiates three LLM clients, scans skill
+directories, loads MCP tools and compiles the deep agent, so compiled graphs
+are cached per (dialect, skills, skill dirs, MCP servers, model settings,
+checkpointer). Per-request state is not part of the graph: the tools read it
+from the bound run (src.agent.run_context). Skill files and MCP tool lists
+are read when a graph is first built for a key; changes to them apply after
+a restart or once the entry is evicted.
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any
 
 from deepagents import create_deep_agent  # type: ignore
 from langgraph.checkpoint.memory import InMemorySaver  # type: ignore
@@ -7,9 +21,7 @@ from src.log import get_logger
 from src.llm import get_llm
 from src.config.settings import get_settings
 from src.subagent.sql_executor.agent import build_config as sql_executor_config
-from src.agent.events import AgentEvent
-from src.db.adapters.base import DatabaseAdapter
-from src.semantic.layer import SemanticLayer
+from src.agent.run_context import current_run
 from src.prompts.supervisor import SUPERVISOR_PROMPT_TEMPLATE
 from src.tools.get_schema_context import get_schema_context_tool
 from src.skills import get_tools_for_target, load_skills_from_dirs
@@ -20,6 +32,9 @@ from src.llm.model_switch import build_dynamic_model_switch_middleware
 
 logger = get_logger(__name__)
 
+# Compiled graphs by _graph_key(), least recently used first.
+_graphs: OrderedDict[str, Any] = OrderedDict()
+
 
 def _format_skills_section(skill_docs: list) -> str:
     """Format loaded SkillDocs into a markdown section for the system prompt."""
@@ -31,10 +46,67 @@ def _format_skills_section(skill_docs: list) -> str:
     return "".join(parts)
 
 
+def _resolve_runtime(settings: Any, runtime_config: dict[str, list[str]] | None) -> dict[str, list[str]]:
+    if runtime_config is not None:
+        return runtime_config
+    base_runtime = get_agent_runtime_config(settings)
+    return {
+        "enabled_skills": list(getattr(base_runtime, "enabled_skills", []) or []),
+        "skill_dirs": list(getattr(base_runtime, "skill_dirs", []) or []),
+        "mcp_servers": list(getattr(base_runtime, "mcp_servers", []) or []),
+    }
+
+
+def _graph_key(dialect: str, runtime: dict[str, list[str]], settings: Any, checkpointer: Any) -> str:
+    """Hash of everything a compiled graph depends on; list order is ignored."""
+    parts = {
+        "dialect": dialect,
+        "runtime": {name: sorted(runtime.get(name) or []) for name in ("enabled_skills", "skill_dirs", "mcp_servers")},
+        "model": [
+            getattr(settings, name, None)
+            for name in (
+                "llm_provider", "llm_model", "llm_lightweight_model", "llm_advanced_model",
+                "llm_base_url", "llm_temperature", "llm_max_tokens",
+                "model_switch_enabled", "model_switch_message_threshold",
+            )
+        ],
+        # Graphs are compiled against one checkpointer instance.
+        "checkpointer": id(checkpointer),
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def get_supervisor_graph(
+    dialect: str,
+    checkpointer: InMemorySaver,
+    runtime_config: dict[str, list[str]] | None = None,
+):
+    """Return the compiled supervisor graph for this configuration, building it once."""
+    settings = get_settings()
+    size = getattr(settings, "agent_graph_cache_size", 0)
+    if size <= 0:
+        return build_supervisor_graph(dialect, checkpointer, runtime_config)
+
+    runtime = _resolve_runtime(settings, runtime_config)
+    key = _graph_key(dialect, runtime, settings, checkpointer)
+    graph = _graphs.get(key)
+    if graph is not None:
+        _graphs.move_to_end(key)
+        return graph
+    graph = build_supervisor_graph(dialect, checkpointer, runtime)
+    _graphs[key] = graph
+    while len(_graphs) > size:
+        _graphs.popitem(last=False)
+    logger.info("Supervisor graph compiled and cached | dialect=%s cached=%d", dialect, len(_graphs))
+    return graph
+
+
+def clear_graph_cache() -> None:
+    _graphs.clear()
+
+
 def build_supervisor_graph(
-    adapter: DatabaseAdapter,
-    semantic_layer: SemanticLayer,
-    captured_events: list[AgentEvent],
+    dialect: str,
     checkpointer: InMemorySaver,
     runtime_config: dict[str, list[str]] | None = None,
 ):
@@ -42,29 +114,29 @@ def build_supervisor_graph(
     model = get_llm()
 
     # Subagent for actually running SQL
-    subagent = sql_executor_config(adapter, captured_events)
+    subagent = sql_executor_config(dialect)
+
+    # The LLM only sees the question argument; the semantic layer is the current run's.
+    # No @tool needed — create_deep_agent accepts Callable.
+    async def get_schema_context(question: str = "") -> str:
+        """Return the semantic + physical schema context for the database.
 
-    # Closure that binds semantic_layer into the tool so the LLM only sees
-    # a no-arg tool.  No @tool needed — create_deep_agent accepts Callable.
-    async def get_schema_context() -> str:
-        """Return the full semantic + physical schema context for the database."""
-        return await get_schema_context_tool.coroutine(semantic_layer=semantic_layer)
+        Args:
+            question: The user's question. On large databases only the tables
+                relevant to it are described and the others are listed by name;
+                ask again naming a listed table to see its columns.
+        """
+        return await get_schema_context_tool.coroutine(
+            semantic_layer=current_run().semantic_layer, question=question
+        )
 
     settings = get_settings()
-    if runtime_config is None:
-        base_runtime = get_agent_runtime_config(settings)
-        runtime = {
-            "enabled_skills": list(getattr(base_runtime, "enabled_skills", []) or []),
-            "skill_dirs": list(getattr(base_runtime, "skill_dirs", []) or []),
-            "mcp_servers": list(getattr(base_runtime, "mcp_servers", []) or []),
-        }
-    else:
-        runtime = runtime_config
+    runtime = _resolve_runtime(settings, runtime_config)
 
     skill_docs = load_skills_from_dirs(runtime.get("skill_dirs", []))
     skills_section = _format_skills_section(skill_docs)
     supervisor_prompt = SUPERVISOR_PROMPT_TEMPLATE.format(
-        dialect=adapter.dialect,
+        dialect=dialect,
         skills_section=skills_section,
     )
 
@@ -0,0 +1,64 @@
+"""
+Per-run event bus between tools and the SSE stream.
+
+Tools (execute_sql) publish AgentEvents on the bus while they run, and
+stream_agent_events consumes merge(), which interleaves them with the
+LangGraph event stream in arrival order. SQL / EXECUTING / RESULT therefore
+reach the client as they happen, not in one burst when the tool returns.
+Every DeepAgent run creates its own bus, so concurrent runs never see each
+other's events.
+"""
+
+import asyncio
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Literal
+
+from src.agent.events import AgentEvent
+
+Source = Literal["graph", "tool"]
+
+_END = "end"
+_FAILED = "failed"
+
+
+class EventBus:
+    """asyncio.Queue carrying tool events and, during merge(), the graph's events."""
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+
+    def append(self, event: AgentEvent) -> None:
+        """Publish a tool event (list-style, so tools can be handed a plain list too)."""
+        self._queue.put_nowait(("tool", event))
+
+    async def merge(self, graph_stream: AsyncIterator[dict]) -> AsyncIterator[tuple[Source, Any]]:
+        """Yield ("graph", lc_event) and ("tool", AgentEvent) until graph_stream ends.
+
+        The graph is consumed by a task of its own, so tool events published
+        while a node runs are yielded right away. An exception from the graph
+        is re-raised here; closing this iterator stops the graph.
+        """
+        pump = asyncio.create_task(self._pump(graph_stream))
+        try:
+            while True:
+                source, item = await self._queue.get()
+                if source == _END:
+                    return
+                if source == _FAILED:
+                    raise item
+                yield source, item
+        finally:
+            pump.cancel()
+            await asyncio.gather(pump, return_exceptions=True)
+
+    async def _pump(self, graph_stream: AsyncIterator[dict]) -> None:
+        try:
+            async with aclosing(graph_stream) as stream:
+                async for lc_event in stream:
+                    self._queue.put_nowait(("graph", lc_event))
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._queue.put_nowait((_FAILED, exc))
+            return
+        self._queue.put_nowait((_END, None))
@@ -2,6 +2,8 @@ from enum import Enum
 from typing import Any
 from pydantic import BaseModel
 
+from src.db.result import ResultFormat
+
 
 class EventType(str, Enum):
     PLAN = "plan"
@@ -11,6 +13,9 @@ class EventType(str, Enum):
     EXECUTING = "executing"
     RESULT = "result"
     ANSWER = "answer"
+    ANSWER_DELTA = "answer_delta"
+    # The answer_delta events sent so far were reasoning, not the answer.
+    ANSWER_RESET = "answer_reset"
     ERROR = "error"
     DONE = "done"
     INTERRUPT = "interrupt"
@@ -21,10 +26,25 @@ class AgentEvent(BaseModel):
     content: str | None = None
     tool: str | None = None
     input: str | None = None
-    rows: list[dict[str, Any]] | None = None
+    # RESULT rows are kept columnar (one array per row, in `columns` order);
+    # to_wire() expands them to objects for clients that did not opt in.
+    rows: list[Any] | None = None
     columns: list[str] | None = None
     row_count: int | None = None
+    truncated: bool | None = None
     # HITL: set when type is INTERRUPT (thread_id so client can call approve)
     proposed_sql: str | None = None
     nl_query: str | None = None
     thread_id: str | None = None
+
+
+def to_wire(event: AgentEvent, result_format: ResultFormat = "records") -> dict[str, Any]:
+    """Return the SSE payload for an event in the client's result format."""
+    data = event.model_dump(exclude_none=True, exclude={"rows"})
+    if event.rows is not None:
+        if result_format == "records" and event.columns is not None:
+            columns = event.columns
+            data["rows"] = [dict(zip(columns, row)) for row in event.rows]
+        else:
+            data["rows"] = event.rows
+    return data
@@ -0,0 +1,42 @@
+"""
+Per-run state for the shared, compiled supervisor graph.
+
+Compiled graphs are cached across requests (see deepagent_builder), so their
+tools cannot close over one request's adapter, semantic layer or event bus.
+DeepAgent binds those to a ContextVar before it streams the graph; LangGraph
+runs nodes and tools in tasks that inherit the streaming task's context, so
+the tools read the current run's state with current_run().
+"""
+
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from src.agent.event_bus import EventBus
+from src.db.adapters.base import DatabaseAdapter
+from src.semantic.layer import SemanticLayer
+
+
+@dataclass
+class RunContext:
+    adapter: DatabaseAdapter
+    semantic_layer: SemanticLayer
+    events: EventBus
+
+
+_current: ContextVar[RunContext | None] = ContextVar("agent_run_context", default=None)
+
+
+def bind_run(context: RunContext) -> None:
+    """Make context the current run for this task (and tasks it starts from now on).
+
+    Not reset afterwards: DeepAgent yields while the run is bound, and each
+    request streams in its own task, so the binding never reaches another request.
+    """
+    _current.set(context)
+
+
+def current_run() -> RunContext:
+    context = _current.get()
+    if context is None:
+        raise RuntimeError("No agent run is bound to this context")
+    return context
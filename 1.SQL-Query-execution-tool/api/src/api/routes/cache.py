@@ -0,0 +1,58 @@
+"""Result cache administration API."""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from src.log import get_logger
+from src.auth.jwt import get_current_user
+from src.cache.redis_client import get_cached_page, invalidate_table
+from src.db.adapters.factory import get_adapter
+from src.db.result import ResultFormat
+
+logger = get_logger(__name__)
+router = APIRouter(prefix="/cache", tags=["cache"])
+
+
+def _namespace(datasource: str | None) -> str:
+    """Cache namespace of datasource; 404 for unknown ids."""
+    try:
+        return get_adapter(datasource).cache_namespace
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+
+
+@router.post("/invalidate")
+async def invalidate(
+    table: list[str] = Query(..., min_length=1),
+    datasource: str | None = Query(None, min_length=1, max_length=64),
+    _user: dict = Depends(get_current_user),
+) -> dict:
+    """Drop cached results of datasource that read any of the given tables (e.g. after an ETL load)."""
+    namespace = _namespace(datasource)
+    invalidated = {name: await invalidate_table(name, namespace) for name in table}
+    logger.info(
+        "Cache invalidation requested | datasource=%s tables=%s", datasource, ", ".join(table)
+    )
+    return {"invalidated": invalidated}
+
+
+@router.get("/results")
+async def result_page(
+    sql: str = Query(..., min_length=1),
+    datasource: str | None = Query(None, min_length=1, max_length=64),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=10000),
+    result_format: ResultFormat = "records",
+    _user: dict = Depends(get_current_user),
+) -> dict:
+    """Page through the cached result of sql; large results are read chunk by chunk."""
+    page = await get_cached_page(sql, offset, limit, _namespace(datasource))
+    if page is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Result is not cached")
+    result = page.result
+    return {
+        "columns": result.columns,
+        "rows": result.records() if result_format == "records" else result.rows,
+        "offset": page.offset,
+        "row_count": result.row_count,
+        "total_rows": page.total_rows,
+        "truncated": result.truncated,
+    }
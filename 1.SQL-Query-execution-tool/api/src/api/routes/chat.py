@@ -1,12 +1,15 @@
+import asyncio
 import json
 import uuid
+from collections.abc import AsyncIterator
 from typing import Any
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import JSONResponse, StreamingResponse
 from sse_starlette.sse import EventSourceResponse
 from src.log import get_logger
 from src.agent.deep_agent import DeepAgent
+from src.agent.events import AgentEvent, EventType, to_wire
 from src.api.schemas import (
     ApproveRequest,
     ApproveInitResponse,
@@ -14,17 +17,23 @@ from src.api.schemas import (
     ChatInitResponse,
 )
 from src.auth.jwt import get_current_user
+from src.cache.claims import Claim, claim_first, release
 from src.cache.redis_client import get_redis
+from src.config.settings import get_settings
 from src.config.user_agent_config import get_user_agent_config
-from src.db.adapters.factory import get_adapter
+from src.db.adapters.factory import DEFAULT_DATASOURCE, get_adapter
+from src.utils import serializer
 
 logger = get_logger(__name__)
+settings = get_settings()
 router = APIRouter(prefix="/chat", tags=["chat"])
 
 _PENDING_TTL = 60
 _CLAIMED_TTL = 30
 _APPROVE_PENDING_TTL = 120
 _APPROVE_CLAIMED_TTL = 60
+_DISCONNECT_POLL_SECONDS = 1.0
+_STREAM_END = object()
 
 
 async def _set_pending(stream_id: str, request: ChatRequest) -> None:
@@ -69,27 +78,24 @@ async def _resolve_runtime_config(
     }
 
 
-async def _claim_pending(stream_id: str) -> ChatRequest | None:
-    """Atomically move pending → claimed. Supports EventSource retries."""
-    redis = await get_redis()
-    pending_key = f"pending:{stream_id}"
-    claimed_key = f"claimed:{stream_id}"
-
-    data = await redis.get(claimed_key)
-    if data:
-        return ChatRequest.model_validate_json(data)
-
-    data = await redis.getdel(pending_key)
-    if data is None:
-        return None
+async def _claim_stream(stream_id: str, owner: str) -> Claim | None:
+    """Claim the pending chat or approve request of stream_id in one round trip.
 
-    await redis.setex(claimed_key, _CLAIMED_TTL, data)
-    return ChatRequest.model_validate_json(data)
+    Exactly one connection gets the payload (index 0: chat, 1: approve); an
+    EventSource retry while the stream is still open finds the claim held
+    (data None). None means the stream id is unknown or expired.
+    """
+    return await claim_first(
+        [
+            (f"pending:{stream_id}", f"claimed:{stream_id}", _CLAIMED_TTL),
+            (f"approve_pending:{stream_id}", f"approve_claimed:{stream_id}", _APPROVE_CLAIMED_TTL),
+        ],
+        owner,
+    )
 
 
-async def _delete_claimed(stream_id: str) -> None:
-    redis = await get_redis()
-    await redis.delete(f"claimed:{stream_id}")
+async def _release_stream(stream_id: str, owner: str, approve: bool) -> None:
+    await release(f"approve_claimed:{stream_id}" if approve else f"claimed:{stream_id}", owner)
 
 
 def _approve_decisions(body: ApproveRequest) -> list[dict[str, Any]]:
@@ -120,6 +126,9 @@ async def _set_approve_pending(
     session_id: str,
     decisions: list[dict[str, Any]],
     runtime_config: dict[str, list[str]],
+    result_format: str = "records",
+    datasource: str | None = None,
+    stream_answer: bool = False,
 ) -> None:
     redis = await get_redis()
     payload = json.dumps(
@@ -128,46 +137,152 @@ async def _set_approve_pending(
             "session_id": session_id,
             "decisions": decisions,
             "runtime_config": runtime_config,
+            "result_format": result_format,
+            "datasource": datasource,
+            "stream_answer": stream_answer,
         }
     )
     await redis.setex(f"approve_pending:{stream_id}", _APPROVE_PENDING_TTL, payload)
 
 
-async def _claim_approve(
-    stream_id: str,
-) -> tuple[str, str, list[dict[str, Any]], dict[str, list[str]]] | None:
-    """Atomically move approve_pending → approve_claimed. Returns (thread_id, session_id, decisions) or None."""
-    redis = await get_redis()
-    pending_key = f"approve_pending:{stream_id}"
-    claimed_key = f"approve_claimed:{stream_id}"
-
-    data = await redis.get(claimed_key)
-    if data:
-        obj = json.loads(data)
-        return (
-            obj["thread_id"],
-            obj["session_id"],
-            obj["decisions"],
-            obj.get("runtime_config") or {},
-        )
-
-    data = await redis.getdel(pending_key)
-    if data is None:
-        return None
-
-    await redis.setex(claimed_key, _APPROVE_CLAIMED_TTL, data)
+def _parse_approve(
+    data: str,
+) -> tuple[str, str, list[dict[str, Any]], dict[str, list[str]], str, str | None, bool]:
+    """Return (thread_id, session_id, decisions, runtime_config, result_format, datasource,
+    stream_answer)."""
     obj = json.loads(data)
     return (
         obj["thread_id"],
         obj["session_id"],
         obj["decisions"],
         obj.get("runtime_config") or {},
+        obj.get("result_format") or "records",
+        obj.get("datasource"),
+        bool(obj.get("stream_answer")),
     )
 
 
-async def _delete_approve_claimed(stream_id: str) -> None:
+async def _remember_datasource(thread_id: str, datasource: str | None) -> None:
+    """Record which datasource an interrupted thread runs against, for its approve."""
     redis = await get_redis()
-    await redis.delete(f"approve_claimed:{stream_id}")
+    await redis.setex(
+        f"thread_datasource:{thread_id}",
+        settings.redis_ttl_seconds,
+        datasource or DEFAULT_DATASOURCE,
+    )
+
+
+async def _resume_datasource(thread_id: str, requested: str | None) -> str | None:
+    """Datasource to resume thread_id on: the recorded one (409 if requested differs).
+
+    Threads with no record (expired, or interrupted before it was kept) fall
+    back to the requested datasource.
+    """
+    redis = await get_redis()
+    recorded = await redis.get(f"thread_datasource:{thread_id}")
+    if recorded is None:
+        return requested
+    if requested is not None and requested != recorded:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Thread '{thread_id}' was interrupted on datasource '{recorded}', "
+            f"not '{requested}'.",
+        )
+    return recorded
+
+
+def _check_datasource(datasource: str | None) -> None:
+    """Reject unknown datasource ids up front (404) instead of mid-stream."""
+    try:
+        get_adapter(datasource)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+
+
+def _wanted(event: AgentEvent, stream_answer: bool) -> bool:
+    """ANSWER_DELTA / ANSWER_RESET events only go to clients that asked for them."""
+    return stream_answer or event.type not in (EventType.ANSWER_DELTA, EventType.ANSWER_RESET)
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    while not await request.is_disconnected():
+        await asyncio.sleep(_DISCONNECT_POLL_SECONDS)
+
+
+async def _drive_events(
+    events: AsyncIterator[AgentEvent], queue: asyncio.Queue, stream_id: str
+) -> None:
+    """Run the agent generator to its end in this one task, handing events to queue.
+
+    The generator (and the per-run context it binds) never changes task;
+    cancelling this task cancels the agent step in progress and closes it.
+    Puts an exception raised by the agent, then _STREAM_END.
+    """
+    try:
+        async for event in events:
+            await queue.put(event)
+    except Exception as exc:
+        await queue.put(exc)
+    finally:
+        aclose = getattr(events, "aclose", None)
+        if aclose is not None:
+            try:
+                await aclose()
+            except Exception as exc:
+                logger.debug("Agent stream close failed | stream=%s error=%s", stream_id, exc)
+    await queue.put(_STREAM_END)
+
+
+async def _bounded_events(
+    events: AsyncIterator[AgentEvent],
+    request: Request,
+    stream_id: str,
+) -> AsyncIterator[AgentEvent]:
+    """Relay agent events until the client disconnects or deepagent_timeout_seconds runs out.
+
+    The agent runs in one task of its own (_drive_events) whose queue is raced
+    against the disconnect watcher, so a statement blocked in the database is
+    cancelled (and aborted server-side by the adapter) instead of running on
+    after the user left.
+    """
+    timeout = settings.deepagent_timeout_seconds
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    # One event of look-ahead: the agent runs at most one step ahead of the client.
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+    driver = asyncio.create_task(_drive_events(events, queue, stream_id))
+    disconnect = asyncio.ensure_future(_wait_for_disconnect(request))
+    item: asyncio.Future | None = None
+    try:
+        while True:
+            item = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait(
+                {item, disconnect},
+                timeout=max(deadline - loop.time(), 0),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if item in done:
+                event = item.result()
+                if event is _STREAM_END:
+                    return
+                if isinstance(event, Exception):
+                    raise event
+                yield event
+                continue
+            if disconnect in done:
+                logger.info("Client disconnected | stream=%s", stream_id)
+                return
+            logger.warning("Agent timed out | stream=%s timeout=%ss", stream_id, timeout)
+            yield AgentEvent(
+                type=EventType.ERROR,
+                content=f"Request timed out after {timeout} seconds.",
+            )
+            return
+    finally:
+        pending = [t for t in (item, disconnect, driver) if t is not None and not t.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
 
 
 @router.post("", response_model=ChatInitResponse)
@@ -175,6 +290,7 @@ async def initiate_chat(
     request: ChatRequest,
     _user: dict = Depends(get_current_user),
 ) -> JSONResponse:
+    _check_datasource(request.datasource)
     stream_id = str(uuid.uuid4())
     logger.info("Chat initiated | session=%s stream=%s", request.session_id, stream_id)
     await _set_pending(stream_id, request)
@@ -192,6 +308,8 @@ async def approve_chat(
     _user: dict = Depends(get_current_user),
 ) -> JSONResponse:
     """Resume after HITL interrupt. Returns a new stream_url to consume the continuation."""
+    datasource = await _resume_datasource(body.thread_id, body.datasource)
+    _check_datasource(datasource)
     stream_id = str(uuid.uuid4())
     decisions = _approve_decisions(body)
     user_sub = str(_user.get("sub", "anonymous"))
@@ -214,6 +332,9 @@ async def approve_chat(
         body.session_id,
         decisions,
         runtime_config,
+        body.result_format,
+        datasource,
+        body.stream_answer,
     )
     return JSONResponse(
         content={"stream_url": f"/api/chat/stream/{stream_id}"},
@@ -226,17 +347,27 @@ async def stream_chat(
     request: Request,
     _user: dict = Depends(get_current_user),
 ) -> EventSourceResponse:
-    chat_request = await _claim_pending(stream_id)
-    approve_payload = None if chat_request else await _claim_approve(stream_id)
-
-    if not chat_request and not approve_payload:
+    owner = uuid.uuid4().hex
+    claim = await _claim_stream(stream_id, owner)
+    if claim is None:
         logger.warning("Invalid or expired stream_id=%s", stream_id)
         return EventSourceResponse(
             _error_stream("Invalid or expired stream ID"), status_code=404
         )
+    if claim.data is None:
+        logger.warning("Stream already open | stream=%s", stream_id)
+        return EventSourceResponse(
+            _error_stream("Stream is already open on another connection"), status_code=409
+        )
+    chat_request = ChatRequest.model_validate_json(claim.data) if claim.index == 0 else None
+    approve_payload = _parse_approve(claim.data) if claim.index == 1 else None
 
-    adapter = get_adapter()
-    agent = DeepAgent(adapter=adapter)
+    datasource = chat_request.datasource if chat_request else approve_payload[5]
+    try:
+        agent = await DeepAgent.for_datasource(datasource)
+    except ValueError as exc:
+        await _release_stream(stream_id, owner, approve=chat_request is None)
+        return EventSourceResponse(_error_stream(str(exc)), status_code=404)
 
     async def event_generator():
         try:
@@ -252,17 +383,26 @@ async def stream_chat(
                     stream_id,
                     chat_request.session_id,
                 )
-                async for event in agent.run(
+                events = agent.run(
                     query=chat_request.query,
                     session_id=chat_request.session_id,
                     runtime_config=runtime_config,
-                ):
-                    if await request.is_disconnected():
-                        logger.info("Client disconnected | stream=%s", stream_id)
-                        break
-                    yield {"data": json.dumps(event.model_dump(exclude_none=True))}
+                )
+                async for event in _bounded_events(events, request, stream_id):
+                    if event.type == EventType.INTERRUPT and event.thread_id:
+                        await _remember_datasource(event.thread_id, datasource)
+                    if _wanted(event, chat_request.stream_answer):
+                        yield {"data": serializer.dumps(to_wire(event, chat_request.result_format))}
             else:
-                thread_id, session_id, decisions, runtime_config = approve_payload
+                (
+                    thread_id,
+                    session_id,
+                    decisions,
+                    runtime_config,
+                    result_format,
+                    _,
+                    stream_answer,
+                ) = approve_payload
                 if not runtime_config:
                     runtime_config = await _resolve_runtime_config(
                         str(_user.get("sub", "anonymous")),
@@ -276,24 +416,22 @@ async def stream_chat(
                     session_id,
                     thread_id,
                 )
-                async for event in agent.resume(
+                events = agent.resume(
                     thread_id=thread_id,
                     session_id=session_id,
                     decisions=decisions,
                     runtime_config=runtime_config,
-                ):
-                    if await request.is_disconnected():
-                        logger.info("Client disconnected | stream=%s", stream_id)
-                        break
-                    yield {"data": json.dumps(event.model_dump(exclude_none=True))}
+                )
+                async for event in _bounded_events(events, request, stream_id):
+                    if event.type == EventType.INTERRUPT:
+                        await _remember_datasource(event.thread_id or thread_id, datasource)
+                    if _wanted(event, stream_answer):
+                        yield {"data": serializer.dumps(to_wire(event, result_format))}
         except Exception as exc:
             logger.error("Stream error | stream=%s error=%s", stream_id, exc)
             yield {"data": json.dumps({"type": "error", "content": str(exc)})}
         finally:
-            if chat_request:
-                await _delete_claimed(stream_id)
-            else:
-                await _delete_approve_claimed(stream_id)
+            await _release_stream(stream_id, owner, approve=chat_request is None)
 
     return EventSourceResponse(
         event_generator(),
@@ -304,6 +442,7 @@ async def stream_chat(
 @router.post("/direct")
 async def direct_chat(
     chat_request: ChatRequest,
+    request: Request,
     _user: dict = Depends(get_current_user),
 ) -> StreamingResponse:
     """
@@ -311,8 +450,8 @@ async def direct_chat(
     Returns a stream of events immediately.
     """
     logger.info("Direct chat initiated | session=%s", chat_request.session_id)
-    adapter = get_adapter()
-    agent = DeepAgent(adapter=adapter)
+    _check_datasource(chat_request.datasource)
+    agent = await DeepAgent.for_datasource(chat_request.datasource)
 
     async def event_generator():
         try:
@@ -322,13 +461,18 @@ async def direct_chat(
                 chat_request.selected_skill_dirs,
                 chat_request.selected_mcp_servers,
             )
-            async for event in agent.run(
+            events = agent.run(
                 query=chat_request.query,
                 session_id=chat_request.session_id,
                 runtime_config=runtime_config,
-            ):
+            )
+            async for event in _bounded_events(events, request, "direct"):
+                if event.type == EventType.INTERRUPT and event.thread_id:
+                    await _remember_datasource(event.thread_id, chat_request.datasource)
+                if not _wanted(event, chat_request.stream_answer):
+                    continue
                 # Standard SSE format
-                yield f"data: {json.dumps(event.model_dump(exclude_none=True))}\n\n"
+                yield f"data: {serializer.dumps(to_wire(event, chat_request.result_format))}\n\n"
         except Exception as exc:
             logger.error("Direct stream error | error=%s", exc)
             yield f"data: {json.dumps({'type': 'error', 'content': str(exc)})}\n\n"
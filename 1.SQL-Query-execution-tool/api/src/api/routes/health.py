@@ -1,7 +1,10 @@
 from fastapi import APIRouter
 from src.log import get_logger
-from src.cache.redis_client import get_redis
-from src.db.adapters.factory import get_adapter
+from src.cache.memory import InMemoryCache
+from src.cache.redis_client import get_redis, get_result_cache_stats
+from src.db.adapters.factory import get_adapter, get_datasource_registry
+from src.db.adapters.replicas import ReplicaRoutedAdapter
+from src.semantic.layer import get_schema_cache_stats
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/health", tags=["health"])
@@ -14,11 +17,15 @@ async def health_check() -> dict:
         "api": "ok",
         "database": {"type": adapter.dialect, "status": "unknown"},
         "redis": "unknown",
+        "datasources": get_datasource_registry().status(),
+        "schema_cache": get_schema_cache_stats(),
     }
 
     try:
         ok = await adapter.ping()
         status["database"]["status"] = "ok" if ok else "unreachable"
+        if isinstance(adapter, ReplicaRoutedAdapter):
+            status["database"]["replicas"] = adapter.replica_status()
     except Exception as exc:
         logger.error("Database health check failed: %s", exc)
         status["database"]["status"] = f"error: {exc}"
@@ -27,6 +34,10 @@ async def health_check() -> dict:
         client = await get_redis()
         await client.ping()
         status["redis"] = "ok"
+        if isinstance(client, InMemoryCache):
+            status["memory_cache"] = client.stats()
+        elif (l1_stats := get_result_cache_stats()) is not None:
+            status["result_cache_l1"] = l1_stats
     except Exception as exc:
         logger.error("Redis health check failed: %s", exc)
         status["redis"] = f"error: {exc}"
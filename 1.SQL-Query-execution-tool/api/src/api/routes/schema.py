@@ -1,19 +1,28 @@
 """Schema browser API."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from src.log import get_logger
 from src.auth.jwt import get_current_user
-from src.db.adapters.factory import get_adapter
 from src.semantic.layer import SemanticLayer
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/schema", tags=["schema"])
 
 
+async def _semantic_layer(
+    datasource: str | None = Query(None, min_length=1, max_length=64),
+) -> SemanticLayer:
+    try:
+        return await SemanticLayer.for_datasource(datasource)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+
+
 @router.get("")
-async def list_tables(_user: dict = Depends(get_current_user)) -> list[dict]:
-    adapter = get_adapter()
-    layer = SemanticLayer(adapter)
+async def list_tables(
+    layer: SemanticLayer = Depends(_semantic_layer),
+    _user: dict = Depends(get_current_user),
+) -> list[dict]:
     tables = await layer.list_tables()
     logger.info("Listed %d tables", len(tables))
     return tables
@@ -22,18 +31,19 @@ async def list_tables(_user: dict = Depends(get_current_user)) -> list[dict]:
 @router.get("/{table_name}")
 async def get_table(
     table_name: str,
+    layer: SemanticLayer = Depends(_semantic_layer),
     _user: dict = Depends(get_current_user),
 ) -> dict:
     logger.info("Enriching table=%s", table_name)
-    adapter = get_adapter()
-    layer = SemanticLayer(adapter)
     return await layer.enrich_table(table_name)
 
 
 @router.get("/context/prompt")
-async def get_prompt_context(_user: dict = Depends(get_current_user)) -> dict:
-    adapter = get_adapter()
-    layer = SemanticLayer(adapter)
-    context = await layer.build_prompt_context()
+async def get_prompt_context(
+    question: str | None = None,
+    layer: SemanticLayer = Depends(_semantic_layer),
+    _user: dict = Depends(get_current_user),
+) -> dict:
+    context = await layer.build_prompt_context(question)
     logger.debug("Prompt context built | length=%d", len(context))
-    return {"dialect": adapter.dialect, "context": context}
+    return {"dialect": layer.dialect, "context": context}
@@ -2,6 +2,8 @@ from typing import Literal
 
 from pydantic import BaseModel, Field
 
+from src.db.result import ResultFormat
+
 
 class ChatRequest(BaseModel):
     query: str = Field(..., min_length=1, max_length=2000)
@@ -9,6 +11,12 @@ class ChatRequest(BaseModel):
     selected_skills: list[str] | None = None
     selected_skill_dirs: list[str] | None = None
     selected_mcp_servers: list[str] | None = None
+    # "columnar" sends RESULT rows as arrays in `columns` order instead of objects.
+    result_format: ResultFormat = "records"
+    # Also send answer tokens as they are generated (answer_delta / answer_reset events).
+    stream_answer: bool = False
+    # Datasource id from DATASOURCES; None uses the default (DB_TYPE) database.
+    datasource: str | None = Field(None, min_length=1, max_length=64)
 
 
 class ChatInitResponse(BaseModel):
@@ -27,6 +35,10 @@ class ApproveRequest(BaseModel):
     selected_skills: list[str] | None = None
     selected_skill_dirs: list[str] | None = None
     selected_mcp_servers: list[str] | None = None
+    result_format: ResultFormat = "records"
+    stream_answer: bool = False
+    # Defaults to the datasource of the interrupted run; a different one is rejected (409).
+    datasource: str | None = Field(None, min_length=1, max_length=64)
 
 
 class ApproveInitResponse(BaseModel):
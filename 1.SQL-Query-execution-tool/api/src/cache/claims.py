@@ -0,0 +1,84 @@
+"""
+Atomic, one-round-trip claims on Redis (or the in-process fallback).
+
+A pending key holds a payload waiting for exactly one consumer, e.g. a chat
+request waiting for its SSE stream. claim_first() moves the first existing
+pending key of several to its claimed key, owned by a random token, in one
+step: a Lua script on Redis, a method with no awaits (hence atomic on the
+event loop) on InMemoryCache. Exactly one caller gets the payload; callers
+that come later learn the claim is held. release() deletes a key only if
+the caller still owns it.
+"""
+
+from typing import Any, NamedTuple
+
+from src.log import get_logger
+from src.cache.memory import InMemoryCache
+from src.cache.redis_client import get_redis
+
+logger = get_logger(__name__)
+
+# KEYS: pending_1, claimed_1, pending_2, claimed_2, ...  ARGV: owner, ttl_1, ttl_2, ...
+_CLAIM_FIRST = """
+for i = 1, #KEYS, 2 do
+    local n = (i + 1) / 2
+    local data = redis.call("GET", KEYS[i])
+    if data then
+        redis.call("DEL", KEYS[i])
+        redis.call("SET", KEYS[i + 1], ARGV[1], "EX", ARGV[n + 1])
+        return {n, data}
+    end
+    if redis.call("EXISTS", KEYS[i + 1]) == 1 then
+        return {n}
+    end
+end
+return nil
+"""
+
+_DELETE_IF_EQUALS = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+_scripts: dict[str, Any] = {}
+
+
+class Claim(NamedTuple):
+    # Position of the matching (pending, claimed, ttl) pair.
+    index: int
+    # The pending payload, or None if another caller holds the claim.
+    data: str | None
+
+
+def _script(client: Any, source: str) -> Any:
+    """Registered script (EVALSHA, falling back to EVAL once per server)."""
+    script = _scripts.get(source)
+    if script is None:
+        script = _scripts[source] = client.register_script(source)
+    return script
+
+
+async def claim_first(pairs: list[tuple[str, str, int]], owner: str) -> Claim | None:
+    """Claim the first pending key of pairs for owner; None if nothing is pending."""
+    client = await get_redis()
+    if isinstance(client, InMemoryCache):
+        reply = await client.claim_first(pairs, owner)
+        return Claim(*reply) if reply is not None else None
+
+    keys = [key for pending_key, claimed_key, _ in pairs for key in (pending_key, claimed_key)]
+    args = [owner, *(ttl for _, _, ttl in pairs)]
+    reply = await _script(client, _CLAIM_FIRST)(keys=keys, args=args, client=client)
+    if reply is None:
+        return None
+    return Claim(int(reply[0]) - 1, reply[1] if len(reply) > 1 else None)
+
+
+async def release(key: str, owner: str) -> bool:
+    """Delete key if owner still holds it; return whether it was deleted."""
+    client = await get_redis()
+    if isinstance(client, InMemoryCache):
+        return bool(await client.delete_if_equals(key, owner))
+    return bool(await _script(client, _DELETE_IF_EQUALS)(keys=[key], args=[owner], client=client))
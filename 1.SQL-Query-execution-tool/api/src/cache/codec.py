@@ -0,0 +1,121 @@
+"""
+Binary codec for cached result sets.
+
+Layout: b"RC" magic, 1-byte format version, 1-byte compression id, then the
+body. The body is the columnar payload ({columns, rows, row_count,
+truncated}) encoded by src.utils.serializer, compressed with zlib (or lz4
+when installed and configured) once it exceeds a size threshold.
+
+Entries written before the codec existed are plain JSON text; decode()
+still reads them.
+
+Large results are stored in chunks: encode_chunk() packs a slice of rows
+with the same header, and a small manifest (b"RM" magic, version, JSON)
+records the columns, row counts and chunk layout.
+"""
+
+import zlib
+from typing import Any
+
+from src.log import get_logger
+from src.db.result import ColumnarResult
+from src.utils import serializer
+
+logger = get_logger(__name__)
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - lz4 is optional
+    lz4_frame = None
+
+MAGIC = b"RC"
+MANIFEST_MAGIC = b"RM"
+VERSION = 1
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_LZ4 = 2
+
+_COMPRESSION_IDS = {"none": COMPRESSION_NONE, "zlib": COMPRESSION_ZLIB, "lz4": COMPRESSION_LZ4}
+
+# zlib level 1: most of the size win on repetitive row data at a fraction of the CPU.
+_ZLIB_LEVEL = 1
+
+
+def encode(result: ColumnarResult, compression: str = "zlib", min_compress_bytes: int = 1024) -> bytes:
+    """Encode result with a versioned header; compress bodies of min_compress_bytes or more."""
+    return _pack(result.to_payload(), compression, min_compress_bytes)
+
+
+def decode(data: bytes | str) -> ColumnarResult:
+    """Decode an encode() blob, or a legacy JSON entry."""
+    if isinstance(data, str) or not data.startswith(MAGIC):
+        return ColumnarResult.from_payload(serializer.loads(data))
+    return ColumnarResult.from_payload(_unpack(data))
+
+
+def encode_chunk(rows: list[tuple[Any, ...]], compression: str = "zlib", min_compress_bytes: int = 1024) -> bytes:
+    """Encode one chunk of rows of a chunked result."""
+    return _pack(rows, compression, min_compress_bytes)
+
+
+def decode_chunk(data: bytes) -> list[tuple[Any, ...]]:
+    return [tuple(row) for row in _unpack(data)]
+
+
+def encode_manifest(manifest: dict[str, Any]) -> bytes:
+    return MANIFEST_MAGIC + bytes((VERSION, COMPRESSION_NONE)) + serializer.dumps_bytes(manifest)
+
+
+def decode_manifest(data: bytes) -> dict[str, Any]:
+    if len(data) < 4:
+        raise ValueError("Truncated cache manifest")
+    if data[2] != VERSION:
+        raise ValueError(f"Unsupported cache manifest version {data[2]}")
+    return serializer.loads(bytes(data[4:]))
+
+
+def is_manifest(data: bytes | str) -> bool:
+    return isinstance(data, bytes) and data.startswith(MANIFEST_MAGIC)
+
+
+def _pack(obj: Any, compression: str, min_compress_bytes: int) -> bytes:
+    body = serializer.dumps_bytes(obj)
+    codec = _COMPRESSION_IDS.get(compression, COMPRESSION_ZLIB)
+    if codec == COMPRESSION_LZ4 and lz4_frame is None:
+        codec = COMPRESSION_ZLIB
+    if len(body) < min_compress_bytes:
+        codec = COMPRESSION_NONE
+
+    if codec == COMPRESSION_ZLIB:
+        body = zlib.compress(body, _ZLIB_LEVEL)
+    elif codec == COMPRESSION_LZ4:
+        body = lz4_frame.compress(body)
+    return MAGIC + bytes((VERSION, codec)) + body
+
+
+def _unpack(data: bytes) -> Any:
+    """Decode a _pack() blob; any unreadable blob raises ValueError (a cache miss to callers)."""
+    if not data.startswith(MAGIC):
+        raise ValueError("Not a cache codec blob")
+    if len(data) < 4:
+        raise ValueError("Truncated cache codec header")
+    version, codec = data[2], data[3]
+    if version != VERSION:
+        raise ValueError(f"Unsupported cache codec version {version}")
+    body: Any = memoryview(data)[4:]
+    if codec == COMPRESSION_ZLIB:
+        try:
+            body = zlib.decompress(body)
+        except zlib.error as exc:
+            raise ValueError(f"Corrupt zlib cache body: {exc}") from exc
+    elif codec == COMPRESSION_LZ4:
+        if lz4_frame is None:
+            raise ValueError("Cache entry is lz4-compressed but lz4 is not installed")
+        try:
+            body = lz4_frame.decompress(body)
+        except RuntimeError as exc:  # lz4 reports corrupt frames as RuntimeError
+            raise ValueError(f"Corrupt lz4 cache body: {exc}") from exc
+    elif codec != COMPRESSION_NONE:
+        raise ValueError(f"Unknown cache compression id {codec}")
+    return serializer.loads(bytes(body))
@@ -0,0 +1,60 @@
+"""
+Table data-version poller for the result cache.
+
+Every interval it reads the version tokens of each connected datasource's
+tables (DatabaseAdapter.get_table_versions) and invalidates the cached
+results of tables whose token changed since the previous poll. This catches
+writes the app never sees — ETL loads, other services — so results can be
+cached with long TTLs. Only the changed datasource's entries are dropped (its
+cache namespace). The first poll of a datasource only records a baseline.
+"""
+
+import asyncio
+
+from src.log import get_logger
+from src.cache.redis_client import invalidate_table
+from src.db.adapters.factory import DatasourceRegistry
+
+logger = get_logger(__name__)
+
+
+class TableVersionPoller:
+    """Invalidate cached results when a table's data version moves."""
+
+    def __init__(self, registry: DatasourceRegistry, interval: float) -> None:
+        self._registry = registry
+        self._interval = interval
+        self._versions: dict[str, dict[str, str]] = {}
+
+    async def poll(self) -> list[str]:
+        """Compare versions once; return the tables that were invalidated."""
+        invalidated: list[str] = []
+        for ds, adapter in self._registry.connected().items():
+            try:
+                versions = await adapter.get_table_versions()
+            except Exception as exc:
+                logger.warning("Table version poll failed | datasource=%s error=%s", ds, exc)
+                continue
+            if versions is None:
+                continue
+            previous = self._versions.get(ds)
+            self._versions[ds] = versions
+            if previous is None:
+                continue
+            changed = {t for t, v in versions.items() if previous.get(t) != v}
+            changed.update(t for t in previous if t not in versions)
+            for table in sorted(changed):
+                await invalidate_table(table, adapter.cache_namespace)
+                invalidated.append(table)
+        if invalidated:
+            logger.info("Table versions changed | tables=%s", ", ".join(invalidated))
+        return invalidated
+
+    async def run(self) -> None:
+        """Background loop: poll every interval seconds."""
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.poll()
+            except Exception as exc:
+                logger.warning("Table version poll failed: %s", exc)
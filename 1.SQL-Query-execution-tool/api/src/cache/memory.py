@@ -0,0 +1,319 @@
+"""
+In-process cache used when Redis is not available.
+
+Implements the subset of the redis.asyncio string, set and hash API the app uses, with
+per-key expiry, LRU eviction under a byte budget (key + value length) and a
+background sweep that drops expired keys nobody reads again.
+"""
+
+import asyncio
+import builtins
+import heapq
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+from src.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class _Entry(NamedTuple):
+    value: Any
+    expires_at: float | None
+    size: int
+
+
+def _sizeof(key: str, value: Any) -> int:
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(key) + len(value)
+    if isinstance(value, (set, frozenset)):
+        return len(key) + sum(len(str(member)) for member in value)
+    if isinstance(value, dict):
+        return len(key) + sum(len(field) + len(str(v)) for field, v in value.items())
+    return len(key) + len(str(value))
+
+
+class InMemoryCache:
+    """Bounded TTL + LRU fallback for local development and single-node deployments."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, sweep_interval: float = 30.0) -> None:
+        self._data: OrderedDict[str, _Entry] = OrderedDict()
+        # (expires_at, key) min-heap; stale items are skipped when popped and
+        # dropped in bulk once they outnumber the live keys.
+        self._expiries: list[tuple[float, str]] = []
+        self._max_bytes = max_bytes
+        self._sweep_interval = sweep_interval
+        self._sweeper: asyncio.Task | None = None
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    # ── redis-compatible API ────────────────────────────────────────────────
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._live(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._data.move_to_end(key)
+        return entry.value
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ex: float | None = None,
+        px: int | None = None,
+        nx: bool = False,
+        get: bool = False,
+    ) -> Any:
+        previous = self._live(key)
+        if nx and previous is not None:
+            return None
+        ttl = ex if ex is not None else (px / 1000 if px is not None else None)
+        self._store(key, value, ttl)
+        if get:
+            # Like SET ... GET: the value that was replaced.
+            return previous.value if previous is not None else None
+        return True
+
+    async def setex(self, key: str, ttl: float, value: Any) -> None:
+        self._store(key, value, ttl)
+
+    async def mget(self, *keys: str) -> list[Any | None]:
+        return [await self.get(key) for key in keys]
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        entry = self._live(key)
+        value = int(entry.value if entry is not None else 0) + amount
+        self._store(key, str(value), self._remaining(entry))
+        return value
+
+    async def delete(self, *keys: str) -> int:
+        return sum(self._remove(key) is not None for key in keys)
+
+    async def getdel(self, key: str) -> Any | None:
+        entry = self._live(key)
+        if entry is None:
+            return None
+        self._remove(key)
+        return entry.value
+
+    async def exists(self, *keys: str) -> int:
+        return sum(self._live(key) is not None for key in keys)
+
+    async def ttl(self, key: str) -> int:
+        entry = self._live(key)
+        if entry is None:
+            return -2
+        if entry.expires_at is None:
+            return -1
+        return max(int(entry.expires_at - time.monotonic()), 0)
+
+    # ── atomic helpers (Lua scripts on Redis, see src/cache/claims.py) ────
+    # No awaits inside, so each runs without interleaving on the event loop.
+
+    async def claim_first(
+        self, pairs: list[tuple[str, str, float]], owner: str
+    ) -> tuple[int, Any | None] | None:
+        """Move the first existing pending key to its claimed key, owned by owner.
+
+        pairs holds (pending_key, claimed_key, claimed_ttl). Returns (index,
+        payload) for a successful claim, (index, None) when that pair is
+        already claimed, None when nothing is pending.
+        """
+        for index, (pending_key, claimed_key, ttl) in enumerate(pairs):
+            entry = self._live(pending_key)
+            if entry is not None:
+                self._remove(pending_key)
+                self._store(claimed_key, owner, ttl)
+                return index, entry.value
+            if self._live(claimed_key) is not None:
+                return index, None
+        return None
+
+    async def delete_if_equals(self, key: str, value: Any) -> int:
+        entry = self._live(key)
+        if entry is None or entry.value != value:
+            return 0
+        self._remove(key)
+        return 1
+
+    async def expire(self, key: str, ttl: float) -> bool:
+        entry = self._live(key)
+        if entry is None:
+            return False
+        self._store(key, entry.value, ttl)
+        return True
+
+    async def sadd(self, key: str, *members: str) -> int:
+        entry = self._live(key)
+        current = set(entry.value) if entry is not None else set()
+        added = len(set(members) - current)
+        self._store(key, current | set(members), self._remaining(entry))
+        return added
+
+    async def srem(self, key: str, *members: str) -> int:
+        entry = self._live(key)
+        if entry is None:
+            return 0
+        remaining = set(entry.value) - set(members)
+        if remaining:
+            self._store(key, remaining, self._remaining(entry))
+        else:
+            self._remove(key)
+        return len(entry.value) - len(remaining)
+
+    async def smembers(self, key: str) -> builtins.set[str]:  # the set method shadows the builtin
+        entry = self._live(key)
+        return set(entry.value) if entry is not None else set()
+
+    async def sunion(self, *keys: str) -> builtins.set[str]:
+        members: set[str] = set()
+        for key in keys:
+            members |= await self.smembers(key)
+        return members
+
+    async def hset(self, key: str, field: str | None = None, value: Any = None,
+                   mapping: dict[str, Any] | None = None) -> int:
+        entry = self._live(key)
+        current = dict(entry.value) if entry is not None else {}
+        updates = dict(mapping or {})
+        if field is not None:
+            updates[field] = value
+        added = len(updates.keys() - current.keys())
+        current.update((f, str(v)) for f, v in updates.items())
+        self._store(key, current, self._remaining(entry))
+        return added
+
+    async def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        entry = self._live(key)
+        current = dict(entry.value) if entry is not None else {}
+        value = int(current.get(field, 0)) + amount
+        current[field] = str(value)
+        self._store(key, current, self._remaining(entry))
+        return value
+
+    async def hincrbyfloat(self, key: str, field: str, amount: float = 1.0) -> float:
+        entry = self._live(key)
+        current = dict(entry.value) if entry is not None else {}
+        value = float(current.get(field, 0)) + amount
+        current[field] = repr(value)
+        self._store(key, current, self._remaining(entry))
+        return value
+
+    async def hgetall(self, key: str) -> dict[str, Any]:
+        entry = self._live(key)
+        return dict(entry.value) if entry is not None else {}
+
+    async def flushdb(self) -> None:
+        self._data.clear()
+        self._expiries.clear()
+        self._bytes = 0
+
+    async def ping(self) -> bool:
+        return True
+
+    async def aclose(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        await self.flushdb()
+
+    # ── stats / maintenance ─────────────────────────────────────────────────
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+        }
+
+    def sweep(self) -> int:
+        """Drop every expired key; return how many were removed."""
+        now = time.monotonic()
+        removed = 0
+        while self._expiries and self._expiries[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiries)
+            entry = self._data.get(key)
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(key)
+                self._expirations += 1
+                removed += 1
+        return removed
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._sweep_interval)
+            removed = self.sweep()
+            if removed:
+                logger.debug("InMemoryCache sweep | expired=%d", removed)
+
+    # ── internals ───────────────────────────────────────────────────────────
+
+    def _live(self, key: str) -> _Entry | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self._expirations += 1
+            return None
+        return entry
+
+    @staticmethod
+    def _remaining(entry: _Entry | None) -> float | None:
+        """Seconds left on a live entry's expiry (None when it has none)."""
+        if entry is None or entry.expires_at is None:
+            return None
+        return max(entry.expires_at - time.monotonic(), 0.001)
+
+    def _store(self, key: str, value: Any, ttl: float | None) -> None:
+        size = _sizeof(key, value)
+        self._remove(key)
+        if size > self._max_bytes:
+            logger.debug("InMemoryCache value over budget, not stored | key=%s size=%d", key[:32], size)
+            return
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._data[key] = _Entry(value, expires_at, size)
+        self._bytes += size
+        if expires_at is not None:
+            heapq.heappush(self._expiries, (expires_at, key))
+            if len(self._expiries) > 2 * len(self._data):
+                self._compact_expiries()
+            self._ensure_sweeper()
+        while self._bytes > self._max_bytes:
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self._evictions += 1
+
+    def _compact_expiries(self) -> None:
+        """Rebuild the expiry heap from the live entries (overwrites leave stale items)."""
+        self._expiries = [
+            (entry.expires_at, key) for key, entry in self._data.items() if entry.expires_at is not None
+        ]
+        heapq.heapify(self._expiries)
+
+    def _remove(self, key: str) -> _Entry | None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+        return entry
+
+    def _ensure_sweeper(self) -> None:
+        if self._sweeper is not None or self._sweep_interval <= 0:
+            return
+        try:
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_loop())
+        except RuntimeError:
+            pass  # no running loop; lazy expiry on access still applies
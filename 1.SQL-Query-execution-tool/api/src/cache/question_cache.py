@@ -0,0 +1,191 @@
+"""
+Question-level cache in front of DeepAgent.run.
+
+A first-turn question whose answer is cached is answered by replaying the
+stored SQL, RESULT and ANSWER events; no LLM call and no query is made.
+Entries are scoped to the datasource, its schema fingerprint and the
+enabled skills / MCP servers, and keyed by the normalised question text:
+lower-cased words, numbers (with sign, decimals and %) and comparison
+operators, so "amount > 1000" and "amount < 1000" never share an entry.
+Answers are recorded from runs that complete without an interrupt, or from
+the resume of a plainly approved interrupt (remember_thread() carries the
+question over to the resume, which may run in another worker). Entries are
+tagged with the tables of their SQL, so invalidate_table() drops them too.
+
+With question_cache_similarity > 0, rephrasings are matched as well: every
+entry is indexed under the LSH bands of its MinHash signature, and the most
+similar candidate at or above the threshold is used, provided it mentions
+exactly the same numbers and operators ("top 5" never matches "top 10", nor
+"> 1000" "< 1000"). MinHash itself sees words only.
+"""
+
+import hashlib
+import re
+from typing import Any
+
+from src.log import get_logger
+from src.agent.events import AgentEvent, EventType
+from src.cache.redis_client import get_redis, tag_tables
+from src.config.settings import get_settings
+from src.db.adapters.base import DatabaseAdapter
+from src.utils import minhash, serializer
+from src.utils.sql import referenced_tables
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Events that make up a replayable answer.
+_RECORDED = {EventType.SQL, EventType.RESULT, EventType.ANSWER}
+
+
+# Comparison operators, signed numbers (decimals, percent), words, and the
+# sign / percent characters on their own; other punctuation is dropped.
+_KEY_TOKEN = re.compile(r"[<>=!≤≥≠]+|-?\d+(?:\.\d+)?%?|[^\W_]+|[-%]")
+_OPERATOR = re.compile(r"[<>=!≤≥≠]+|[-%]")
+
+
+def normalize_question(question: str) -> str:
+    """Case- and whitespace-insensitive form of question that keeps operators and signs."""
+    return " ".join(_KEY_TOKEN.findall(question.lower()))
+
+
+async def question_scope(
+    adapter: DatabaseAdapter, runtime_config: dict[str, list[str]] | None
+) -> str | None:
+    """Scope id for questions against adapter with runtime_config; None disables caching."""
+    try:
+        schema = await adapter.get_schema_fingerprint()
+    except Exception as exc:
+        logger.warning("Schema fingerprint failed; question cache bypassed: %s", exc)
+        return None
+    if schema is None:
+        return None
+    config = runtime_config or {}
+    parts = [
+        adapter.cache_namespace,
+        schema,
+        ",".join(sorted(config.get("enabled_skills") or [])),
+        ",".join(sorted(config.get("skill_dirs") or [])),
+        ",".join(sorted(config.get("mcp_servers") or [])),
+    ]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+
+
+async def get_cached_answer(scope: str, question: str) -> list[AgentEvent] | None:
+    """Recorded events for question (or a close rephrasing) in scope, if any."""
+    client = await get_redis()
+    normalized = normalize_question(question)
+    data = await client.get(_entry_key(scope, normalized))
+    if data is None and settings.question_cache_similarity > 0:
+        data = await _nearest(client, scope, normalized)
+    if data is None:
+        return None
+    entry = serializer.loads(data)
+    logger.info("Question cache hit | scope=%s question=%s", scope, question[:80])
+    return [AgentEvent.model_validate(event) for event in entry["events"]]
+
+
+async def set_cached_answer(
+    scope: str, question: str, events: list[AgentEvent], namespace: str = ""
+) -> bool:
+    """Store the replayable part of events; False if they hold no answer.
+
+    namespace is the datasource's cache namespace, under which the entry is
+    tagged with its tables.
+    """
+    recorded = [e for e in events if e.type in _RECORDED]
+    if any(e.type == EventType.ERROR for e in events) or not any(
+        e.type == EventType.ANSWER for e in recorded
+    ):
+        return False
+
+    client = await get_redis()
+    ttl = settings.question_cache_ttl_seconds
+    normalized = normalize_question(question)
+    key = _entry_key(scope, normalized)
+    sig = minhash.signature(normalized)
+    entry = {
+        "question": normalized,
+        "signature": sig,
+        "events": [e.model_dump(exclude_none=True) for e in recorded],
+    }
+    await client.setex(key, ttl, serializer.dumps(entry))
+    for bucket in minhash.lsh_bands(sig):
+        await client.sadd(_band_key(scope, bucket), key)
+        await client.expire(_band_key(scope, bucket), ttl)
+    tables: set[str] = set()
+    for event in recorded:
+        if event.type == EventType.SQL and event.content:
+            tables |= referenced_tables(event.content)
+    await tag_tables(key, tables, ttl, namespace)
+    logger.info("Question cached | scope=%s question=%s tables=%s", scope, question[:80], sorted(tables))
+    return True
+
+
+async def remember_thread(thread_id: str, scope: str, question: str) -> None:
+    """Carry an interrupted first-turn question over to its resume."""
+    client = await get_redis()
+    await client.setex(
+        _thread_key(thread_id),
+        settings.question_cache_ttl_seconds,
+        serializer.dumps({"scope": scope, "question": question}),
+    )
+
+
+async def recall_thread(thread_id: str) -> tuple[str, str] | None:
+    """(scope, question) remembered for thread_id, consumed on read."""
+    client = await get_redis()
+    data = await client.getdel(_thread_key(thread_id))
+    if data is None:
+        return None
+    obj = serializer.loads(data)
+    return obj["scope"], obj["question"]
+
+
+async def _nearest(client: Any, scope: str, normalized: str) -> str | None:
+    sig = minhash.signature(normalized)
+    candidates = sorted(await client.sunion(*(_band_key(scope, b) for b in minhash.lsh_bands(sig))))
+    if not candidates:
+        return None
+    literals = _literals(normalized)
+    best, best_score = None, settings.question_cache_similarity
+    for data in await client.mget(*candidates):
+        if data is None:
+            continue
+        entry = serializer.loads(data)
+        score = minhash.similarity(sig, entry["signature"])
+        if score >= best_score and _literals(entry["question"]) == literals:
+            best, best_score = data, score
+    if best is not None:
+        logger.debug("Question near-duplicate match | similarity=%.2f", best_score)
+    return best
+
+
+def _literals(normalized: str) -> list[str]:
+    """Numbers and operators of a normalised question, each operator bound to the number after it."""
+    literals: list[str] = []
+    pending = ""
+    for token in normalized.split():
+        if _OPERATOR.fullmatch(token):
+            pending += token
+        elif any(ch.isdigit() for ch in token):
+            literals.append(pending + token)
+            pending = ""
+        elif pending:
+            literals.append(pending)
+            pending = ""
+    if pending:
+        literals.append(pending)
+    return sorted(literals)
+
+
+def _entry_key(scope: str, normalized: str) -> str:
+    return f"question_cache:{scope}:" + hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def _band_key(scope: str, bucket: str) -> str:
+    return f"question_cache:lsh:{scope}:{bucket}"
+
+
+def _thread_key(thread_id: str) -> str:
+    return f"question_cache:thread:{thread_id}"
@@ -1,39 +1,36 @@
+import asyncio
 import json
-import hashlib
-from typing import Any, Union
+import uuid
+from typing import Any, NamedTuple, Union
 import redis.asyncio as aioredis
 from src.log import get_logger
+from src.cache import codec
+from src.cache.memory import InMemoryCache
+from src.cache.tiered import L1Cache
 from src.config.settings import get_settings
+from src.db.result import ColumnarResult
+from src.utils.sql import fingerprint, referenced_tables
 
 logger = get_logger(__name__)
 settings = get_settings()
 
-class InMemoryCache:
-    """Simple in-memory fallback for local development."""
-    def __init__(self):
-        self._data: dict[str, str] = {}
-        logger.info("Using InMemoryCache fallback")
-
-    async def get(self, key: str) -> str | None:
-        return self._data.get(key)
-
-    async def setex(self, key: str, ttl: int, value: str) -> None:
-        # TTL is ignored in this simple implementation
-        self._data[key] = value
-
-    async def delete(self, key: str) -> None:
-        self._data.pop(key, None)
-
-    async def getdel(self, key: str) -> str | None:
-        return self._data.pop(key, None)
-
-    async def ping(self) -> bool:
-        return True
+_client: Union[aioredis.Redis, InMemoryCache, None] = None
+_bytes_client: aioredis.Redis | None = None
+_l1: L1Cache | None = None
 
-    async def aclose(self) -> None:
-        self._data.clear()
+# Chunks of a chunked result fetched per MGET round trip.
+_CHUNKS_PER_READ = 8
+# Rows encoded to estimate a result's size before deciding to chunk it.
+_SIZE_SAMPLE_ROWS = 100
+# How long the chunks of a replaced result stay readable for pages in progress.
+_OLD_CHUNKS_GRACE_SECONDS = 60
 
-_client: Union[aioredis.Redis, InMemoryCache, None] = None
+def _memory_cache() -> InMemoryCache:
+    logger.info("Using InMemoryCache fallback | max_bytes=%d", settings.memory_cache_max_bytes)
+    return InMemoryCache(
+        max_bytes=settings.memory_cache_max_bytes,
+        sweep_interval=settings.memory_cache_sweep_seconds,
+    )
 
 async def get_redis() -> Union[aioredis.Redis, InMemoryCache]:
     global _client
@@ -55,10 +52,10 @@ async def get_redis() -> Union[aioredis.Redis, InMemoryCache]:
                     _client = real_redis
                     logger.info("Successfully connected to Redis.")
                 else:
-                    _client = InMemoryCache()
+                    _client = _memory_cache()
             except Exception as e:
                 logger.warning("Redis connection failed (%s). Falling back to InMemoryCache.", e)
-                _client = InMemoryCache()
+                _client = _memory_cache()
         else:
             logger.info("Connecting to production Redis at %s", settings.redis_url)
             _client = aioredis.from_url(
@@ -68,27 +65,311 @@ async def get_redis() -> Union[aioredis.Redis, InMemoryCache]:
             )
     return _client
 
+async def get_redis_bytes() -> Union[aioredis.Redis, InMemoryCache]:
+    """Client without response decoding, for binary values (cached results).
+
+    Shares the in-process fallback with get_redis() when Redis is unavailable.
+    """
+    global _bytes_client
+    client = await get_redis()
+    if isinstance(client, InMemoryCache):
+        return client
+    if _bytes_client is None:
+        _bytes_client = aioredis.from_url(settings.redis_url, decode_responses=False)
+    return _bytes_client
+
+def _l1_cache(client: Union[aioredis.Redis, InMemoryCache]) -> L1Cache | None:
+    """Per-worker L1 for result keys; only used in front of a real Redis."""
+    global _l1
+    if not settings.result_cache_l1_enabled or isinstance(client, InMemoryCache):
+        return None
+    if _l1 is None:
+        _l1 = L1Cache(
+            max_bytes=settings.result_cache_l1_max_bytes,
+            ttl_seconds=settings.result_cache_l1_ttl_seconds,
+        )
+    _l1.attach(client)
+    return _l1
+
+def get_result_cache_stats() -> dict | None:
+    """L1 result cache stats, or None when no L1 is active."""
+    return _l1.stats() if _l1 is not None else None
+
 async def close_redis() -> None:
-    global _client
+    global _client, _bytes_client, _l1
+    if _l1 is not None:
+        await _l1.close()
+        _l1 = None
+    if _bytes_client is not None:
+        await _bytes_client.aclose()
+        _bytes_client = None
     if _client is not None:
         logger.info("Closing cache connection")
         await _client.aclose()
         _client = None
 
-async def get_cached_result(sql: str) -> dict[str, Any] | None:
+class CachedEntry(NamedTuple):
+    result: ColumnarResult
+    # Past the soft TTL: still served, but due for a background refresh.
+    stale: bool = False
+
+class CachedPage(NamedTuple):
+    # Only the requested rows; truncated refers to the whole cached result.
+    result: ColumnarResult
+    offset: int
+    total_rows: int
+
+async def _read_entry(key: str) -> tuple[Any, bool]:
+    """Raw value at key (L1 first, then Redis) and whether it is stale."""
     client = await get_redis()
-    key = _make_key(sql)
-    cached = await client.get(key)
+    l1 = _l1_cache(client)
+    cached = await l1.get(key) if l1 is not None else None
+    stale = False
     if cached:
-        logger.debug("Cache hit | key=%s", key[:32])
-    return json.loads(cached) if cached else None
+        logger.debug("L1 cache hit | key=%s", key[:32])
+        return cached, stale
+    if _soft_ttl():
+        # The value and its freshness marker in one round trip.
+        cached, fresh = await (await get_redis_bytes()).mget(key, _fresh_key(key))
+        stale = fresh is None
+    else:
+        cached = await (await get_redis_bytes()).get(key)
+    if cached:
+        logger.debug("Cache hit | key=%s stale=%s", key[:32], stale)
+        if l1 is not None and not stale:
+            await l1.put(key, cached, settings.redis_ttl_seconds)
+    return cached, stale
+
+async def get_cached_entry(sql: str, namespace: str = "") -> CachedEntry | None:
+    key = result_key(sql, namespace)
+    cached, stale = await _read_entry(key)
+    if not cached:
+        return None
+    try:
+        if codec.is_manifest(cached):
+            manifest = codec.decode_manifest(cached)
+            rows = await _read_chunks(key, manifest, range(manifest["chunks"]))
+            if rows is None:
+                return None
+            result = ColumnarResult(manifest["columns"], rows, manifest["truncated"])
+        else:
+            result = codec.decode(cached)
+    except ValueError as exc:
+        logger.warning("Unreadable cache entry, treating as miss | key=%s error=%s", key[:32], exc)
+        return None
+    return CachedEntry(result, stale)
+
+async def get_cached_result(sql: str, namespace: str = "") -> ColumnarResult | None:
+    entry = await get_cached_entry(sql, namespace)
+    return entry.result if entry is not None else None
+
+async def get_cached_page(sql: str, offset: int, limit: int, namespace: str = "") -> CachedPage | None:
+    """Rows offset .. offset + limit of a cached result; only their chunks are fetched."""
+    key = result_key(sql, namespace)
+    cached, _ = await _read_entry(key)
+    if not cached:
+        return None
+    try:
+        if not codec.is_manifest(cached):
+            result = codec.decode(cached)
+            page = ColumnarResult(result.columns, result.rows[offset:offset + limit], result.truncated)
+            return CachedPage(page, offset, result.row_count)
+        manifest = codec.decode_manifest(cached)
+        size = manifest["chunk_rows"]
+        first, last = offset // size, min(-(-(offset + limit) // size), manifest["chunks"])
+        rows = await _read_chunks(key, manifest, range(first, last))
+    except ValueError as exc:
+        logger.warning("Unreadable cache entry, treating as miss | key=%s error=%s", key[:32], exc)
+        return None
+    if rows is None:
+        return None
+    skip = offset - first * size
+    page = ColumnarResult(manifest["columns"], rows[skip:skip + limit], manifest["truncated"])
+    return CachedPage(page, offset, manifest["row_count"])
 
-async def set_cached_result(sql: str, result: dict[str, Any]) -> None:
+async def set_cached_result(sql: str, result: ColumnarResult, namespace: str = "") -> None:
     client = await get_redis()
-    key = _make_key(sql)
-    await client.setex(key, settings.redis_ttl_seconds, json.dumps(result))
+    key = result_key(sql, namespace)
+    bytes_client = await get_redis_bytes()
+    chunk_rows = _chunk_rows(result)
+    if chunk_rows:
+        # Chunks go in before the manifest that points at them.
+        value = await _write_chunks(bytes_client, key, result, chunk_rows)
+    else:
+        value = codec.encode(
+            result,
+            compression=settings.result_cache_compression,
+            min_compress_bytes=settings.result_cache_compress_min_bytes,
+        )
+    if soft_ttl := _soft_ttl():
+        # Marker first: a reader in between sees the old value as fresh, not
+        # the new one as stale (which could start a needless refresh).
+        await bytes_client.setex(_fresh_key(key), soft_ttl, b"1")
+    # SET ... GET: the replaced value comes back in the same round trip.
+    previous = await bytes_client.set(key, value, ex=settings.redis_ttl_seconds, get=True)
+    if old_chunks := _manifest_chunk_keys(key, previous):
+        await _expire_soon(bytes_client, old_chunks)
+    l1 = _l1_cache(client)
+    if l1 is not None:
+        # Other workers may hold the previous value for this key.
+        await l1.invalidate(client, key)
+        await l1.put(key, value, settings.redis_ttl_seconds)
+    await tag_tables(key, referenced_tables(sql), settings.redis_ttl_seconds, namespace)
     logger.debug("Cache set | key=%s ttl=%ds", key[:32], settings.redis_ttl_seconds)
 
+def _chunk_rows(result: ColumnarResult) -> int:
+    """Rows per chunk for result, or 0 to store it as one value.
+
+    The encoded size is estimated from the first rows, so a large result is
+    never encoded in one piece.
+    """
+    chunk_bytes = settings.result_cache_chunk_bytes
+    if chunk_bytes <= 0 or not result.rows:
+        return 0
+    sample = result.rows[:_SIZE_SAMPLE_ROWS]
+    sample_bytes = len(codec.encode_chunk(
+        sample,
+        compression=settings.result_cache_compression,
+        min_compress_bytes=settings.result_cache_compress_min_bytes,
+    ))
+    if sample_bytes * result.row_count <= chunk_bytes * len(sample):
+        return 0
+    return max(chunk_bytes * len(sample) // sample_bytes, 1)
+
+async def _write_chunks(
+    client: Union[aioredis.Redis, InMemoryCache], key: str, result: ColumnarResult, chunk_rows: int
+) -> bytes:
+    """Store result in chunks of chunk_rows rows; return the manifest for key.
+
+    Every write uses fresh chunk keys (a new generation), so a reader paging
+    through the previous version never mixes in chunks of this one; the old
+    chunks are kept for _OLD_CHUNKS_GRACE_SECONDS once the new manifest is in.
+    """
+    generation = uuid.uuid4().hex[:12]
+    items: list[tuple[str, bytes]] = []
+    for index, start in enumerate(range(0, result.row_count, chunk_rows)):
+        items.append((
+            _chunk_key(key, generation, index),
+            codec.encode_chunk(
+                result.rows[start:start + chunk_rows],
+                compression=settings.result_cache_compression,
+                min_compress_bytes=settings.result_cache_compress_min_bytes,
+            ),
+        ))
+        await asyncio.sleep(0)  # let other requests run between chunk encodes
+    if isinstance(client, InMemoryCache):
+        for chunk_key, blob in items:
+            await client.setex(chunk_key, settings.redis_ttl_seconds, blob)
+    else:
+        async with client.pipeline(transaction=False) as pipe:
+            for chunk_key, blob in items:
+                pipe.setex(chunk_key, settings.redis_ttl_seconds, blob)
+            await pipe.execute()
+    return codec.encode_manifest({
+        "columns": result.columns,
+        "row_count": result.row_count,
+        "truncated": result.truncated,
+        "chunk_rows": chunk_rows,
+        "chunks": len(items),
+        "generation": generation,
+    })
+
+async def _expire_soon(client: Union[aioredis.Redis, InMemoryCache], keys: list[str]) -> None:
+    """Shorten the TTL of replaced chunks to the grace period."""
+    if isinstance(client, InMemoryCache):
+        for key in keys:
+            await client.expire(key, _OLD_CHUNKS_GRACE_SECONDS)
+        return
+    async with client.pipeline(transaction=False) as pipe:
+        for key in keys:
+            pipe.expire(key, _OLD_CHUNKS_GRACE_SECONDS)
+        await pipe.execute()
+
+async def _read_chunks(key: str, manifest: dict[str, Any], indexes: range) -> list[tuple[Any, ...]] | None:
+    """Rows of the given chunks, read _CHUNKS_PER_READ per round trip; None if any is gone."""
+    client = await get_redis_bytes()
+    keys = [_chunk_key(key, manifest["generation"], i) for i in indexes]
+    rows: list[tuple[Any, ...]] = []
+    for start in range(0, len(keys), _CHUNKS_PER_READ):
+        blobs = await client.mget(*keys[start:start + _CHUNKS_PER_READ])
+        if any(blob is None for blob in blobs):
+            logger.warning("Cache entry is missing chunks, treating as miss | key=%s", key[:32])
+            return None
+        for blob in blobs:
+            rows.extend(codec.decode_chunk(blob))
+            await asyncio.sleep(0)
+    return rows
+
+async def _chunk_keys(keys: list[str]) -> list[str]:
+    """Chunk keys of those of keys that hold a chunked result's manifest."""
+    chunk_keys: list[str] = []
+    for key, value in zip(keys, await (await get_redis_bytes()).mget(*keys)):
+        chunk_keys.extend(_manifest_chunk_keys(key, value))
+    return chunk_keys
+
+def _manifest_chunk_keys(key: str, value: bytes | None) -> list[str]:
+    """Chunk keys named by value if it is the manifest stored at key, else []."""
+    if not value or not codec.is_manifest(value):
+        return []
+    try:
+        manifest = codec.decode_manifest(value)
+    except ValueError:
+        return []
+    return [_chunk_key(key, manifest["generation"], i) for i in range(manifest["chunks"])]
+
+async def delete_cached_result(sql: str, namespace: str = "") -> None:
+    client = await get_redis()
+    key = result_key(sql, namespace)
+    await client.delete(key, _fresh_key(key), *await _chunk_keys([key]))
+    l1 = _l1_cache(client)
+    if l1 is not None:
+        await l1.invalidate(client, key)
+
+async def tag_tables(key: str, tables: set[str], ttl_seconds: int, namespace: str = "") -> None:
+    """Tag the entry at key with the tables it depends on, for invalidate_table().
+
+    Tags are per cache namespace (datasource) and live as long as their
+    newest member, so they never outlive the entries.
+    """
+    if not tables:
+        return
+    client = await get_redis()
+    tags = [_tag_key(table, namespace) for table in tables]
+    if isinstance(client, InMemoryCache):
+        for tag in tags:
+            await client.sadd(tag, key)
+            await client.expire(tag, ttl_seconds)
+        return
+    async with client.pipeline(transaction=False) as pipe:
+        for tag in tags:
+            pipe.sadd(tag, key)
+            pipe.expire(tag, ttl_seconds)
+        await pipe.execute()
+
+async def invalidate_table(table: str, namespace: str = "") -> int:
+    """Drop every cache entry of namespace tagged with table; return how many were dropped."""
+    client = await get_redis()
+    keys = list(await _pop_members(client, _tag_key(table, namespace)))
+    if keys:
+        await client.delete(*keys, *map(_fresh_key, keys), *await _chunk_keys(keys))
+        l1 = _l1_cache(client)
+        if l1 is not None:
+            await l1.invalidate(client, *keys)
+    logger.info("Cache invalidated | namespace=%s table=%s entries=%d", namespace, table, len(keys))
+    return len(keys)
+
+async def _pop_members(client: Union[aioredis.Redis, InMemoryCache], key: str) -> set[str]:
+    """Read and delete a set in one step, so members added meanwhile are not lost."""
+    if isinstance(client, InMemoryCache):
+        members = await client.smembers(key)
+        await client.delete(key)
+        return members
+    async with client.pipeline(transaction=True) as pipe:
+        pipe.smembers(key)
+        pipe.delete(key)
+        members, _ = await pipe.execute()
+    return members
+
 async def get_session_history(session_id: str) -> list[dict] | None:
     client = await get_redis()
     data = await client.get(f"session:{session_id}")
@@ -103,5 +384,27 @@ async def set_session_history(session_id: str, history: list[dict]) -> None:
     )
     logger.debug("Session history saved | session=%s messages=%d", session_id, len(history))
 
-def _make_key(sql: str) -> str:
-    return "sql_cache:" + hashlib.sha256(sql.strip().lower().encode()).hexdigest()
+def _soft_ttl() -> int:
+    """Soft TTL in seconds when stale-while-revalidate is on, else 0."""
+    soft = settings.result_cache_soft_ttl_seconds
+    return soft if 0 < soft < settings.redis_ttl_seconds else 0
+
+def _fresh_key(key: str) -> str:
+    # Present while the entry at key is younger than the soft TTL.
+    return key + ":fresh"
+
+def _chunk_key(key: str, generation: str, index: int) -> str:
+    return f"{key}:chunk:{generation}:{index}"
+
+def _tag_key(table: str, namespace: str = "") -> str:
+    # Tags use the unqualified name, as referenced_tables() reports it.
+    prefix = f"sql_cache:{namespace}:tag:" if namespace else "sql_cache:tag:"
+    return prefix + table.rsplit(".", 1)[-1].strip().strip('"`[]').lower()
+
+def result_key(sql: str, namespace: str = "") -> str:
+    """Result-cache key of sql; also the base of the single-flight and refresh lock keys."""
+    # namespace (DatabaseAdapter.cache_namespace) keeps identical SQL against
+    # different databases apart; the fingerprint ignores layout, comments and
+    # keyword case but not literals.
+    prefix = f"sql_cache:{namespace}:" if namespace else "sql_cache:"
+    return prefix + fingerprint(sql)
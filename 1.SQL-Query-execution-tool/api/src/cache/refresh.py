@@ -0,0 +1,69 @@
+"""
+Stale-while-revalidate for cached query results.
+
+Every cache hit is counted per worker (in a small TTL'd in-process cache, so
+counts reflect roughly the last soft-TTL window). When a hit is stale and the
+key is hot, the caller still gets the stale result immediately, and a
+background task re-runs the query and rewrites the entry. A Redis lock
+(SET NX) makes sure only one worker refreshes a key at a time; it is released
+after a successful refresh and left to expire after a failed one, which
+doubles as back-off.
+"""
+
+import asyncio
+import uuid
+from collections.abc import Awaitable, Callable
+
+from src.log import get_logger
+from src.cache.claims import release
+from src.cache.memory import InMemoryCache
+from src.cache.redis_client import get_redis, result_key
+from src.config.settings import get_settings
+from src.db.result import ColumnarResult
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+_hits = InMemoryCache(max_bytes=4 * 1024 * 1024)
+# Running refreshes; referenced here so they are not garbage collected.
+_refreshes: set[asyncio.Task] = set()
+
+
+async def record_hit(
+    sql: str, namespace: str, stale: bool, run: Callable[[], Awaitable[ColumnarResult]]
+) -> bool:
+    """Count a cache hit; start a background refresh if it is stale and hot.
+
+    run() re-executes the statement and stores the result (as
+    execute_and_cache does). Returns True if this call started a refresh.
+    """
+    key = result_key(sql, namespace)
+    hits = await _hits.incr(key)
+    if hits == 1:
+        await _hits.expire(key, max(settings.result_cache_soft_ttl_seconds, 1))
+    if not stale or hits < settings.result_cache_refresh_min_hits:
+        return False
+
+    client = await get_redis()
+    lock_key, token = f"{key}:refresh", uuid.uuid4().hex
+    lock_ms = int(settings.sql_single_flight_timeout_seconds * 1000)
+    if not await client.set(lock_key, token, nx=True, px=lock_ms):
+        return False  # another worker is already refreshing
+
+    task = asyncio.create_task(_refresh(key, lock_key, token, run))
+    _refreshes.add(task)
+    task.add_done_callback(_refreshes.discard)
+    return True
+
+
+async def _refresh(
+    key: str, lock_key: str, token: str, run: Callable[[], Awaitable[ColumnarResult]]
+) -> None:
+    try:
+        result = await run()
+    except Exception as exc:
+        logger.warning("Background cache refresh failed | key=%s error=%s", key[:32], exc)
+        return
+    await release(lock_key, token)
+    logger.info("Cache entry refreshed | key=%s rows=%d", key[:32], result.row_count)
+
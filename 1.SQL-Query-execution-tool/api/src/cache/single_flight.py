@@ -0,0 +1,138 @@
+"""
+Single-flight execution for identical SQL.
+
+Concurrent executions of the same statement (same result-cache key) share one
+run: within a process through a shared future, across workers through a Redis
+lock whose holder publishes the result on a channel once it is cached.
+Followers that miss the message (or whose leader dies) fall back to the
+result cache, then to running the statement themselves.
+"""
+
+import asyncio
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+
+from src.log import get_logger
+from src.cache.claims import release
+from src.cache.redis_client import get_cached_result, get_redis, result_key
+from src.config.settings import get_settings
+from src.db.result import ColumnarResult
+from src.utils import serializer
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Followers re-check the leader's lock this often while waiting for its message.
+_POLL_SECONDS = 0.5
+
+_IN_FLIGHT: dict[str, asyncio.Future] = {}
+
+
+class _LeaderCancelled(Exception):
+    """The in-process leader was cancelled; a waiter should take over."""
+
+
+async def single_flight(
+    sql: str, run: Callable[[], Awaitable[ColumnarResult]], namespace: str = ""
+) -> ColumnarResult:
+    """Return run()'s result, sharing one execution among concurrent callers for sql.
+
+    Statements with the same fingerprint in the same cache namespace count as
+    identical. run() is expected to store its result with set_cached_result()
+    before returning, so followers on other workers can read it from the cache.
+    """
+    key = result_key(sql, namespace)
+    while True:
+        shared = _IN_FLIGHT.get(key)
+        if shared is not None:
+            try:
+                result = await asyncio.shield(shared)
+                logger.debug("Single-flight joined in-process run | key=%s", key[:32])
+                return result
+            except _LeaderCancelled:
+                continue
+
+        shared = asyncio.get_running_loop().create_future()
+        _IN_FLIGHT[key] = shared
+        try:
+            result = await _run_across_workers(sql, namespace, key, run)
+        except asyncio.CancelledError:
+            shared.set_exception(_LeaderCancelled())
+            shared.exception()  # mark retrieved when nobody is waiting
+            raise
+        except Exception as exc:
+            shared.set_exception(exc)
+            shared.exception()
+            raise
+        else:
+            shared.set_result(result)
+            return result
+        finally:
+            if _IN_FLIGHT.get(key) is shared:
+                del _IN_FLIGHT[key]
+
+
+async def _run_across_workers(
+    sql: str, namespace: str, key: str, run: Callable[[], Awaitable[ColumnarResult]]
+) -> ColumnarResult:
+    client = await get_redis()
+    if not hasattr(client, "pubsub"):
+        # In-process cache: there are no other workers to coordinate with.
+        return await run()
+
+    timeout = settings.sql_single_flight_timeout_seconds
+    lock_key, channel = f"{key}:lock", f"{key}:done"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        token = uuid.uuid4().hex
+        if await client.set(lock_key, token, nx=True, px=int(timeout * 1000)):
+            return await _lead(client, lock_key, channel, token, run)
+        result = await _follow(client, sql, namespace, lock_key, channel, deadline)
+        if result is not None:
+            return result
+    logger.warning("Single-flight wait timed out; running query | key=%s", key[:32])
+    return await run()
+
+
+async def _lead(
+    client, lock_key: str, channel: str, token: str,
+    run: Callable[[], Awaitable[ColumnarResult]],
+) -> ColumnarResult:
+    try:
+        result = await run()
+    except Exception as exc:
+        await client.publish(channel, serializer.dumps({"error": str(exc)}))
+        raise
+    else:
+        await client.publish(channel, serializer.dumps(result.to_payload()))
+        return result
+    finally:
+        await release(lock_key, token)
+
+
+async def _follow(
+    client, sql: str, namespace: str, lock_key: str, channel: str, deadline: float
+) -> ColumnarResult | None:
+    """Wait for the lock holder's result; None means the caller should retry the lock."""
+    pubsub = client.pubsub()
+    await pubsub.subscribe(channel)
+    try:
+        while time.monotonic() < deadline:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=_POLL_SECONDS)
+            if message is None and not await client.exists(lock_key):
+                # The leader publishes right before releasing the lock: look once more.
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=_POLL_SECONDS)
+                if message is None:
+                    # Leader finished before we subscribed, or died: use its cached result if any.
+                    return await get_cached_result(sql, namespace)
+            if message is not None:
+                payload = serializer.loads(message["data"])
+                if "error" in payload:
+                    raise RuntimeError(payload["error"])
+                logger.debug("Single-flight result received | channel=%s", channel[:40])
+                return ColumnarResult.from_payload(payload)
+        return None
+    finally:
+        await pubsub.unsubscribe(channel)
+        await pubsub.aclose()
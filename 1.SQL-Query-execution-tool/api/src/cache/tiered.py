@@ -0,0 +1,85 @@
+"""
+Per-worker L1 in front of the Redis (L2) result cache.
+
+Hot result keys are served from process memory for a short TTL. Writes and
+deletes on L2 are announced on a Redis pub/sub channel; every worker's
+listener drops its L1 copy of the key, so an overwrite in one worker is not
+served stale from another for longer than the time the message takes.
+If the listener loses its subscription, L1 is flushed before resubscribing
+because invalidations may have been missed.
+"""
+
+import asyncio
+import uuid
+from typing import Any
+
+from src.log import get_logger
+from src.cache.memory import InMemoryCache
+
+logger = get_logger(__name__)
+
+INVALIDATION_CHANNEL = "sql_cache:invalidate"
+
+# Back-off before resubscribing after the listener's connection fails.
+_RESUBSCRIBE_SECONDS = 1.0
+
+
+class L1Cache:
+    """Short-lived per-worker copy of L2 entries, invalidated over pub/sub."""
+
+    def __init__(self, max_bytes: int, ttl_seconds: float) -> None:
+        self._cache = InMemoryCache(max_bytes=max_bytes, sweep_interval=max(ttl_seconds, 1.0))
+        self._ttl = ttl_seconds
+        self._worker_id = uuid.uuid4().hex
+        self._listener: asyncio.Task | None = None
+
+    def attach(self, client: Any) -> None:
+        """Make sure the invalidation listener is running against client."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen(client))
+
+    async def get(self, key: str) -> Any | None:
+        return await self._cache.get(key)
+
+    async def put(self, key: str, value: Any, ttl_seconds: float) -> None:
+        await self._cache.setex(key, min(self._ttl, ttl_seconds), value)
+
+    async def invalidate(self, client: Any, *keys: str) -> None:
+        """Drop keys here and tell the other workers to drop them too."""
+        if not keys:
+            return
+        await self._cache.delete(*keys)
+        await client.publish(INVALIDATION_CHANNEL, " ".join((self._worker_id, *keys)))
+
+    def stats(self) -> dict[str, Any]:
+        return self._cache.stats()
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        await self._cache.aclose()
+
+    async def _listen(self, client: Any) -> None:
+        while True:
+            pubsub = client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    data = message["data"]
+                    if isinstance(data, bytes):
+                        data = data.decode()
+                    origin, *keys = data.split()
+                    if origin != self._worker_id:
+                        await self._cache.delete(*keys)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("L1 invalidation listener failed; flushing L1: %s", exc)
+            finally:
+                await pubsub.aclose()
+            await self._cache.flushdb()
+            await asyncio.sleep(_RESUBSCRIBE_SECONDS)
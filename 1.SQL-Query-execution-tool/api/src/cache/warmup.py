@@ -0,0 +1,154 @@
+"""
+Query log and result-cache warming.
+
+execute_sql logs every statement it is asked for in a Redis hash keyed by
+the statement's fingerprint (sql_log:{namespace}:{fingerprint} with fields
+sql, requests, runs, total_ms), plus a per-database set of the fingerprints
+seen. Entries expire after query_log_ttl_seconds without a request.
+
+After a deploy the result cache is cold; warm_cache() re-runs the most
+requested statements whose average execution time is within a bound, a few
+at a time, so the first users find them cached. The app does this in the
+background at startup (RESULT_CACHE_WARMUP_QUERIES); it can also be run by
+hand:
+
+    python -m src.cache.warmup [--datasource ID] [--top N] [--concurrency N] [--max-ms MS]
+"""
+
+import argparse
+import asyncio
+from typing import Any, NamedTuple, Union
+
+import redis.asyncio as aioredis
+
+from src.log import get_logger
+from src.cache.memory import InMemoryCache
+from src.cache.redis_client import get_cached_entry, get_redis
+from src.config.settings import get_settings
+from src.db.adapters.base import DatabaseAdapter
+from src.utils.sql import fingerprint
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+class LoggedQuery(NamedTuple):
+    sql: str
+    requests: int
+    avg_ms: float
+
+
+async def record_request(sql: str, namespace: str) -> None:
+    """Count a request for sql (cached or not) in the query log."""
+    key, ttl = _log_key(namespace, fingerprint(sql)), settings.query_log_ttl_seconds
+    await _pipelined(await get_redis(), [
+        ("hset", (key, "sql", sql)),
+        ("hincrby", (key, "requests", 1)),
+        ("expire", (key, ttl)),
+        ("sadd", (_index_key(namespace), fingerprint(sql))),
+        ("expire", (_index_key(namespace), ttl)),
+    ])
+
+
+async def record_execution(sql: str, namespace: str, elapsed_ms: float) -> None:
+    """Add one execution of sql taking elapsed_ms to the query log."""
+    key = _log_key(namespace, fingerprint(sql))
+    await _pipelined(await get_redis(), [
+        ("hincrby", (key, "runs", 1)),
+        ("hincrbyfloat", (key, "total_ms", elapsed_ms)),
+        ("expire", (key, settings.query_log_ttl_seconds)),
+    ])
+
+
+async def top_queries(namespace: str, limit: int, max_avg_ms: float) -> list[LoggedQuery]:
+    """Most requested logged statements averaging at most max_avg_ms, cheapest first on ties."""
+    client = await get_redis()
+    fingerprints = sorted(await client.smembers(_index_key(namespace)))
+    entries = await _pipelined(client, [("hgetall", (_log_key(namespace, fp),)) for fp in fingerprints])
+
+    queries: list[LoggedQuery] = []
+    expired: list[str] = []
+    for fp, entry in zip(fingerprints, entries):
+        if not entry:
+            expired.append(fp)
+            continue
+        runs = int(entry.get("runs", 0))
+        if not runs:
+            continue  # never executed here, so its cost is unknown
+        avg_ms = float(entry.get("total_ms", 0)) / runs
+        if avg_ms <= max_avg_ms:
+            queries.append(LoggedQuery(entry["sql"], int(entry.get("requests", 0)), avg_ms))
+    if expired:
+        await client.srem(_index_key(namespace), *expired)
+    queries.sort(key=lambda q: (-q.requests, q.avg_ms))
+    return queries[:limit]
+
+
+async def warm_cache(
+    adapter: DatabaseAdapter, limit: int, concurrency: int, max_avg_ms: float
+) -> int:
+    """Execute and cache the top logged statements of adapter; return how many were run."""
+    # Imported here: execute_sql logs through this module.
+    from src.tools.execute_sql import execute_and_cache
+
+    namespace = adapter.cache_namespace
+    queries = await top_queries(namespace, limit, max_avg_ms)
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def warm(query: LoggedQuery) -> bool:
+        async with semaphore:
+            entry = await get_cached_entry(query.sql, namespace)
+            if entry is not None and not entry.stale:
+                return False
+            try:
+                await execute_and_cache(adapter, query.sql)
+            except Exception as exc:
+                logger.warning("Cache warm-up query failed | sql=%s error=%s", query.sql[:80], exc)
+                return False
+            return True
+
+    warmed = sum(await asyncio.gather(*(warm(q) for q in queries)))
+    logger.info("Result cache warmed | candidates=%d executed=%d", len(queries), warmed)
+    return warmed
+
+
+async def _pipelined(
+    client: Union[aioredis.Redis, InMemoryCache], calls: list[tuple[str, tuple]]
+) -> list[Any]:
+    """Run (command, args) calls in one round trip on Redis; in order on the fallback."""
+    if isinstance(client, InMemoryCache):
+        return [await getattr(client, name)(*args) for name, args in calls]
+    async with client.pipeline(transaction=False) as pipe:
+        for name, args in calls:
+            getattr(pipe, name)(*args)
+        return await pipe.execute()
+
+
+def _log_key(namespace: str, fp: str) -> str:
+    return f"sql_log:{namespace}:{fp}"
+
+
+def _index_key(namespace: str) -> str:
+    return f"sql_log:{namespace}"
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from src.cache.redis_client import close_redis
+    from src.db.adapters.factory import get_datasource_registry
+
+    registry = get_datasource_registry()
+    try:
+        adapter = await registry.acquire(args.datasource)
+        await warm_cache(adapter, args.top, args.concurrency, args.max_ms)
+    finally:
+        await registry.close_all()
+        await close_redis()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm the result cache from the query log.")
+    parser.add_argument("--datasource", default=None, help="datasource id (default: DB_TYPE database)")
+    parser.add_argument("--top", type=int, default=settings.result_cache_warmup_queries or 20)
+    parser.add_argument("--concurrency", type=int, default=settings.result_cache_warmup_concurrency)
+    parser.add_argument("--max-ms", type=float, default=settings.result_cache_warmup_max_ms)
+    asyncio.run(_main(parser.parse_args()))
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import Union
+from typing import Any, Union
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -57,12 +57,72 @@ class Settings(BaseSettings):
 
     sqlite_path: str = "./local.db"
 
+    # Read replicas of the DB_TYPE database (comma-separated SQLAlchemy DSNs).
+    # SELECTs are routed to healthy replicas by latency; catalog reads use the primary.
+    db_replica_dsns: Union[str, list[str]] = []
+    db_replica_health_interval_seconds: float = 10.0
+
+    # Named datasources beside "default" (the DB_TYPE database), as JSON:
+    # {"sales": {"db_type": "postgresql", "dsn": "postgresql+asyncpg://...", "replica_dsns": []}}
+    # Adapters connect on first use and are disconnected after datasource_idle_seconds.
+    datasources: dict[str, dict[str, Any]] = {}
+    datasource_idle_seconds: float = 600.0
+    datasource_max_connected: int = 0
+
+    # SQL execution (rows are fetched in batches from a server-side cursor)
+    sql_stream_batch_size: int = 500
+    sql_max_result_rows: int = 1000
+    # Rows of a result handed to the LLM; it reads further pages of the cached
+    # result with the read_result_page tool. 0 = the whole result.
+    sql_llm_page_rows: int = 0
+    # Per-statement timeout enforced by the database (0 disables it)
+    sql_statement_timeout_seconds: float = 30
+    # Coalesce identical concurrent SELECTs (in-process, and across workers via Redis)
+    sql_single_flight_enabled: bool = True
+    sql_single_flight_timeout_seconds: float = 60
+
     # Redis
     redis_host: str = "localhost"
     redis_port: int = 6379
     redis_db: int = 0
     redis_ttl_seconds: int = 3600
     user_agent_config_ttl_seconds: int = 0
+    # Cached results: binary codec, compressed (zlib | lz4 | none) above the threshold
+    result_cache_compression: str = "zlib"
+    result_cache_compress_min_bytes: int = 1024
+    # Results whose encoded size exceeds this are stored as chunks of about this
+    # size under a manifest, so they can be paged without reading the rest; 0 = never.
+    result_cache_chunk_bytes: int = 256 * 1024
+    # Stale-while-revalidate: past the soft TTL a cached result is still served
+    # (until redis_ttl_seconds) while one worker re-runs the query in the
+    # background, if this worker read it result_cache_refresh_min_hits times
+    # within the last soft TTL. 0 (or >= redis_ttl_seconds) disables it.
+    result_cache_soft_ttl_seconds: int = 300
+    result_cache_refresh_min_hits: int = 3
+    # Poll table data versions (pg_stat_user_tables / MySQL update_time) and
+    # invalidate cached results of changed tables; 0 disables the poller.
+    result_cache_version_poll_seconds: float = 0.0
+    # Query log (per-statement request count and run time) and cache warming:
+    # at startup re-run the RESULT_CACHE_WARMUP_QUERIES most requested statements
+    # of the default datasource averaging at most result_cache_warmup_max_ms,
+    # result_cache_warmup_concurrency at a time. 0 disables warming.
+    query_log_ttl_seconds: int = 7 * 24 * 3600
+    result_cache_warmup_queries: int = 0
+    result_cache_warmup_concurrency: int = 4
+    result_cache_warmup_max_ms: float = 2000.0
+    # Per-worker L1 in front of Redis for query results (invalidated via pub/sub)
+    result_cache_l1_enabled: bool = True
+    result_cache_l1_ttl_seconds: float = 5.0
+    result_cache_l1_max_bytes: int = 16 * 1024 * 1024
+    # Question cache: replay the answer to a repeated first-turn question
+    # without calling the LLM. similarity > 0 also matches rephrasings whose
+    # MinHash similarity reaches it (0 = exact normalised text only).
+    question_cache_enabled: bool = False
+    question_cache_ttl_seconds: int = 3600
+    question_cache_similarity: float = 0.0
+    # In-process fallback cache (REDIS_HOST=inmemory or Redis unreachable in development)
+    memory_cache_max_bytes: int = 64 * 1024 * 1024
+    memory_cache_sweep_seconds: float = 30.0
 
     # Checkpointer (memory | redis; redis requires langgraph-checkpoint-redis)
     checkpointer_type: str = "memory"
@@ -78,11 +138,23 @@ class Settings(BaseSettings):
     llm_temperature: float = 0.0
     model_switch_enabled: bool = True
     model_switch_message_threshold: int = 12
+    # Shared HTTP pool of the LLM clients (connections are kept alive across chats)
+    llm_http_max_connections: int = 100
+    llm_http_max_keepalive_connections: int = 20
+    llm_http_keepalive_expiry_seconds: float = 60.0
+    llm_http_timeout_seconds: float = 600.0
 
     # DeepAgent
     deepagent_max_iterations: int = 10
     deepagent_timeout_seconds: int = 120
     hitl_max_replans: int = 3
+    # Compiled supervisor graphs kept per configuration (0 = build per request)
+    agent_graph_cache_size: int = 16
+    # Schema pruning: for databases with at least schema_prune_min_tables tables,
+    # the schema tool returns only the schema_prune_top_k tables most relevant to
+    # the question (BM25) plus the tables they reference. 0 disables it.
+    schema_prune_top_k: int = 8
+    schema_prune_min_tables: int = 30
 
     # Skills (Part II: agent tool registry + SKILL.md loader)
     enabled_skills: Union[str, list[str]] = []
@@ -95,6 +167,11 @@ class Settings(BaseSettings):
     mcp_server_enabled: bool = True
     mcp_mount_path: str = "mcp"
 
+    @field_validator("db_replica_dsns", mode="before")
+    @classmethod
+    def parse_db_replica_dsns(cls, v: object) -> list[str]:
+        return _parse_list_env(v)
+
     @field_validator("enabled_skills", mode="before")
     @classmethod
     def parse_enabled_skills(cls, v: object) -> list[str]:
@@ -1,4 +1,4 @@
 from .base import DatabaseAdapter
-from .factory import get_adapter
+from .factory import acquire_adapter, get_adapter, get_datasource_registry, hold_adapter
 
-__all__ = ["DatabaseAdapter", "get_adapter"]
+__all__ = ["DatabaseAdapter", "acquire_adapter", "get_adapter", "get_datasource_registry", "hold_adapter"]
@@ -1,12 +1,34 @@
 """Abstract database adapter interface."""
 
+import asyncio
+import hashlib
 import re
 from abc import ABC, abstractmethod
-from typing import Any
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from contextlib import aclosing, asynccontextmanager
+from typing import Any, TypeVar
+
+from sqlalchemy import text
+from src.log import get_logger
+from src.db.result import ColumnarResult
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Upper bound for the out-of-band cancel issued when a statement is aborted.
+_CANCEL_TIMEOUT_SECONDS = 5.0
 
 
 class DatabaseAdapter(ABC):
 
+    # Default per-statement timeout in seconds (0 disables it).
+    _statement_timeout: float = 0.0
+    # Connection string; identifies the database in cache keys.
+    _dsn: str = ""
+    # SQLAlchemy engine of the adapters that have one (set by connect()).
+    _engine: Any = None
+
     @abstractmethod
     async def connect(self) -> None: ...
 
@@ -17,8 +39,51 @@ class DatabaseAdapter(ABC):
     async def ping(self) -> bool: ...
 
     @abstractmethod
-    async def execute_query(self, sql: str) -> dict[str, Any]:
-        """Execute a read-only SELECT. Returns {columns, rows, row_count}."""
+    async def execute_query(self, sql: str, timeout: float | None = None) -> ColumnarResult:
+        """Execute a read-only SELECT and return all rows as a ColumnarResult.
+
+        timeout overrides the adapter's statement timeout (seconds, 0 = none).
+        """
+
+    async def execute_query_stream(
+        self, sql: str, batch_size: int = 500, timeout: float | None = None
+    ) -> AsyncIterator[ColumnarResult]:
+        """Execute a read-only SELECT through a server-side cursor.
+
+        Async generator yielding ColumnarResult batches of at most
+        batch_size rows. Always yields at least one batch so callers learn
+        the column names of empty results. timeout works as in execute_query.
+        """
+        self.verify_read_only(sql)
+        logger.debug("Streaming query | sql=%s batch_size=%d", sql[:120], batch_size)
+        async with self._engine.connect() as conn, self._statement_guard(conn, timeout) as run:
+            columns: list[str] = []
+            total = 0
+            # Closed before the connection is released when the caller stops early.
+            async with aclosing(self._stream_batches(conn, run, sql, batch_size)) as batches:
+                async for columns, rows in batches:
+                    if rows:
+                        total += len(rows)
+                        yield ColumnarResult(columns=columns, rows=rows)
+            if total == 0:
+                yield ColumnarResult(columns=columns)
+            logger.debug("Stream complete | rows=%d", total)
+
+    async def _stream_batches(
+        self, conn: Any, run: Callable[[Awaitable[T]], Awaitable[T]], sql: str, batch_size: int
+    ) -> AsyncIterator[tuple[list[str], list[tuple]]]:
+        """Yield (columns, rows) batches of sql on conn; every await goes through run.
+
+        Rows may be empty: an empty result must still yield once to report its
+        columns. This default streams through SQLAlchemy (which picks the driver's
+        server-side cursor); adapters override it to fetch from the driver directly.
+        """
+        result = await run(conn.stream(text(sql).execution_options(yield_per=batch_size)))
+        columns = list(result.keys())
+        partitions = result.partitions(batch_size)
+        while (partition := await run(anext(partitions, None))) is not None:
+            yield columns, [tuple(row) for row in partition]
+        yield columns, []
 
     @abstractmethod
     async def get_tables(self) -> list[str]: ...
@@ -35,6 +100,15 @@ class DatabaseAdapter(ABC):
     @abstractmethod
     def dialect(self) -> str: ...
 
+    @property
+    def cache_namespace(self) -> str:
+        """Stable id of the database behind this adapter, for result-cache keys.
+
+        Derived from dialect and DSN so it is the same in every worker and
+        never puts the DSN (credentials) itself into Redis.
+        """
+        return hashlib.sha256(f"{self.dialect}:{self._dsn}".encode()).hexdigest()[:16]
+
     def verify_read_only(self, sql: str) -> None:
         """Throw ValueError if the SQL contains mutating keywords."""
         sql_upper = sql.upper()
@@ -51,15 +125,110 @@ class DatabaseAdapter(ABC):
             if re.search(pattern, sql_upper):
                 raise ValueError(f"Potentially unsafe SQL detected. Keyword matched: {pattern.replace(r'\b', '')}")
 
+    @asynccontextmanager
+    async def _statement_guard(
+        self, conn: Any, timeout: float | None
+    ) -> AsyncIterator[Callable[[Awaitable[T]], Awaitable[T]]]:
+        """Apply the statement timeout on conn and yield a runner for its awaits.
+
+        Cancelling the caller (client disconnect, agent deadline) would only
+        stop the Python side and leave the database executing; worse, the
+        driver then tears the connection down while the statement still holds
+        it. The runner shields each await, aborts the statement server-side
+        on cancellation, lets it fail, and only then re-raises.
+        """
+        effective = self._statement_timeout if timeout is None else timeout
+        handle = await self._begin_statement(conn, effective)
+
+        async def run(awaitable: Awaitable[T]) -> T:
+            task = asyncio.ensure_future(awaitable)
+            try:
+                return await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if not task.done():
+                    logger.info("Statement cancelled; aborting on server | dialect=%s", self.dialect)
+                    try:
+                        await asyncio.wait_for(self._cancel_statement(handle), _CANCEL_TIMEOUT_SECONDS)
+                    except Exception as exc:
+                        logger.warning("Server-side statement cancel failed: %s", exc)
+                    await asyncio.wait({task}, timeout=_CANCEL_TIMEOUT_SECONDS)
+                    if not task.done():
+                        task.cancel()
+                    elif not task.cancelled():
+                        task.exception()
+                raise
+
+        try:
+            yield run
+        finally:
+            await self._end_statement(handle)
+
+    async def _begin_statement(self, conn: Any, timeout: float) -> Any:
+        """Apply the statement timeout on conn; return a handle for _cancel_statement."""
+        return None
+
+    async def _cancel_statement(self, handle: Any) -> None:
+        """Abort the in-flight statement identified by handle."""
+
+    async def _end_statement(self, handle: Any) -> None:
+        """Undo per-statement connection state set by _begin_statement."""
+
+    async def get_schema_snapshot(self) -> dict[str, dict[str, list[dict[str, Any]]]]:
+        """Return {table: {"columns": [...], "foreign_keys": [...]}} for every table.
+
+        Entries have the get_columns / get_foreign_keys shapes. This fallback
+        issues 2N+1 queries; adapters override it with one catalog query per kind.
+        """
+        snapshot: dict[str, dict[str, list[dict[str, Any]]]] = {}
+        for table in await self.get_tables():
+            snapshot[table] = {
+                "columns": await self.get_columns(table),
+                "foreign_keys": await self.get_foreign_keys(table),
+            }
+        return snapshot
+
+    async def get_schema_fingerprint(self) -> str | None:
+        """Cheap token that changes whenever the schema changes.
+
+        Used to revalidate cached schema context with one lightweight query.
+        None means the adapter cannot fingerprint its schema (never cached).
+        """
+        return None
+
+    async def get_table_versions(self) -> dict[str, str] | None:
+        """Return {table: data version token}; a token changes when the table's rows do.
+
+        Polled to invalidate cached results after writes the app did not make
+        (ETL loads). None means the adapter has no such signal.
+        """
+        return None
+
+    @staticmethod
+    def _build_snapshot(
+        tables: list[str],
+        columns: Iterable[tuple[str, dict[str, Any]]],
+        foreign_keys: Iterable[tuple[str, dict[str, Any]]],
+    ) -> dict[str, dict[str, list[dict[str, Any]]]]:
+        """Group (table, entry) catalog rows by table, keeping the tables order."""
+        snapshot: dict[str, dict[str, list[dict[str, Any]]]] = {
+            table: {"columns": [], "foreign_keys": []} for table in tables
+        }
+        for table, col in columns:
+            if table in snapshot:
+                snapshot[table]["columns"].append(col)
+        for table, fk in foreign_keys:
+            if table in snapshot:
+                snapshot[table]["foreign_keys"].append(fk)
+        return snapshot
+
     async def get_schema_context(self) -> str:
         """Build a formatted schema string for LLM prompt injection."""
-        tables = await self.get_tables()
+        snapshot = await self.get_schema_snapshot()
         lines: list[str] = [f"Database dialect: {self.dialect}\n\nSchema:\n"]
-        for table in tables:
-            columns = await self.get_columns(table)
-            fks = {fk["column"]: fk for fk in await self.get_foreign_keys(table)}
+        for table, entry in snapshot.items():
+            fks = {fk["column"]: fk for fk in entry["foreign_keys"]}
             lines.append(f"Table: {table}")
-            for col in columns:
+            for col in entry["columns"]:
                 nullable = "NULL" if col["nullable"] == "YES" else "NOT NULL"
                 fk_hint = ""
                 if col["column"] in fks:
@@ -1,45 +1,264 @@
-"""Adapter factory — returns the correct DatabaseAdapter based on DB_TYPE."""
+"""Adapter factory — datasource registry of lazily connected DatabaseAdapters.
 
+The "default" datasource is built from DB_TYPE and its per-dialect settings;
+DATASOURCES adds named ones. Adapters are created on first lookup, connected
+on first acquire_adapter(), and disconnected again (pool disposed) once idle
+for DATASOURCE_IDLE_SECONDS, so many databases don't mean many idle pools.
+The default datasource is connected at startup and never evicted. Work that
+uses an adapter over time (an agent run, a cache refresh) holds a lease on it
+with hold_adapter(); a datasource with leases is never evicted.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from functools import lru_cache
+from typing import Any
 from src.log import get_logger
 from src.db.adapters.base import DatabaseAdapter
 
 logger = get_logger(__name__)
 
+DEFAULT_DATASOURCE = "default"
+
+
+class DatasourceRegistry:
+    """Datasource id -> adapter, with lazy connect and idle eviction."""
+
+    def __init__(
+        self,
+        configs: dict[str, dict[str, Any]],
+        idle_seconds: float = 600.0,
+        max_connected: int = 0,
+    ) -> None:
+        self._configs = configs
+        self._idle_seconds = idle_seconds
+        self._max_connected = max_connected
+        self._adapters: dict[str, DatabaseAdapter] = {}
+        self._connected: set[str] = set()
+        self._last_used: dict[str, float] = {}
+        self._leases: dict[str, int] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def ids(self) -> list[str]:
+        return list(self._configs)
+
+    def get(self, datasource_id: str | None = None) -> DatabaseAdapter:
+        """Return the adapter for datasource_id (not necessarily connected)."""
+        ds = datasource_id or DEFAULT_DATASOURCE
+        adapter = self._adapters.get(ds)
+        if adapter is None:
+            config = self._configs.get(ds)
+            if config is None:
+                raise ValueError(
+                    f"Unknown datasource '{ds}'. Configured: {', '.join(self._configs)}"
+                )
+            logger.info("Creating adapter | datasource=%s db_type=%s", ds, config["db_type"])
+            adapter = _create_adapter(
+                config["db_type"].lower(), config.get("dsn"), config.get("replica_dsns") or []
+            )
+            self._adapters[ds] = adapter
+        return adapter
+
+    async def acquire(self, datasource_id: str | None = None) -> DatabaseAdapter:
+        """Return a connected adapter for datasource_id, connecting it on first use."""
+        ds = datasource_id or DEFAULT_DATASOURCE
+        adapter = self.get(ds)
+        self._last_used[ds] = time.monotonic()
+        if ds not in self._connected:
+            async with self._locks.setdefault(ds, asyncio.Lock()):
+                if ds not in self._connected:
+                    await adapter.connect()
+                    self._connected.add(ds)
+                    logger.info("Datasource connected | datasource=%s", ds)
+            await self._evict_over_limit(keep=ds)
+        return adapter
+
+    @asynccontextmanager
+    async def hold(self, adapter: DatabaseAdapter) -> AsyncIterator[None]:
+        """Lease adapter's datasource: reconnect it if evicted, keep it connected until exit.
+
+        Adapters that did not come from this registry are not tracked.
+        """
+        ds = next((ds for ds, known in self._adapters.items() if known is adapter), None)
+        if ds is None:
+            yield
+            return
+        self._leases[ds] = self._leases.get(ds, 0) + 1
+        try:
+            await self.acquire(ds)
+            yield
+        finally:
+            self._leases[ds] -= 1
+            self._last_used[ds] = time.monotonic()
+
+    def _evictable(self, ds: str) -> bool:
+        return ds != DEFAULT_DATASOURCE and not self._leases.get(ds)
+
+    def connected(self) -> dict[str, DatabaseAdapter]:
+        """Currently connected adapters by datasource id."""
+        return {ds: self._adapters[ds] for ds in self._connected}
+
+    async def evict_idle(self) -> list[str]:
+        """Disconnect datasources unused for idle_seconds; return their ids."""
+        if self._idle_seconds <= 0:
+            return []
+        cutoff = time.monotonic() - self._idle_seconds
+        idle = [
+            ds for ds in self._connected
+            if self._evictable(ds) and self._last_used.get(ds, 0) < cutoff
+        ]
+        for ds in idle:
+            await self._disconnect(ds, reason="idle")
+        return idle
+
+    async def _evict_over_limit(self, keep: str) -> None:
+        if self._max_connected <= 0:
+            return
+        while len(self._connected) > self._max_connected:
+            lru = min(
+                (ds for ds in self._connected if ds != keep and self._evictable(ds)),
+                key=lambda ds: self._last_used.get(ds, 0),
+                default=None,
+            )
+            if lru is None:
+                return
+            await self._disconnect(lru, reason="max_connected")
+
+    async def _disconnect(self, ds: str, reason: str) -> None:
+        async with self._locks.setdefault(ds, asyncio.Lock()):
+            if ds not in self._connected:
+                return
+            if reason != "shutdown" and self._leases.get(ds):
+                return  # leased while waiting for the lock
+            self._connected.discard(ds)
+            logger.info("Datasource disconnected | datasource=%s reason=%s", ds, reason)
+            try:
+                await self._adapters[ds].disconnect()
+            except Exception as exc:
+                logger.warning("Datasource disconnect failed | datasource=%s error=%s", ds, exc)
+
+    async def run_evictor(self, interval: float = 30.0) -> None:
+        """Background loop: evict idle datasources every interval seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.evict_idle()
+            except Exception as exc:
+                logger.warning("Datasource eviction failed: %s", exc)
+
+    async def close_all(self) -> None:
+        for ds in list(self._connected):
+            await self._disconnect(ds, reason="shutdown")
+
+    def status(self) -> dict[str, dict[str, Any]]:
+        """Per-datasource connection state and seconds since last use."""
+        now = time.monotonic()
+        return {
+            ds: {
+                "db_type": config["db_type"],
+                "connected": ds in self._connected,
+                "leases": self._leases.get(ds, 0),
+                "idle_seconds": (
+                    round(now - self._last_used[ds], 1) if ds in self._last_used else None
+                ),
+            }
+            for ds, config in self._configs.items()
+        }
+
 
 @lru_cache(maxsize=1)
-def get_adapter() -> DatabaseAdapter:
+def get_datasource_registry() -> DatasourceRegistry:
     from src.config.settings import get_settings
     settings = get_settings()
 
-    db_type = settings.db_type.lower()
-    logger.info("Creating adapter | db_type=%s", db_type)
+    configs: dict[str, dict[str, Any]] = {
+        DEFAULT_DATASOURCE: {
+            "db_type": settings.db_type,
+            "replica_dsns": settings.db_replica_dsns,
+        }
+    }
+    for ds, config in settings.datasources.items():
+        if "db_type" not in config or "dsn" not in config:
+            raise ValueError(f"Datasource '{ds}' needs both 'db_type' and 'dsn'")
+        configs[ds] = config
+    logger.info("Datasource registry | datasources=%s", ",".join(configs))
+    return DatasourceRegistry(
+        configs,
+        idle_seconds=settings.datasource_idle_seconds,
+        max_connected=settings.datasource_max_connected,
+    )
+
+
+def get_adapter(datasource_id: str | None = None) -> DatabaseAdapter:
+    """Adapter for datasource_id (default: the DB_TYPE database). Not connected by this call."""
+    return get_datasource_registry().get(datasource_id)
+
+
+async def acquire_adapter(datasource_id: str | None = None) -> DatabaseAdapter:
+    """Connected adapter for datasource_id, connecting lazily on first use."""
+    return await get_datasource_registry().acquire(datasource_id)
+
+
+def hold_adapter(adapter: DatabaseAdapter):
+    """Async context manager keeping adapter connected while it is in use."""
+    return get_datasource_registry().hold(adapter)
+
+
+def _create_adapter(
+    db_type: str,
+    dsn: str | None = None,
+    replica_dsns: list[str] | None = None,
+) -> DatabaseAdapter:
+    """Build the adapter for db_type, wrapped for replica routing if replicas are given."""
+    primary = _create_single_adapter(db_type, dsn)
+    if not replica_dsns:
+        return primary
+
+    from src.config.settings import get_settings
+    from src.db.adapters.replicas import ReplicaRoutedAdapter
+    logger.info("Creating replica adapters | replicas=%d", len(replica_dsns))
+    return ReplicaRoutedAdapter(
+        primary,
+        [_create_single_adapter(db_type, r) for r in replica_dsns],
+        health_interval=get_settings().db_replica_health_interval_seconds,
+    )
+
+
+def _create_single_adapter(db_type: str, dsn: str | None = None) -> DatabaseAdapter:
+    """Build one adapter for db_type; dsn defaults to the configured primary."""
+    from src.config.settings import get_settings
+    settings = get_settings()
 
     match db_type:
         case "postgresql":
             from src.db.adapters.postgres import PostgreSQLAdapter
             return PostgreSQLAdapter(
-                dsn=settings.postgres_dsn,
+                dsn=dsn or settings.postgres_dsn,
                 pool_size=settings.postgres_pool_size,
                 max_overflow=settings.postgres_max_overflow,
                 echo=settings.app_env == "development",
+                statement_timeout=settings.sql_statement_timeout_seconds,
             )
         case "mysql":
             from src.db.adapters.mysql import MySQLAdapter
             return MySQLAdapter(
-                dsn=settings.mysql_dsn,
+                dsn=dsn or settings.mysql_dsn,
                 pool_size=settings.mysql_pool_size,
                 max_overflow=settings.mysql_max_overflow,
                 echo=settings.app_env == "development",
+                statement_timeout=settings.sql_statement_timeout_seconds,
             )
         case "sqlite":
             from src.db.adapters.sqlite import SQLiteAdapter
             return SQLiteAdapter(
-                dsn=settings.sqlite_dsn,
+                dsn=dsn or settings.sqlite_dsn,
                 echo=settings.app_env == "development",
+                statement_timeout=settings.sql_statement_timeout_seconds,
             )
         case _:
             raise ValueError(
-                f"Unsupported DB_TYPE '{settings.db_type}'. "
+                f"Unsupported DB_TYPE '{db_type}'. "
                 "Supported: postgresql | mysql | sqlite"
             )
@@ -1,24 +1,30 @@
 """MySQL adapter using aiomysql + SQLAlchemy."""
 
+import asyncio
+from collections.abc import AsyncIterator
 from typing import Any
+from aiomysql import SSCursor
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from src.log import get_logger
-from src.db.adapters.base import DatabaseAdapter
+from src.db.adapters.base import _CANCEL_TIMEOUT_SECONDS, DatabaseAdapter
+from src.db.result import ColumnarResult
 
 logger = get_logger(__name__)
 
 
 class MySQLAdapter(DatabaseAdapter):
 
-    def __init__(self, dsn: str, pool_size: int = 10, max_overflow: int = 20, echo: bool = False) -> None:
+    def __init__(
+        self, dsn: str, pool_size: int = 10, max_overflow: int = 20, echo: bool = False,
+        statement_timeout: float = 0.0,
+    ) -> None:
         self._dsn = dsn
         self._pool_size = pool_size
         self._max_overflow = max_overflow
         self._echo = echo
+        self._statement_timeout = statement_timeout
         self._engine: AsyncEngine | None = None
-        self._session_factory: sessionmaker | None = None
 
     async def connect(self) -> None:
         logger.info("Connecting to MySQL | pool_size=%d", self._pool_size)
@@ -26,10 +32,6 @@ class MySQLAdapter(DatabaseAdapter):
             self._dsn, pool_size=self._pool_size, max_overflow=self._max_overflow,
             echo=self._echo, future=True,
         )
-        self._session_factory = sessionmaker(
-            bind=self._engine, class_=AsyncSession,
-            expire_on_commit=False, autoflush=False, autocommit=False,
-        )
 
     async def disconnect(self) -> None:
         if self._engine:
@@ -45,19 +47,73 @@ class MySQLAdapter(DatabaseAdapter):
         except Exception:
             return False
 
-    async def execute_query(self, sql: str) -> dict[str, Any]:
+    async def execute_query(self, sql: str, timeout: float | None = None) -> ColumnarResult:
         self.verify_read_only(sql)
         logger.debug("Executing query | sql=%s", sql[:120])
-        async with self._session_factory() as session:
-            result = await session.execute(text(sql))
-            columns = list(result.keys())
-            rows = [dict(zip(columns, row)) for row in result.fetchall()]
+        # Lean path: run on the raw aiomysql connection of a pooled checkout,
+        # skipping the ORM session and SQLAlchemy's result/row wrapping.
+        async with self._engine.connect() as conn, self._statement_guard(conn, timeout) as run:
+            driver = (await conn.get_raw_connection()).driver_connection
+            async with driver.cursor() as cursor:
+                await run(cursor.execute(sql))
+                columns = [d[0] for d in cursor.description or ()]
+                rows = list(await run(cursor.fetchall()))
             logger.debug("Query complete | rows=%d", len(rows))
-            return {"columns": columns, "rows": rows, "row_count": len(rows)}
+            return ColumnarResult(columns=columns, rows=rows)
+
+    async def _stream_batches(
+        self, conn: Any, run: Any, sql: str, batch_size: int
+    ) -> AsyncIterator[tuple[list[str], list[tuple]]]:
+        # Lean path: an unbuffered aiomysql cursor reads rows off the socket
+        # batch by batch, without SQLAlchemy's result/row wrapping.
+        driver = (await conn.get_raw_connection()).driver_connection
+        cursor = await driver.cursor(SSCursor)
+        finished = False
+        try:
+            await run(cursor.execute(sql))
+            columns = [d[0] for d in cursor.description or ()]
+            while rows := await run(cursor.fetchmany(batch_size)):
+                yield columns, list(rows)
+            finished = True
+            yield columns, []
+        finally:
+            if finished:
+                await cursor.close()
+            else:
+                await self._abort_unbuffered(conn, cursor, driver.thread_id())
+
+    async def _abort_unbuffered(self, conn: Any, cursor: Any, thread_id: int) -> None:
+        """Close an unbuffered cursor whose rows were not all read.
+
+        Closing it would read the rest of the result off the socket, so the
+        statement is killed server-side first (from another connection). If
+        the cursor still cannot be closed cleanly, the connection is
+        invalidated instead of going back to the pool.
+        """
+        try:
+            await asyncio.wait_for(self._cancel_statement(thread_id), _CANCEL_TIMEOUT_SECONDS)
+        except Exception as exc:
+            logger.warning("KILL QUERY after early close failed: %s", exc)
+        try:
+            await cursor.close()
+        except Exception as exc:
+            logger.debug("Unbuffered cursor close after KILL QUERY: %s", exc)
+            await conn.invalidate()
+
+    async def _begin_statement(self, conn: Any, timeout: float) -> Any:
+        # Always set the session value so a pooled connection never keeps a
+        # timeout from a previous statement (0 means unlimited).
+        ms = int(timeout * 1000) if timeout and timeout > 0 else 0
+        await conn.execute(text(f"SET SESSION MAX_EXECUTION_TIME = {ms}"))
+        return (await conn.get_raw_connection()).driver_connection.thread_id()
+
+    async def _cancel_statement(self, handle: Any) -> None:
+        async with self._engine.connect() as conn:
+            await conn.execute(text(f"KILL QUERY {int(handle)}"))
 
     async def get_tables(self) -> list[str]:
-        async with self._session_factory() as session:
-            result = await session.execute(text(
+        async with self._engine.connect() as conn:
+            result = await conn.execute(text(
                 "SELECT table_name FROM information_schema.tables "
                 "WHERE table_schema = DATABASE() AND table_type = 'BASE TABLE' "
                 "ORDER BY table_name"
@@ -65,8 +121,8 @@ class MySQLAdapter(DatabaseAdapter):
             return [row[0] for row in result.fetchall()]
 
     async def get_columns(self, table_name: str) -> list[dict[str, Any]]:
-        async with self._session_factory() as session:
-            result = await session.execute(
+        async with self._engine.connect() as conn:
+            result = await conn.execute(
                 text(
                     "SELECT column_name, data_type, is_nullable, column_default "
                     "FROM information_schema.columns "
@@ -81,8 +137,8 @@ class MySQLAdapter(DatabaseAdapter):
             ]
 
     async def get_foreign_keys(self, table_name: str) -> list[dict[str, Any]]:
-        async with self._session_factory() as session:
-            result = await session.execute(
+        async with self._engine.connect() as conn:
+            result = await conn.execute(
                 text(
                     "SELECT column_name, referenced_table_name, referenced_column_name "
                     "FROM information_schema.key_column_usage "
@@ -96,6 +152,52 @@ class MySQLAdapter(DatabaseAdapter):
                 for r in result.fetchall()
             ]
 
+    async def get_schema_snapshot(self) -> dict[str, dict[str, list[dict[str, Any]]]]:
+        tables = await self.get_tables()
+        async with self._engine.connect() as conn:
+            columns = (await conn.execute(text(
+                "SELECT table_name, column_name, data_type, is_nullable, column_default "
+                "FROM information_schema.columns "
+                "WHERE table_schema = DATABASE() "
+                "ORDER BY table_name, ordinal_position"
+            ))).fetchall()
+            foreign_keys = (await conn.execute(text(
+                "SELECT table_name, column_name, referenced_table_name, referenced_column_name "
+                "FROM information_schema.key_column_usage "
+                "WHERE table_schema = DATABASE() AND referenced_table_name IS NOT NULL"
+            ))).fetchall()
+        return self._build_snapshot(
+            tables,
+            ((r[0], {"column": r[1], "type": r[2], "nullable": r[3], "default": r[4]}) for r in columns),
+            ((r[0], {"column": r[1], "foreign_table": r[2], "foreign_column": r[3]}) for r in foreign_keys),
+        )
+
+    async def get_schema_fingerprint(self) -> str | None:
+        # create_time moves on table rebuilds; the column checksum catches
+        # in-place (INSTANT) ALTERs. update_time is skipped: it moves on writes.
+        async with self._engine.connect() as conn:
+            result = await conn.execute(text(
+                "SELECT CONCAT_WS(':', "
+                "(SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = DATABASE()), "
+                "(SELECT MAX(create_time) FROM information_schema.tables WHERE table_schema = DATABASE()), "
+                "(SELECT SUM(CRC32(CONCAT_WS('.', table_name, column_name, column_type, is_nullable))) "
+                "FROM information_schema.columns WHERE table_schema = DATABASE()), "
+                "(SELECT COUNT(*) FROM information_schema.key_column_usage "
+                "WHERE table_schema = DATABASE() AND referenced_table_name IS NOT NULL))"
+            ))
+            return str(result.scalar())
+
+    async def get_table_versions(self) -> dict[str, str] | None:
+        # update_time moves on committed writes (NULL for InnoDB until the first
+        # one since restart); create_time catches TRUNCATE / rebuilds. MySQL 8
+        # caches these columns: set information_schema_stats_expiry = 0.
+        async with self._engine.connect() as conn:
+            rows = (await conn.execute(text(
+                "SELECT table_name, CONCAT_WS(':', create_time, update_time) "
+                "FROM information_schema.tables WHERE table_schema = DATABASE()"
+            ))).fetchall()
+        return {row[0]: str(row[1]) for row in rows}
+
     @property
     def dialect(self) -> str:
         return "mysql"
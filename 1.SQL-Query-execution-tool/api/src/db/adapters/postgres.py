@@ -1,22 +1,28 @@
 """PostgreSQL adapter using SQLAlchemy + asyncpg."""
 
+from collections.abc import AsyncIterator
 from typing import Any
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from src.log import get_logger
 from src.db.adapters.base import DatabaseAdapter
+from src.db.result import ColumnarResult
 
 logger = get_logger(__name__)
 
 
 class PostgreSQLAdapter(DatabaseAdapter):
 
-    def __init__(self, dsn: str, pool_size: int = 10, max_overflow: int = 20, echo: bool = False) -> None:
+    def __init__(
+        self, dsn: str, pool_size: int = 10, max_overflow: int = 20, echo: bool = False,
+        statement_timeout: float = 0.0,
+    ) -> None:
         self._dsn = dsn
         self._pool_size = pool_size
         self._max_overflow = max_overflow
         self._echo = echo
+        self._statement_timeout = statement_timeout
         self._engine: AsyncEngine | None = None
         self._session_factory: sessionmaker | None = None
 
@@ -45,19 +51,57 @@ class PostgreSQLAdapter(DatabaseAdapter):
         except Exception:
             return False
 
-    async def execute_query(self, sql: str) -> dict[str, Any]:
+    async def execute_query(self, sql: str, timeout: float | None = None) -> ColumnarResult:
         self.verify_read_only(sql)
         logger.debug("Executing query | sql=%s", sql[:120])
-        async with self._session_factory() as session:
-            result = await session.execute(text(sql))
-            columns = list(result.keys())
-            rows = [dict(zip(columns, row)) for row in result.fetchall()]
+        # Lean path: prepare and fetch on the raw asyncpg connection of a pooled
+        # checkout, skipping the ORM session and SQLAlchemy's result/row wrapping.
+        async with self._engine.connect() as conn, self._statement_guard(conn, timeout) as run:
+            driver = (await conn.get_raw_connection()).driver_connection
+            statement = await run(driver.prepare(sql))
+            columns = [attr.name for attr in statement.get_attributes()]
+            rows = [tuple(record) for record in await run(statement.fetch())]
             logger.debug("Query complete | rows=%d", len(rows))
-            return {"columns": columns, "rows": rows, "row_count": len(rows)}
+            return ColumnarResult(columns=columns, rows=rows)
+
+    async def _stream_batches(
+        self, conn: Any, run: Any, sql: str, batch_size: int
+    ) -> AsyncIterator[tuple[list[str], list[tuple]]]:
+        # Lean path: fetch from an asyncpg server-side cursor directly, skipping
+        # SQLAlchemy's result/row wrapping.
+        driver = (await conn.get_raw_connection()).driver_connection
+        statement = await run(driver.prepare(sql))
+        columns = [attr.name for attr in statement.get_attributes()]
+        # Cursors only live inside a transaction; SET LOCAL may already have opened one.
+        transaction = None if driver.is_in_transaction() else driver.transaction()
+        if transaction is not None:
+            await run(transaction.start())
+        try:
+            cursor = await run(statement.cursor())
+            while records := await run(cursor.fetch(batch_size)):
+                yield columns, [tuple(record) for record in records]
+            yield columns, []
+        finally:
+            if transaction is not None and not driver.is_closed():
+                try:
+                    await transaction.rollback()
+                except Exception as exc:
+                    logger.debug("Cursor transaction rollback failed: %s", exc)
+
+    async def _begin_statement(self, conn: Any, timeout: float) -> Any:
+        # SET LOCAL scopes the timeout to the current transaction, so pooled
+        # connections return to the server default afterwards.
+        if timeout and timeout > 0:
+            await conn.execute(text(f"SET LOCAL statement_timeout = {int(timeout * 1000)}"))
+        return (await conn.get_raw_connection()).driver_connection.get_server_pid()
+
+    async def _cancel_statement(self, handle: Any) -> None:
+        async with self._engine.connect() as conn:
+            await conn.execute(text("SELECT pg_cancel_backend(:pid)"), {"pid": handle})
 
     async def get_tables(self) -> list[str]:
-        async with self._session_factory() as session:
-            result = await session.execute(text(
+        async with self._engine.connect() as conn:
+            result = await conn.execute(text(
                 "SELECT table_name FROM information_schema.tables "
                 "WHERE table_schema = 'public' AND table_type = 'BASE TABLE' "
                 "ORDER BY table_name"
@@ -65,8 +109,8 @@ class PostgreSQLAdapter(DatabaseAdapter):
             return [row[0] for row in result.fetchall()]
 
     async def get_columns(self, table_name: str) -> list[dict[str, Any]]:
-        async with self._session_factory() as session:
-            result = await session.execute(
+        async with self._engine.connect() as conn:
+            result = await conn.execute(
                 text(
                     "SELECT column_name, data_type, is_nullable, column_default "
                     "FROM information_schema.columns "
@@ -81,8 +125,8 @@ class PostgreSQLAdapter(DatabaseAdapter):
             ]
 
     async def get_foreign_keys(self, table_name: str) -> list[dict[str, Any]]:
-        async with self._session_factory() as session:
-            result = await session.execute(
+        async with self._engine.connect() as conn:
+            result = await conn.execute(
                 text(
                     "SELECT kcu.column_name, ccu.table_name AS foreign_table, "
                     "ccu.column_name AS foreign_column "
@@ -100,6 +144,59 @@ class PostgreSQLAdapter(DatabaseAdapter):
                 for row in result.fetchall()
             ]
 
+    async def get_schema_snapshot(self) -> dict[str, dict[str, list[dict[str, Any]]]]:
+        tables = await self.get_tables()
+        async with self._engine.connect() as conn:
+            columns = (await conn.execute(text(
+                "SELECT table_name, column_name, data_type, is_nullable, column_default "
+                "FROM information_schema.columns "
+                "WHERE table_schema = 'public' "
+                "ORDER BY table_name, ordinal_position"
+            ))).fetchall()
+            foreign_keys = (await conn.execute(text(
+                "SELECT tc.table_name, kcu.column_name, ccu.table_name AS foreign_table, "
+                "ccu.column_name AS foreign_column "
+                "FROM information_schema.table_constraints AS tc "
+                "JOIN information_schema.key_column_usage AS kcu "
+                "ON tc.constraint_name = kcu.constraint_name "
+                "JOIN information_schema.constraint_column_usage AS ccu "
+                "ON ccu.constraint_name = tc.constraint_name "
+                "WHERE tc.constraint_type = 'FOREIGN KEY' AND tc.table_schema = 'public'"
+            ))).fetchall()
+        return self._build_snapshot(
+            tables,
+            ((r[0], {"column": r[1], "type": r[2], "nullable": r[3], "default": r[4]}) for r in columns),
+            ((r[0], {"column": r[1], "foreign_table": r[2], "foreign_column": r[3]}) for r in foreign_keys),
+        )
+
+    async def get_schema_fingerprint(self) -> str | None:
+        # Hash of the public-schema catalog rows that feed the prompt context.
+        async with self._engine.connect() as conn:
+            result = await conn.execute(text(
+                "SELECT md5(coalesce(string_agg("
+                "c.oid::text || ':' || c.relname || ':' || a.attnum || ':' || a.attname || ':' "
+                "|| a.atttypid::text || ':' || a.attnotnull::text || ':' || a.atthasdef::text, "
+                "',' ORDER BY c.oid, a.attnum), '')) || ':' || md5(coalesce(("
+                "SELECT string_agg(con.oid::text, ',' ORDER BY con.oid) FROM pg_constraint AS con "
+                "JOIN pg_namespace AS cn ON cn.oid = con.connamespace "
+                "WHERE con.contype = 'f' AND cn.nspname = 'public'), '')) "
+                "FROM pg_class AS c "
+                "JOIN pg_namespace AS n ON n.oid = c.relnamespace "
+                "JOIN pg_attribute AS a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped "
+                "WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p')"
+            ))
+            return str(result.scalar())
+
+    async def get_table_versions(self) -> dict[str, str] | None:
+        # Cumulative row-change counters; reported by the stats system shortly
+        # after each commit (TRUNCATE is not counted).
+        async with self._engine.connect() as conn:
+            rows = (await conn.execute(text(
+                "SELECT relname, n_tup_ins || ':' || n_tup_upd || ':' || n_tup_del "
+                "FROM pg_stat_user_tables WHERE schemaname = 'public'"
+            ))).fetchall()
+        return {row[0]: row[1] for row in rows}
+
     @property
     def dialect(self) -> str:
         return "postgresql"
@@ -0,0 +1,203 @@
+"""Read-replica routing: one primary plus replicas of the same dialect.
+
+Agent SELECTs (execute_query / execute_query_stream) are spread across
+healthy replicas, weighted by their recent ping latency. Catalog
+introspection and the schema fingerprint stay pinned to the primary so the
+prompt context never mixes schema versions from nodes at different lag.
+"""
+
+import asyncio
+import random
+import time
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from typing import Any
+
+from sqlalchemy.exc import DBAPIError, DisconnectionError
+from src.log import get_logger
+from src.db.adapters.base import DatabaseAdapter
+from src.db.result import ColumnarResult
+
+logger = get_logger(__name__)
+
+# Smoothing factor for the per-node latency moving average.
+_LATENCY_ALPHA = 0.3
+
+
+class _Node:
+    """One replica plus its health and smoothed ping latency."""
+
+    def __init__(self, name: str, adapter: DatabaseAdapter) -> None:
+        self.name = name
+        self.adapter = adapter
+        self.healthy = False
+        self.latency: float | None = None
+
+    def record(self, ok: bool, latency: float) -> None:
+        self.healthy = ok
+        if ok:
+            self.latency = (
+                latency if self.latency is None
+                else _LATENCY_ALPHA * latency + (1 - _LATENCY_ALPHA) * self.latency
+            )
+
+    @property
+    def weight(self) -> float:
+        # Faster nodes get proportionally more traffic; floor avoids 1/0.
+        return 1.0 / max(self.latency or 0.001, 0.001)
+
+
+def _is_connection_error(exc: BaseException) -> bool:
+    """True for failures that say the node is unreachable, not that the SQL is bad."""
+    if isinstance(exc, (OSError, ConnectionError, DisconnectionError)):
+        return True
+    return isinstance(exc, DBAPIError) and exc.connection_invalidated
+
+
+class ReplicaRoutedAdapter(DatabaseAdapter):
+    """DatabaseAdapter that routes reads to replicas and catalog calls to the primary."""
+
+    def __init__(
+        self,
+        primary: DatabaseAdapter,
+        replicas: list[DatabaseAdapter],
+        health_interval: float = 10.0,
+    ) -> None:
+        self._primary = primary
+        self._nodes = [_Node(f"replica-{i}", r) for i, r in enumerate(replicas)]
+        self._health_interval = health_interval
+        self._health_task: asyncio.Task | None = None
+
+    async def connect(self) -> None:
+        await self._primary.connect()
+        for node in self._nodes:
+            try:
+                await node.adapter.connect()
+            except Exception as exc:
+                logger.warning("Replica connect failed | node=%s error=%s", node.name, exc)
+        await self.check_replicas()
+        if self._health_interval > 0:
+            self._health_task = asyncio.create_task(self._health_loop())
+        logger.info(
+            "Replica routing enabled | replicas=%d healthy=%d",
+            len(self._nodes), sum(n.healthy for n in self._nodes),
+        )
+
+    async def disconnect(self) -> None:
+        if self._health_task:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+            self._health_task = None
+        for node in self._nodes:
+            await node.adapter.disconnect()
+        await self._primary.disconnect()
+
+    async def ping(self) -> bool:
+        return await self._primary.ping()
+
+    async def check_replicas(self) -> None:
+        """Ping every replica and update its health and latency."""
+        async def probe(node: _Node) -> None:
+            started = time.perf_counter()
+            try:
+                ok = await node.adapter.ping()
+            except Exception:
+                ok = False
+            if node.healthy and not ok:
+                logger.warning("Replica unhealthy | node=%s", node.name)
+            node.record(ok, time.perf_counter() - started)
+
+        await asyncio.gather(*(probe(n) for n in self._nodes))
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._health_interval)
+            try:
+                await self.check_replicas()
+            except Exception as exc:
+                logger.warning("Replica health check failed: %s", exc)
+
+    def replica_status(self) -> list[dict[str, Any]]:
+        """Per-replica health and smoothed latency (ms), for the health endpoint."""
+        return [
+            {
+                "name": n.name,
+                "healthy": n.healthy,
+                "latency_ms": round(n.latency * 1000, 2) if n.latency is not None else None,
+            }
+            for n in self._nodes
+        ]
+
+    def _pick_node(self) -> _Node | None:
+        healthy = [n for n in self._nodes if n.healthy]
+        if not healthy:
+            return None
+        return random.choices(healthy, weights=[n.weight for n in healthy])[0]
+
+    async def execute_query(self, sql: str, timeout: float | None = None) -> ColumnarResult:
+        self.verify_read_only(sql)
+        node = self._pick_node()
+        if node is None:
+            return await self._primary.execute_query(sql, timeout=timeout)
+        try:
+            return await node.adapter.execute_query(sql, timeout=timeout)
+        except Exception as exc:
+            if not _is_connection_error(exc):
+                raise
+            logger.warning("Replica failed, retrying on primary | node=%s error=%s", node.name, exc)
+            node.healthy = False
+            return await self._primary.execute_query(sql, timeout=timeout)
+
+    async def execute_query_stream(
+        self, sql: str, batch_size: int = 500, timeout: float | None = None
+    ) -> AsyncIterator[ColumnarResult]:
+        self.verify_read_only(sql)
+        node = self._pick_node()
+        target = node.adapter if node else self._primary
+        batches = target.execute_query_stream(sql, batch_size, timeout=timeout)
+        started = False
+        try:
+            async for batch in batches:
+                started = True
+                yield batch
+        except Exception as exc:
+            # Only fail over before the first batch; a partial stream can't be replayed.
+            if node is None or started or not _is_connection_error(exc):
+                raise
+            logger.warning("Replica failed, retrying on primary | node=%s error=%s", node.name, exc)
+            node.healthy = False
+            fallback = self._primary.execute_query_stream(sql, batch_size, timeout=timeout)
+            async with aclosing(fallback):
+                async for batch in fallback:
+                    yield batch
+        finally:
+            await batches.aclose()
+
+    # Catalog introspection is pinned to the primary.
+
+    async def get_tables(self) -> list[str]:
+        return await self._primary.get_tables()
+
+    async def get_columns(self, table_name: str) -> list[dict[str, Any]]:
+        return await self._primary.get_columns(table_name)
+
+    async def get_foreign_keys(self, table_name: str) -> list[dict[str, Any]]:
+        return await self._primary.get_foreign_keys(table_name)
+
+    async def get_schema_snapshot(self) -> dict[str, dict[str, list[dict[str, Any]]]]:
+        return await self._primary.get_schema_snapshot()
+
+    async def get_schema_fingerprint(self) -> str | None:
+        return await self._primary.get_schema_fingerprint()
+
+    async def get_table_versions(self) -> dict[str, str] | None:
+        return await self._primary.get_table_versions()
+
+    @property
+    def dialect(self) -> str:
+        return self._primary.dialect
+
+    @property
+    def cache_namespace(self) -> str:
+        # Replicas serve the primary's data.
+        return self._primary.cache_namespace
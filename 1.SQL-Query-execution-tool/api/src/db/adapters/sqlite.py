@@ -1,22 +1,27 @@
 """SQLite adapter using aiosqlite + SQLAlchemy."""
 
+import time
+from collections.abc import AsyncIterator
 from typing import Any
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from src.log import get_logger
 from src.db.adapters.base import DatabaseAdapter
+from src.db.result import ColumnarResult
 
 logger = get_logger(__name__)
 
 
 class SQLiteAdapter(DatabaseAdapter):
 
-    def __init__(self, dsn: str, echo: bool = False) -> None:
+    # VM instructions between progress-handler deadline checks.
+    _PROGRESS_OPS = 10_000
+
+    def __init__(self, dsn: str, echo: bool = False, statement_timeout: float = 0.0) -> None:
         self._dsn = dsn
         self._echo = echo
+        self._statement_timeout = statement_timeout
         self._engine: AsyncEngine | None = None
-        self._session_factory: sessionmaker | None = None
 
     async def connect(self) -> None:
         logger.info("Connecting to SQLite | dsn=%s", self._dsn)
@@ -24,10 +29,6 @@ class SQLiteAdapter(DatabaseAdapter):
             self._dsn, echo=self._echo, future=True,
             connect_args={"check_same_thread": False},
         )
-        self._session_factory = sessionmaker(
-            bind=self._engine, class_=AsyncSession,
-            expire_on_commit=False, autoflush=False, autocommit=False,
-        )
 
     async def disconnect(self) -> None:
         if self._engine:
@@ -43,19 +44,58 @@ class SQLiteAdapter(DatabaseAdapter):
         except Exception:
             return False
 
-    async def execute_query(self, sql: str) -> dict[str, Any]:
+    async def execute_query(self, sql: str, timeout: float | None = None) -> ColumnarResult:
         self.verify_read_only(sql)
         logger.debug("Executing query | sql=%s", sql[:120])
-        async with self._session_factory() as session:
-            result = await session.execute(text(sql))
-            columns = list(result.keys())
-            rows = [dict(zip(columns, row)) for row in result.fetchall()]
+        # Lean path: run on the raw aiosqlite connection of a pooled checkout,
+        # skipping the ORM session and SQLAlchemy's result/row wrapping.
+        async with self._engine.connect() as conn, self._statement_guard(conn, timeout) as run:
+            driver = (await conn.get_raw_connection()).driver_connection
+            cursor = await run(driver.execute(sql))
+            try:
+                columns = [d[0] for d in cursor.description or ()]
+                rows = await run(cursor.fetchall())
+            finally:
+                await cursor.close()
             logger.debug("Query complete | rows=%d", len(rows))
-            return {"columns": columns, "rows": rows, "row_count": len(rows)}
+            return ColumnarResult(columns=columns, rows=rows)
+
+    async def _stream_batches(
+        self, conn: Any, run: Any, sql: str, batch_size: int
+    ) -> AsyncIterator[tuple[list[str], list[tuple]]]:
+        # Lean path: fetchmany() on the raw aiosqlite cursor, without
+        # SQLAlchemy's result/row wrapping.
+        driver = (await conn.get_raw_connection()).driver_connection
+        cursor = await run(driver.execute(sql))
+        try:
+            columns = [d[0] for d in cursor.description or ()]
+            while rows := await run(cursor.fetchmany(batch_size)):
+                yield columns, rows
+            yield columns, []
+        finally:
+            await cursor.close()
+
+    async def _begin_statement(self, conn: Any, timeout: float) -> Any:
+        # SQLite has no statement timeout; a progress handler returning
+        # non-zero makes the running statement fail with "interrupted".
+        driver = (await conn.get_raw_connection()).driver_connection
+        if timeout and timeout > 0:
+            deadline = time.monotonic() + timeout
+            await driver.set_progress_handler(
+                lambda: int(time.monotonic() > deadline), self._PROGRESS_OPS
+            )
+        return driver
+
+    async def _cancel_statement(self, handle: Any) -> None:
+        await handle.interrupt()
+
+    async def _end_statement(self, handle: Any) -> None:
+        if handle is not None:
+            await handle.set_progress_handler(None, 0)
 
     async def get_tables(self) -> list[str]:
-        async with self._session_factory() as session:
-            result = await session.execute(text(
+        async with self._engine.connect() as conn:
+            result = await conn.execute(text(
                 "SELECT name FROM sqlite_master "
                 "WHERE type = 'table' AND name NOT LIKE 'sqlite_%' "
                 "ORDER BY name"
@@ -63,8 +103,8 @@ class SQLiteAdapter(DatabaseAdapter):
             return [row[0] for row in result.fetchall()]
 
     async def get_columns(self, table_name: str) -> list[dict[str, Any]]:
-        async with self._session_factory() as session:
-            result = await session.execute(text(f"PRAGMA table_info('{table_name}')"))
+        async with self._engine.connect() as conn:
+            result = await conn.execute(text(f"PRAGMA table_info('{table_name}')"))
             # PRAGMA columns: cid, name, type, notnull, dflt_value, pk
             return [
                 {
@@ -77,14 +117,45 @@ class SQLiteAdapter(DatabaseAdapter):
             ]
 
     async def get_foreign_keys(self, table_name: str) -> list[dict[str, Any]]:
-        async with self._session_factory() as session:
-            result = await session.execute(text(f"PRAGMA foreign_key_list('{table_name}')"))
+        async with self._engine.connect() as conn:
+            result = await conn.execute(text(f"PRAGMA foreign_key_list('{table_name}')"))
             # PRAGMA columns: id, seq, table, from, to, ...
             return [
                 {"column": row[3], "foreign_table": row[2], "foreign_column": row[4]}
                 for row in result.fetchall()
             ]
 
+    async def get_schema_snapshot(self) -> dict[str, dict[str, list[dict[str, Any]]]]:
+        # pragma_* table-valued functions let one query cover every table.
+        tables = await self.get_tables()
+        async with self._engine.connect() as conn:
+            columns = (await conn.execute(text(
+                "SELECT m.name, p.name, p.type, p.\"notnull\", p.dflt_value "
+                "FROM sqlite_master AS m JOIN pragma_table_info(m.name) AS p "
+                "WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%' "
+                "ORDER BY m.name, p.cid"
+            ))).fetchall()
+            foreign_keys = (await conn.execute(text(
+                "SELECT m.name, f.\"from\", f.\"table\", f.\"to\" "
+                "FROM sqlite_master AS m JOIN pragma_foreign_key_list(m.name) AS f "
+                "WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%' "
+                "ORDER BY m.name, f.id, f.seq"
+            ))).fetchall()
+        return self._build_snapshot(
+            tables,
+            (
+                (r[0], {"column": r[1], "type": r[2], "nullable": "NO" if r[3] else "YES", "default": r[4]})
+                for r in columns
+            ),
+            ((r[0], {"column": r[1], "foreign_table": r[2], "foreign_column": r[3]}) for r in foreign_keys),
+        )
+
+    async def get_schema_fingerprint(self) -> str | None:
+        # schema_version is bumped by SQLite on every DDL statement.
+        async with self._engine.connect() as conn:
+            result = await conn.execute(text("PRAGMA schema_version"))
+            return str(result.scalar())
+
     @property
     def dialect(self) -> str:
         return "sqlite"
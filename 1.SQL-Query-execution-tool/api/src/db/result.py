@@ -0,0 +1,45 @@
+"""Columnar query result shared by the adapters, the result cache and RESULT events."""
+
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+# Wire formats for result rows: "records" repeats column names in every row
+# (list of objects), "columnar" sends the column list once plus row arrays.
+ResultFormat = Literal["records", "columnar"]
+
+
+@dataclass
+class ColumnarResult:
+    """Column names plus one tuple per row, in column order."""
+
+    columns: list[str]
+    rows: list[tuple[Any, ...]] = field(default_factory=list)
+    truncated: bool = False
+
+    @property
+    def row_count(self) -> int:
+        return len(self.rows)
+
+    def records(self) -> list[dict[str, Any]]:
+        """Expand rows to one dict per row (the legacy "records" shape)."""
+        columns = self.columns
+        return [dict(zip(columns, row)) for row in self.rows]
+
+    def to_payload(self) -> dict[str, Any]:
+        """JSON-ready columnar payload: {columns, rows, row_count, truncated}."""
+        return {
+            "columns": self.columns,
+            "rows": self.rows,
+            "row_count": self.row_count,
+            "truncated": self.truncated,
+        }
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> "ColumnarResult":
+        """Rebuild from to_payload() output; also accepts legacy rows of dicts."""
+        columns = list(payload.get("columns") or [])
+        rows = [
+            tuple(row.get(c) for c in columns) if isinstance(row, dict) else tuple(row)
+            for row in payload.get("rows") or []
+        ]
+        return cls(columns=columns, rows=rows, truncated=bool(payload.get("truncated", False)))
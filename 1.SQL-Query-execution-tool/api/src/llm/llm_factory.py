@@ -1,19 +1,77 @@
+"""
+LLM client factory.
+
+get_llm() returns one shared client per (provider, parameters): the
+supervisor and the model-switch middleware ask for the same models on every
+request, and a new client would bring a new HTTP connection pool (and a new
+TLS handshake per chat). OpenAI-compatible clients additionally share one
+httpx pool per process, sized by the llm_http_* settings; Ollama clients get
+the same limits on their own pool.
+"""
+
 from typing import Any
+
+import httpx
+
 from src.config.settings import get_settings
 from src.log import get_logger
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Shared clients by (provider, sorted constructor arguments).
+_clients: dict[tuple, Any] = {}
+_http_client: httpx.Client | None = None
+_http_async_client: httpx.AsyncClient | None = None
+
 
 def get_llm(**overrides: Any):
     provider = (overrides.pop("provider", None) or settings.llm_provider).lower()
-    logger.info("Loading LLM | provider=%s model=%s", provider, settings.llm_model)
+    kwargs = _client_kwargs(provider, overrides)
+    key = (provider, tuple(sorted((name, repr(value)) for name, value in kwargs.items())))
+    client = _clients.get(key)
+    if client is None:
+        logger.info("Loading LLM | provider=%s model=%s", provider,
+                    kwargs.get("model") or kwargs.get("azure_deployment"))
+        client = _clients[key] = _create(provider, kwargs)
+    return client
+
+
+async def close_llm_clients() -> None:
+    """Drop shared clients and close the shared HTTP pools (app shutdown)."""
+    global _http_client, _http_async_client
+    _clients.clear()
+    if _http_async_client is not None:
+        await _http_async_client.aclose()
+        _http_async_client = None
+    if _http_client is not None:
+        _http_client.close()
+        _http_client = None
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.llm_http_max_connections,
+        max_keepalive_connections=settings.llm_http_max_keepalive_connections,
+        keepalive_expiry=settings.llm_http_keepalive_expiry_seconds,
+    )
+
 
+def _http_clients() -> tuple[httpx.Client, httpx.AsyncClient]:
+    """Process-wide pools for OpenAI-compatible clients."""
+    global _http_client, _http_async_client
+    timeout = httpx.Timeout(settings.llm_http_timeout_seconds, connect=10.0)
+    if _http_client is None:
+        _http_client = httpx.Client(limits=_limits(), timeout=timeout)
+    if _http_async_client is None:
+        _http_async_client = httpx.AsyncClient(limits=_limits(), timeout=timeout)
+    return _http_client, _http_async_client
+
+
+def _client_kwargs(provider: str, overrides: dict[str, Any]) -> dict[str, Any]:
     match provider:
 
         case "openai":
-            from langchain_openai import ChatOpenAI  # type: ignore
             kwargs: dict[str, Any] = {
                 "model":       settings.llm_model,
                 "api_key":     settings.llm_api_key,
@@ -22,11 +80,8 @@ def get_llm(**overrides: Any):
             }
             if settings.llm_base_url:
                 kwargs["base_url"] = settings.llm_base_url.rstrip("/")
-            kwargs.update(overrides)
-            return ChatOpenAI(**kwargs)
 
         case "azure":
-            from langchain_openai import AzureChatOpenAI  # type: ignore
             kwargs = {
                 "azure_deployment": settings.llm_model,
                 "api_key":          settings.llm_api_key,
@@ -35,44 +90,62 @@ def get_llm(**overrides: Any):
             }
             if settings.llm_base_url:
                 kwargs["azure_endpoint"] = settings.llm_base_url.rstrip("/")
-            kwargs.update(overrides)
-            return AzureChatOpenAI(**kwargs)
 
         case "anthropic":
-            from langchain_anthropic import ChatAnthropic  # type: ignore
             kwargs = {
                 "model":       settings.llm_model,
                 "api_key":     settings.llm_api_key,
                 "max_tokens":  settings.llm_max_tokens,
                 "temperature": settings.llm_temperature,
             }
-            kwargs.update(overrides)
-            return ChatAnthropic(**kwargs)
 
         case "google":
-            from langchain_google_genai import ChatGoogleGenerativeAI  # type: ignore
             kwargs = {
                 "model":       settings.llm_model,
                 "google_api_key": settings.llm_api_key,
                 "max_output_tokens": settings.llm_max_tokens,
                 "temperature": settings.llm_temperature,
             }
-            kwargs.update(overrides)
-            return ChatGoogleGenerativeAI(**kwargs)
 
         case "ollama":
-            from langchain_ollama import ChatOllama  # type: ignore
             kwargs = {
                 "model":       settings.llm_model,
                 "temperature": settings.llm_temperature,
             }
             if settings.llm_base_url:
                 kwargs["base_url"] = settings.llm_base_url.rstrip("/")
-            kwargs.update(overrides)
-            return ChatOllama(**kwargs)
 
         case _:
             raise ValueError(
                 f"Unsupported LLM_PROVIDER '{provider}'. "
                 "Supported values: openai | azure | anthropic | google | ollama"
             )
+
+    kwargs.update(overrides)
+    return kwargs
+
+
+def _create(provider: str, kwargs: dict[str, Any]):
+    match provider:
+
+        case "openai":
+            from langchain_openai import ChatOpenAI  # type: ignore
+            http_client, http_async_client = _http_clients()
+            return ChatOpenAI(**kwargs, http_client=http_client, http_async_client=http_async_client)
+
+        case "azure":
+            from langchain_openai import AzureChatOpenAI  # type: ignore
+            http_client, http_async_client = _http_clients()
+            return AzureChatOpenAI(**kwargs, http_client=http_client, http_async_client=http_async_client)
+
+        case "anthropic":
+            from langchain_anthropic import ChatAnthropic  # type: ignore
+            return ChatAnthropic(**kwargs)
+
+        case "google":
+            from langchain_google_genai import ChatGoogleGenerativeAI  # type: ignore
+            return ChatGoogleGenerativeAI(**kwargs)
+
+        case "ollama":
+            from langchain_ollama import ChatOllama  # type: ignore
+            return ChatOllama(**kwargs, client_kwargs={"limits": _limits()})
@@ -20,7 +20,11 @@ def should_use_advanced_model(message_count: int, threshold: int) -> bool:
 
 
 def build_dynamic_model_switch_middleware(settings: Any):
-    """Build middleware that switches between lightweight and advanced model."""
+    """Build middleware that switches between lightweight and advanced model.
+
+    Both models come from get_llm()'s shared registry, so the supervisor and
+    this middleware reuse the same clients and connection pool.
+    """
     lightweight_model = get_llm(model=getattr(settings, "llm_lightweight_model", "gpt-4o-mini"))
     advanced_model = get_llm(model=getattr(settings, "llm_advanced_model", "gpt-4o"))
     threshold = int(getattr(settings, "model_switch_message_threshold", 12))
@@ -18,6 +18,12 @@ to read departments.department_name. Do not use employees.department.
 Never finish with only a plan. The task is incomplete until `execute_sql_query` is called.
 """
 
+SQL_EXECUTOR_PAGING_PROMPT = """
+Large results come back with only their first rows, plus `total_rows` and `next_offset`.
+If the question needs more of them, call `read_result_page` with the same `sql` and
+`offset` set to `next_offset`; it reads the stored result and does not re-run the query.
+"""
+
 SQL_EXECUTOR_DESCRIPTION = (
     "Generates and executes safe SELECT SQL queries against the "
     "database and returns structured results."
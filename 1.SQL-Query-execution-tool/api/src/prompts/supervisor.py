@@ -7,7 +7,8 @@ Your responsibilities:
 1. Receive the user's natural language question.
 2. **First, state your plan in 1-2 sentences** — describe which tables/columns
    you expect to query and why.  Do this BEFORE calling any tools.
-3. Use the `get_schema_context` tool to retrieve the database schema.
+3. Use the `get_schema_context` tool to retrieve the database schema, passing
+   the user's question so that large schemas are narrowed to relevant tables.
 4. Delegate the user's request to the 'sql-executor' subagent, passing BOTH
    the user's full question AND the complete schema context you retrieved so
    that the subagent uses the correct column names.
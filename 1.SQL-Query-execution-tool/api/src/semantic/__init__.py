@@ -1,6 +1,7 @@
 from .models import SemanticTable, SemanticColumn
 from .registry import SemanticRegistry
-from .layer import SemanticLayer
+from .layer import SemanticLayer, clear_schema_cache, get_schema_cache_stats
 
 __all__ = ["SemanticTable", "SemanticColumn",
-           "SemanticRegistry", "SemanticLayer"]
+           "SemanticRegistry", "SemanticLayer",
+           "clear_schema_cache", "get_schema_cache_stats"]
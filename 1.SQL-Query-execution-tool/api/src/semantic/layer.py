@@ -1,11 +1,48 @@
 """Semantic layer — merges raw DB schema with business-level descriptions."""
 
+from typing import NamedTuple
+from weakref import WeakKeyDictionary
+
 from src.log import get_logger
+from src.config.settings import get_settings
 from src.db.adapters.base import DatabaseAdapter
+from src.db.adapters.factory import acquire_adapter
 from src.semantic.models import SemanticTable
 from src.semantic.registry import SemanticRegistry, get_default_registry
+from src.semantic.retrieval import SchemaIndex, build_schema_index
 
 logger = get_logger(__name__)
+settings = get_settings()
+
+_HEADER = "=== DATABASE SCHEMA & SEMANTIC CONTEXT ===\n"
+_FOOTER = "\n=== END SCHEMA ==="
+
+
+class _SchemaContext(NamedTuple):
+    fingerprint: str | None
+    context: str
+    sections: dict[str, str]
+    index: SchemaIndex
+
+
+# Process-wide prompt-context cache: adapter -> registry -> _SchemaContext.
+# Entries are revalidated against adapter.get_schema_fingerprint() on every
+# lookup; registries are assumed immutable once the layer is in use.
+_SCHEMA_CACHE: "WeakKeyDictionary[DatabaseAdapter, WeakKeyDictionary[SemanticRegistry, _SchemaContext]]" = (
+    WeakKeyDictionary()
+)
+_SCHEMA_CACHE_STATS: dict[str, int] = {"hits": 0, "misses": 0}
+
+
+def get_schema_cache_stats() -> dict[str, int]:
+    """Return schema context cache hit/miss counters."""
+    return dict(_SCHEMA_CACHE_STATS)
+
+
+def clear_schema_cache() -> None:
+    """Drop all cached schema contexts and reset the counters."""
+    _SCHEMA_CACHE.clear()
+    _SCHEMA_CACHE_STATS.update(hits=0, misses=0)
 
 
 class SemanticLayer:
@@ -14,24 +51,80 @@ class SemanticLayer:
         self._adapter = adapter
         self._registry = registry or get_default_registry()
 
-    async def build_prompt_context(self) -> str:
-        """Build the full schema + semantic context string for LLM prompting."""
-        physical_tables = await self._adapter.get_tables()
-        logger.info("Building prompt context | tables=%d", len(physical_tables))
-        sections: list[str] = [
-            f"Database dialect: {self._adapter.dialect}\n",
-            "=== DATABASE SCHEMA & SEMANTIC CONTEXT ===\n",
-        ]
+    @classmethod
+    async def for_datasource(
+        cls, datasource_id: str | None = None, registry: SemanticRegistry | None = None
+    ) -> "SemanticLayer":
+        """SemanticLayer over a datasource from the registry (connected lazily)."""
+        return cls(await acquire_adapter(datasource_id), registry)
+
+    @property
+    def dialect(self) -> str:
+        return self._adapter.dialect
+
+    async def build_prompt_context(self, question: str | None = None) -> str:
+        """Return the schema + semantic context, rebuilt only when the schema changed.
+
+        With a question, databases of at least schema_prune_min_tables tables
+        get only the schema_prune_top_k most relevant tables (plus the tables
+        they reference) and a one-line directory of the rest.
+        """
+        schema = await self._schema_context()
+        top_k = settings.schema_prune_top_k
+        if not question or top_k <= 0 or len(schema.sections) < settings.schema_prune_min_tables:
+            return schema.context
+        tables = schema.index.select(question, top_k)
+        if not tables:
+            return schema.context
+        logger.info("Pruned schema context | tables=%d of %d", len(tables), len(schema.sections))
+        return self._pruned_context(schema, tables)
+
+    async def _schema_context(self) -> _SchemaContext:
+        fingerprint = await self._schema_fingerprint()
+        entries = _SCHEMA_CACHE.setdefault(self._adapter, WeakKeyDictionary())
+        cached = entries.get(self._registry)
+        if fingerprint is not None and cached is not None and cached.fingerprint == fingerprint:
+            _SCHEMA_CACHE_STATS["hits"] += 1
+            logger.debug("Schema context cache hit | fingerprint=%s", fingerprint[:16])
+            return cached
 
-        for table_name in physical_tables:
+        _SCHEMA_CACHE_STATS["misses"] += 1
+        schema = await self._build_schema_context(fingerprint)
+        if fingerprint is not None:
+            entries[self._registry] = schema
+        return schema
+
+    async def _build_schema_context(self, fingerprint: str | None) -> _SchemaContext:
+        """Build the full schema + semantic context string for LLM prompting, and its index."""
+        snapshot = await self._adapter.get_schema_snapshot()
+        logger.info("Building prompt context | tables=%d", len(snapshot))
+        semantics: dict[str, SemanticTable] = {}
+        sections: dict[str, str] = {}
+        for table_name, entry in snapshot.items():
             semantic = self._registry.get(table_name)
             if semantic:
-                sections.append(self._build_semantic_section(table_name, semantic))
+                semantics[table_name] = semantic
+                sections[table_name] = self._build_semantic_section(table_name, semantic)
             else:
-                sections.append(await self._build_raw_section(table_name))
+                sections[table_name] = self._build_raw_section(
+                    table_name, entry["columns"], entry["foreign_keys"]
+                )
+
+        context = "\n".join([self._header(), *sections.values(), _FOOTER])
+        return _SchemaContext(fingerprint, context, sections, build_schema_index(snapshot, semantics))
 
-        sections.append("\n=== END SCHEMA ===")
-        return "\n".join(sections)
+    def _pruned_context(self, schema: _SchemaContext, tables: list[str]) -> str:
+        parts = [self._header(), *(schema.sections[t] for t in tables)]
+        rest = [name for name in schema.sections if name not in tables]
+        if rest:
+            parts.append(
+                f"Other tables ({len(rest)}, not shown; call get_schema_context with a question "
+                f"naming them for their columns): {', '.join(rest)}"
+            )
+        return "\n".join([*parts, _FOOTER])
+
+    def _header(self) -> str:
+        return f"Database dialect: {self._adapter.dialect}\n\n{_HEADER}"
 
     async def enrich_table(self, table_name: str) -> dict:
         """Merged view of physical schema + semantic definitions for one table."""
@@ -82,12 +175,20 @@ class SemanticLayer:
             )
         return result
 
+    async def _schema_fingerprint(self) -> str | None:
+        try:
+            return await self._adapter.get_schema_fingerprint()
+        except Exception as exc:
+            logger.warning("Schema fingerprint failed; bypassing cache: %s", exc)
+            return None
+
     def _build_semantic_section(self, table_name: str, semantic: SemanticTable) -> str:
         return semantic.to_prompt_fragment() + "\n"
 
-    async def _build_raw_section(self, table_name: str) -> str:
-        columns = await self._adapter.get_columns(table_name)
-        fks = {fk["column"]: fk for fk in await self._adapter.get_foreign_keys(table_name)}
+    def _build_raw_section(
+        self, table_name: str, columns: list[dict], foreign_keys: list[dict]
+    ) -> str:
+        fks = {fk["column"]: fk for fk in foreign_keys}
         lines = [f"Table: {table_name} [no semantic definition]"]
         for col in columns:
             nullable = "NULL" if col["nullable"] == "YES" else "NOT NULL"
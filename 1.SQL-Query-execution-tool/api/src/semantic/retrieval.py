@@ -0,0 +1,117 @@
+"""
+Relevance-ranked schema pruning for large databases.
+
+SchemaIndex is an in-process BM25 index with one document per table: its
+name, display name and description, its columns' names and descriptions, and
+its common questions. select() returns the best matching tables for a
+question plus the tables they reference by foreign key (a hit on `orders`
+is of little use without `customers`). Tables referencing a hit are not
+added unless they rank themselves, so a hub table does not pull in half the
+schema.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Any
+
+from src.semantic.models import SemanticTable
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Question words that say nothing about the schema.
+_STOPWORDS = frozenset(
+    "a an and are as at be by can did do does each for from give had has have how i in is it "
+    "its list many me much my of on or per show tell than that the their them there these this "
+    "to was were what when where which who whose with".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens of text (snake_case and camelCase split), naively singularised."""
+    text = re.sub(r"([a-z])([A-Z])", r"\1 \2", text).lower()
+    tokens = []
+    for word in _WORD.findall(text):
+        if word in _STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def table_document(
+    table_name: str, columns: list[dict[str, Any]], semantic: SemanticTable | None
+) -> list[str]:
+    """Tokens indexed for one table; the table name counts twice."""
+    parts = [table_name, table_name]
+    parts += [col["column"] for col in columns]
+    if semantic is not None:
+        parts += [semantic.display_name, semantic.description, *semantic.common_queries]
+        parts += [f"{col.display_name} {col.description}" for col in semantic.columns]
+    return tokenize(" ".join(parts))
+
+
+class SchemaIndex:
+    """BM25 over table documents, with the foreign-key graph for neighbour expansion."""
+
+    def __init__(
+        self,
+        documents: dict[str, list[str]],
+        references: dict[str, list[str]],
+        k1: float = 1.5,
+        b: float = 0.75,
+    ) -> None:
+        self._k1 = k1
+        self._b = b
+        self._references = references
+        self._terms = {table: Counter(tokens) for table, tokens in documents.items()}
+        self._lengths = {table: len(tokens) for table, tokens in documents.items()}
+        self._avg_length = sum(self._lengths.values()) / len(documents) if documents else 0.0
+        df: Counter[str] = Counter()
+        for terms in self._terms.values():
+            df.update(terms.keys())
+        n = len(documents)
+        self._idf = {term: math.log(1 + (n - count + 0.5) / (count + 0.5)) for term, count in df.items()}
+
+    def scores(self, question: str) -> dict[str, float]:
+        """BM25 score of every table with at least one question term."""
+        query = set(tokenize(question)) & self._idf.keys()
+        scores: dict[str, float] = {}
+        for table, terms in self._terms.items():
+            norm = self._k1 * (1 - self._b + self._b * self._lengths[table] / (self._avg_length or 1))
+            score = 0.0
+            for term in query:
+                tf = terms.get(term)
+                if tf:
+                    score += self._idf[term] * tf * (self._k1 + 1) / (tf + norm)
+            if score > 0:
+                scores[table] = score
+        return scores
+
+    def select(self, question: str, top_k: int) -> list[str]:
+        """Top-k tables for question, then the tables they reference; [] if nothing matches."""
+        scores = self.scores(question)
+        hits = sorted(scores, key=lambda table: -scores[table])[:top_k]
+        selected = list(hits)
+        for table in hits:
+            for referenced in self._references.get(table, []):
+                if referenced not in selected and referenced in self._terms:
+                    selected.append(referenced)
+        return selected
+
+
+def build_schema_index(
+    snapshot: dict[str, dict[str, list[dict[str, Any]]]],
+    semantics: dict[str, SemanticTable],
+) -> SchemaIndex:
+    """Index a get_schema_snapshot() result with its semantic definitions."""
+    documents = {
+        table: table_document(table, entry["columns"], semantics.get(table))
+        for table, entry in snapshot.items()
+    }
+    references = {
+        table: list(dict.fromkeys(fk["foreign_table"] for fk in entry["foreign_keys"]))
+        for table, entry in snapshot.items()
+    }
+    return SchemaIndex(documents, references)
@@ -12,13 +12,16 @@ from langchain_core.tools import tool
 from src.skills.registry import Skill, SkillTarget, register_skill
 
 
-def export_result_csv_tool(columns: list[str], rows: list[dict[str, Any]]) -> str:
-    """Format columns and rows as a CSV string. Header is the first line."""
+def export_result_csv_tool(columns: list[str], rows: list[dict[str, Any] | list[Any]]) -> str:
+    """Format columns and rows as a CSV string. Header is the first line.
+
+    Rows may be objects keyed by column or arrays in column order.
+    """
     buf = io.StringIO()
     writer = csv.writer(buf)
     writer.writerow(columns)
     for row in rows:
-        writer.writerow([row.get(c) for c in columns])
+        writer.writerow([row.get(c) for c in columns] if isinstance(row, dict) else row)
     return buf.getvalue()
 
 
@@ -28,7 +31,8 @@ def export_result_as_csv(columns_json: str, rows_json: str) -> str:
 
     Args:
         columns_json: JSON array of column names, e.g. ["name", "count"].
-        rows_json: JSON array of row objects, e.g. [{"name":"a","count":1}].
+        rows_json: JSON array of rows, either arrays in column order, e.g.
+            [["a", 1]], or objects, e.g. [{"name":"a","count":1}].
 
     Returns:
         CSV string with header row and data rows.
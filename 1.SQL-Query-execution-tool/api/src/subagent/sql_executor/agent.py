@@ -3,19 +3,26 @@
 from langchain.agents.middleware import HumanInTheLoopMiddleware
 
 from src.log import get_logger
+from src.config.settings import get_settings
 from src.tools.execute_sql import execute_sql
-from src.db.adapters.base import DatabaseAdapter
-from src.agent.events import AgentEvent
-from src.prompts.sql_executor import SQL_EXECUTOR_PROMPT, SQL_EXECUTOR_DESCRIPTION
+from src.tools.execute_sql import read_result_page as read_result_page_tool
+from src.agent.run_context import current_run
+from src.prompts.sql_executor import (
+    SQL_EXECUTOR_DESCRIPTION,
+    SQL_EXECUTOR_PAGING_PROMPT,
+    SQL_EXECUTOR_PROMPT,
+)
 
 logger = get_logger(__name__)
+settings = get_settings()
 
 
-def build_config(adapter: DatabaseAdapter, captured_events: list[AgentEvent]) -> dict:
+def build_config(dialect: str) -> dict:
     """Return a subagent config dict ready for create_deep_agent(subagents=[...]).
 
     When the agent is about to run execute_sql_query, HITL middleware interrupts
-    so the client can approve, reject, or edit the SQL before execution.
+    so the client can approve, reject, or edit the SQL before execution. The
+    adapter and event bus come from the current run (src.agent.run_context).
     """
     async def execute_sql_query(nl_query: str, sql: str) -> str:
         """Execute a read-only SELECT query and return results as JSON.
@@ -24,20 +31,38 @@ def build_config(adapter: DatabaseAdapter, captured_events: list[AgentEvent]) ->
             nl_query: The original natural language question from the user.
             sql: The SELECT SQL statement to execute.
         """
+        run = current_run()
         return await execute_sql.coroutine(
             nl_query=nl_query,
             sql=sql,
-            adapter=adapter,
-            captured_events=captured_events,
+            adapter=run.adapter,
+            event_bus=run.events,
         )
 
-    logger.info("sql-executor subagent configured | dialect=%s",
-                adapter.dialect)
+    async def read_result_page(sql: str, offset: int) -> str:
+        """Read more rows of a result execute_sql_query returned only in part.
+
+        Args:
+            sql: The SQL statement exactly as passed to execute_sql_query.
+            offset: Index of the first row to return (next_offset of the previous page).
+        """
+        return await read_result_page_tool.coroutine(
+            sql=sql, offset=offset, adapter=current_run().adapter
+        )
+
+    tools = [execute_sql_query]
+    prompt = SQL_EXECUTOR_PROMPT
+    if settings.sql_llm_page_rows > 0:
+        # Reads the cached result only, so it needs no approval.
+        tools.append(read_result_page)
+        prompt += SQL_EXECUTOR_PAGING_PROMPT
+
+    logger.info("sql-executor subagent configured | dialect=%s", dialect)
     return {
         "name": "sql-executor",
         "description": SQL_EXECUTOR_DESCRIPTION,
-        "system_prompt": SQL_EXECUTOR_PROMPT,
-        "tools": [execute_sql_query],
+        "system_prompt": prompt,
+        "tools": tools,
         "middleware": [
             HumanInTheLoopMiddleware(interrupt_on={"execute_sql_query": True}),
         ],
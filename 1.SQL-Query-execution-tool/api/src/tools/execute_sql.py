@@ -1,15 +1,25 @@
-import json
 import re
+import time
+from contextlib import aclosing
 from typing import Any, List
 from langchain_core.tools import InjectedToolArg, tool
 from typing_extensions import Annotated
 
 from src.log import get_logger
+from src.agent.event_bus import EventBus
 from src.agent.events import AgentEvent, EventType
-from src.cache.redis_client import get_cached_result, set_cached_result
+from src.cache.redis_client import get_cached_entry, get_cached_page, set_cached_result
+from src.cache.refresh import record_hit
+from src.cache.single_flight import single_flight
+from src.cache.warmup import record_execution, record_request
+from src.config.settings import get_settings
 from src.db.adapters.base import DatabaseAdapter
+from src.db.adapters.factory import hold_adapter
+from src.db.result import ColumnarResult
+from src.utils import serializer
 
 logger = get_logger(__name__)
+settings = get_settings()
 
 
 def _extract_sql(text: str) -> str:
@@ -17,12 +27,79 @@ def _extract_sql(text: str) -> str:
     return match.group(1).strip() if match else text.strip()
 
 
+async def _fetch_bounded(
+    adapter: DatabaseAdapter, sql: str, batch_size: int, max_rows: int
+) -> ColumnarResult:
+    """Drain execute_query_stream, keeping at most max_rows rows in memory.
+
+    The cursor is closed as soon as the cap is exceeded, so the remaining rows
+    are never transferred from the database (MySQL's unbuffered cursor would
+    drain them on close, so its adapter kills the statement first).
+    """
+    result = ColumnarResult(columns=[])
+    async with aclosing(adapter.execute_query_stream(sql, batch_size)) as batches:
+        async for batch in batches:
+            result.columns = batch.columns
+            room = max_rows - result.row_count
+            result.rows.extend(batch.rows[:room])
+            if batch.row_count > room:
+                result.truncated = True
+                break
+    return result
+
+
+async def execute_and_cache(adapter: DatabaseAdapter, sql: str) -> ColumnarResult:
+    """Run sql, cache its result and log how long it took.
+
+    Holds a lease on the adapter: background refreshes and warming run outside
+    any agent run.
+    """
+    started = time.perf_counter()
+    async with hold_adapter(adapter):
+        result = await _fetch_bounded(
+            adapter,
+            sql,
+            settings.sql_stream_batch_size,
+            settings.sql_max_result_rows,
+        )
+    await record_execution(sql, adapter.cache_namespace, (time.perf_counter() - started) * 1000)
+    await set_cached_result(sql, result, adapter.cache_namespace)
+    return result
+
+
+def _result_event(result: ColumnarResult) -> AgentEvent:
+    return AgentEvent(
+        type=EventType.RESULT,
+        columns=result.columns,
+        rows=result.rows,
+        row_count=result.row_count,
+        truncated=result.truncated,
+    )
+
+
+def _llm_payload(result: ColumnarResult) -> dict[str, Any]:
+    """to_payload() of result, cut to the first sql_llm_page_rows rows for the LLM.
+
+    A cut payload carries total_rows and next_offset for read_result_page.
+    """
+    payload = result.to_payload()
+    page_rows = settings.sql_llm_page_rows
+    if page_rows > 0 and result.row_count > page_rows:
+        payload.update(
+            rows=result.rows[:page_rows],
+            row_count=page_rows,
+            total_rows=result.row_count,
+            next_offset=page_rows,
+        )
+    return payload
+
+
 @tool(parse_docstring=True)
 async def execute_sql(
     nl_query: str,
     sql: str,
     adapter: Annotated[DatabaseAdapter, InjectedToolArg],
-    captured_events: Annotated[list, InjectedToolArg],
+    event_bus: Annotated[EventBus, InjectedToolArg],
 ) -> str:
     """Execute a read-only SELECT query and return results as JSON.
 
@@ -30,12 +107,13 @@ async def execute_sql(
         nl_query: The original natural language question from the user.
         sql: The SELECT SQL statement to execute.
         adapter: The database adapter instance (injected at runtime).
-        captured_events: Shared list to capture AgentEvents for re-emission (injected at runtime).
+        event_bus: The run's EventBus; events reach the client as they are appended (injected at runtime).
 
     Returns:
-        JSON string with keys: sql, columns, rows, row_count, error.
+        JSON string with keys: sql, columns, rows (one array per row, in
+        columns order), row_count, truncated, error. When only the first
+        page of rows is included, also total_rows and next_offset.
     """
-    captured_events.clear()
     clean_sql = _extract_sql(sql)
     logger.info("execute_sql | dialect=%s sql=%s", adapter.dialect, clean_sql[:120])
 
@@ -44,38 +122,35 @@ async def execute_sql(
         "columns": [],
         "rows": [],
         "row_count": 0,
+        "truncated": False,
         "error": None,
     }
 
-    captured_events.append(
+    event_bus.append(
         AgentEvent(type=EventType.TOOL_CALL, tool="codeact_sql", input=nl_query)
     )
-    captured_events.append(
+    event_bus.append(
         AgentEvent(type=EventType.SQL, content=clean_sql)
     )
 
-    cached = await get_cached_result(clean_sql)
-    if cached:
-        logger.info("Cache hit for SQL query")
-        captured_events.append(
-            AgentEvent(type=EventType.EXECUTING, content="Returning cached result...")
+    namespace = adapter.cache_namespace
+    await record_request(clean_sql, namespace)
+    entry = await get_cached_entry(clean_sql, namespace)
+    if entry is not None:
+        logger.info("Cache hit for SQL query | stale=%s", entry.stale)
+        # Stale-while-revalidate: answer now, refresh hot entries in the background.
+        await record_hit(
+            clean_sql, namespace, entry.stale, lambda: execute_and_cache(adapter, clean_sql)
         )
-        captured_events.append(
-            AgentEvent(
-                type=EventType.RESULT,
-                columns=cached["columns"],
-                rows=cached["rows"],
-                row_count=cached["row_count"],
-            )
-        )
-        result_payload.update(
-            columns=cached["columns"],
-            rows=cached["rows"],
-            row_count=cached["row_count"],
+        cached = entry.result
+        event_bus.append(
+            AgentEvent(type=EventType.EXECUTING, content="Returning cached result...")
         )
-        return json.dumps(result_payload)
+        event_bus.append(_result_event(cached))
+        result_payload.update(_llm_payload(cached))
+        return serializer.dumps(result_payload)
 
-    captured_events.append(
+    event_bus.append(
         AgentEvent(
             type=EventType.EXECUTING,
             content=f"Running query on {adapter.dialect}...",
@@ -83,27 +158,60 @@ async def execute_sql(
     )
 
     try:
-        result: dict[str, Any] = await adapter.execute_query(clean_sql)
-        await set_cached_result(clean_sql, result)
-        logger.info("Query returned %d rows", result["row_count"])
-        captured_events.append(
-            AgentEvent(
-                type=EventType.RESULT,
-                columns=result["columns"],
-                rows=result["rows"],
-                row_count=result["row_count"],
+        if settings.sql_single_flight_enabled:
+            # Identical concurrent statements share one execution.
+            result = await single_flight(
+                clean_sql, lambda: execute_and_cache(adapter, clean_sql), namespace
             )
+        else:
+            result = await execute_and_cache(adapter, clean_sql)
+        logger.info(
+            "Query returned %d rows | truncated=%s", result.row_count, result.truncated
         )
-        result_payload.update(
-            columns=result["columns"],
-            rows=result["rows"],
-            row_count=result["row_count"],
-        )
+        event_bus.append(_result_event(result))
+        result_payload.update(_llm_payload(result))
     except Exception as exc:
         logger.error("Query execution failed: %s", exc)
-        captured_events.append(
+        event_bus.append(
             AgentEvent(type=EventType.ERROR, content=str(exc))
         )
         result_payload["error"] = str(exc)
 
-    return json.dumps(result_payload)
+    return serializer.dumps(result_payload)
+
+
+@tool(parse_docstring=True)
+async def read_result_page(
+    sql: str,
+    offset: int,
+    adapter: Annotated[DatabaseAdapter, InjectedToolArg],
+) -> str:
+    """Read more rows of a result execute_sql returned only in part.
+
+    Only the cached chunks covering the page are read; the query is not run again.
+
+    Args:
+        sql: The SQL statement exactly as passed to execute_sql.
+        offset: Index of the first row to return (next_offset of the previous page).
+        adapter: The database adapter instance (injected at runtime).
+
+    Returns:
+        JSON string with keys: sql, columns, rows, offset, row_count,
+        total_rows, next_offset (null on the last page), error.
+    """
+    clean_sql = _extract_sql(sql)
+    page_rows = settings.sql_llm_page_rows or settings.sql_max_result_rows
+    payload: dict[str, Any] = {"sql": clean_sql, "offset": offset, "error": None}
+    page = await get_cached_page(clean_sql, max(offset, 0), page_rows, adapter.cache_namespace)
+    if page is None:
+        payload["error"] = "The result is no longer cached; run the query again."
+        return serializer.dumps(payload)
+    end = page.offset + page.result.row_count
+    payload.update(
+        columns=page.result.columns,
+        rows=page.result.rows,
+        row_count=page.result.row_count,
+        total_rows=page.total_rows,
+        next_offset=end if end < page.total_rows else None,
+    )
+    return serializer.dumps(payload)
@@ -10,16 +10,18 @@ logger = get_logger(__name__)
 @tool(parse_docstring=True)
 async def get_schema_context_tool(
     semantic_layer: Annotated[SemanticLayer, InjectedToolArg],
+    question: str = "",
 ) -> str:
-    """Return the full semantic + physical schema context for the LLM prompt.
+    """Return the semantic + physical schema context for the LLM prompt.
 
     Args:
         semantic_layer: The semantic layer instance (injected at runtime).
+        question: The user's question; on large databases only the relevant tables are returned.
 
     Returns:
         A formatted string describing the database schema.
     """
     logger.info("Building schema context")
-    result = await semantic_layer.build_prompt_context()
+    result = await semantic_layer.build_prompt_context(question or None)
     logger.debug("Schema context built | length=%d", len(result))
     return result
@@ -0,0 +1,60 @@
+"""
+MinHash signatures for near-duplicate text matching.
+
+Texts are normalised to lower-case word tokens; their shingles are the
+single words plus adjacent word pairs. A signature holds the minimum of
+NUM_PERM seeded hash functions over the shingles, and the share of equal
+positions between two signatures estimates the Jaccard similarity of their
+shingle sets. lsh_bands() cuts a signature into bands for bucketed lookup:
+two texts share a band (become candidates) with high probability once their
+similarity is well above (1 / BANDS) ** (1 / ROWS).
+"""
+
+import hashlib
+import random
+import re
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+# Universal hashing (a * x + b) mod p over 64-bit shingle hashes.
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def tokens(text: str) -> list[str]:
+    """Lower-case word tokens of text (punctuation dropped)."""
+    return _WORD.findall(text.lower())
+
+
+def shingles(text: str) -> set[str]:
+    words = tokens(text)
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def signature(text: str) -> list[int]:
+    """MinHash signature of text's shingles (NUM_PERM ints)."""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big")
+        for s in shingles(text) or {""}
+    ]
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def similarity(a: list[int], b: list[int]) -> float:
+    """Estimated Jaccard similarity of the texts behind two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def lsh_bands(sig: list[int]) -> list[str]:
+    """One bucket id per band of sig."""
+    return [
+        f"{band}:" + hashlib.blake2b(
+            ",".join(map(str, sig[band * ROWS:(band + 1) * ROWS])).encode(), digest_size=8
+        ).hexdigest()
+        for band in range(BANDS)
+    ]
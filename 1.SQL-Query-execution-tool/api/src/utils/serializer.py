@@ -0,0 +1,101 @@
+"""
+JSON encoding for query results, cached results and SSE events.
+
+Uses orjson when installed (serializes datetime, date, time, UUID, dataclasses
+and tuples natively, in C) and falls back to the stdlib json module otherwise.
+Both backends share one hook for the remaining database types:
+
+    Decimal            -> number when float round-trips it exactly, else string
+    timedelta          -> total seconds (number)
+    bytes / memoryview -> base64 string
+    set / frozenset    -> array
+
+Extra types can be added with register_encoder(); the hook only sees values
+the active backend cannot encode itself.
+"""
+
+import base64
+import json
+import uuid
+from collections.abc import Callable
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any
+
+from src.log import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+    logger.info("orjson not installed; using stdlib json for serialization")
+
+_ENCODERS: dict[type, Callable[[Any], Any]] = {}
+
+
+def register_encoder(type_: type, encoder: Callable[[Any], Any]) -> None:
+    """Encode values of type_ (and subclasses) as encoder(value)."""
+    _ENCODERS[type_] = encoder
+
+
+def _encode_decimal(value: Decimal) -> float | int | str:
+    if not value.is_finite():
+        return str(value)
+    if value == value.to_integral_value() and abs(value) < 2**53:
+        return int(value)
+    as_float = float(value)
+    # Keep exactness: only emit a JSON number if it parses back to the same value.
+    return as_float if Decimal(repr(as_float)) == value else str(value)
+
+
+def _encode_bytes(value: bytes | bytearray | memoryview) -> str:
+    return base64.b64encode(bytes(value)).decode("ascii")
+
+
+register_encoder(Decimal, _encode_decimal)
+register_encoder(timedelta, lambda v: v.total_seconds())
+register_encoder(bytes, _encode_bytes)
+register_encoder(bytearray, _encode_bytes)
+register_encoder(memoryview, _encode_bytes)
+register_encoder(set, list)
+register_encoder(frozenset, list)
+# Native in orjson; needed for the stdlib fallback.
+register_encoder(datetime, lambda v: v.isoformat())
+register_encoder(date, lambda v: v.isoformat())
+register_encoder(time, lambda v: v.isoformat())
+register_encoder(uuid.UUID, str)
+
+
+def _default(value: Any) -> Any:
+    for cls in type(value).__mro__:
+        encoder = _ENCODERS.get(cls)
+        if encoder is not None:
+            return encoder(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return _stdlib_dumps(obj).encode()
+
+
+def dumps(obj: Any) -> str:
+    """Serialize obj to a JSON string."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS).decode()
+    return _stdlib_dumps(obj)
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse JSON from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,128 @@
+"""
+Lightweight SQL text helpers (no parser dependency).
+
+canonicalize() / fingerprint() normalise a statement for cache keys: comments
+and trailing semicolons are dropped, whitespace between tokens collapses to
+one space, and keywords and unquoted identifiers are lower-cased. String
+literals, quoted identifiers and numbers are kept byte for byte, so
+WHERE name = 'Bob' and WHERE name = 'bob' never share a fingerprint.
+
+referenced_tables() finds the tables a SELECT reads, for tagging cached
+results. It is a tokenizer-level scan, not a parser: string literals and
+comments are blanked first, then names following FROM / JOIN (and the
+comma-separated items of a FROM list) are collected, minus CTE names.
+Over-reporting is harmless (an extra tag only invalidates more eagerly).
+"""
+
+import hashlib
+import re
+
+# One lexical token, or whitespace / a comment (group "skip"). Backslash
+# escapes are honoured inside quotes (MySQL, PostgreSQL E'' strings): on
+# PostgreSQL standard strings that can only make a literal look longer, i.e.
+# keep more text verbatim, never less.
+_TOKEN = re.compile(
+    r"(?P<skip>\s+|--[^\n]*|/\*[\s\S]*?\*/)"
+    r"|(?P<literal>'(?:[^'\\]|\\.|'')*'?"                  # string literal
+    r'|"(?:[^"]|"")*"?|`(?:[^`]|``)*`?|\[[^\]]*\]?'         # quoted identifier
+    r"|(?P<dollar>\$(?:[A-Za-z_]\w*)?\$)[\s\S]*?(?:(?P=dollar)|$)"  # $tag$ ... $tag$
+    r"|(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?\w*)"           # number (case kept: 0xFF)
+    r"|(?P<word>[A-Za-z_][\w$]*)"                              # keyword / identifier
+    r"|(?P<op>->>?|#>>?|<=>?|>=|<>|!=|::|\|\||@>|<@|&&|.)",      # operator / punctuation
+)
+
+_LITERALS_AND_COMMENTS = re.compile(
+    r"'(?:[^']|'')*'"        # string literal
+    r"|--[^\n]*"             # line comment
+    r"|/\*[\s\S]*?\*/",      # block comment
+)
+
+# One possibly quoted and possibly schema-qualified name.
+_NAME = r'(?:"[^"]+"|`[^`]+`|\[[^\]]+\]|[A-Za-z_][\w$]*)'
+_QUALIFIED = rf"{_NAME}(?:\s*\.\s*{_NAME})*"
+
+_FROM_OR_JOIN = re.compile(rf"\b(FROM|JOIN)\s+({_QUALIFIED})", re.IGNORECASE)
+# Further items of a FROM list: ", name" up to the next clause keyword.
+_FROM_LIST = re.compile(
+    r"\bFROM\b([\s\S]*?)(?=\bWHERE\b|\bGROUP\b|\bORDER\b|\bHAVING\b|\bLIMIT\b"
+    r"|\bUNION\b|\bEXCEPT\b|\bINTERSECT\b|\bJOIN\b|\bWINDOW\b|;|$)",
+    re.IGNORECASE,
+)
+_INNERMOST_PARENS = re.compile(r"\(([^()]*)\)")
+_LIST_ITEM = re.compile(rf",\s*({_QUALIFIED})")
+_CTE_NAME = re.compile(rf"(?:\bWITH(?:\s+RECURSIVE)?|,)\s*({_NAME})\s*(?:\([^)]*\)\s*)?AS\s*\(", re.IGNORECASE)
+
+# Functions whose argument syntax uses FROM: EXTRACT(year FROM col), ...
+_FUNCTION_FROM = re.compile(r"\b(?:EXTRACT|SUBSTRING|TRIM|OVERLAY)\s*\([^()]*$", re.IGNORECASE)
+
+# Stands in for a collapsed parenthesised group.
+_GROUP = "_"
+
+# Names that can follow FROM without being a table.
+_NOT_TABLES = {"select", "lateral", "unnest", "dual", "only", _GROUP}
+
+
+def canonicalize(sql: str) -> str:
+    """Canonical text of sql: same for statements that differ only in layout or case."""
+    tokens: list[str] = []
+    for match in _TOKEN.finditer(sql):
+        if match.group("skip") is not None:
+            continue
+        token = match.group(0)
+        tokens.append(token.lower() if match.group("word") is not None else token)
+    while tokens and tokens[-1] == ";":
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def fingerprint(sql: str) -> str:
+    """SHA-256 hex digest of canonicalize(sql)."""
+    return hashlib.sha256(canonicalize(sql).encode()).hexdigest()
+
+
+def _strip_literals(sql: str) -> str:
+    return _LITERALS_AND_COMMENTS.sub(" ", sql)
+
+
+def _table_name(qualified: str) -> str:
+    """Unquoted, lower-cased last part of a possibly schema-qualified name."""
+    last = re.split(r"\s*\.\s*", qualified)[-1]
+    return last.strip('"`[]').lower()
+
+
+def _from_list_names(text: str) -> list[str]:
+    """Names after the first item of every FROM list, one nesting level at a time.
+
+    Innermost parenthesised groups are scanned and then collapsed to a placeholder, so
+    commas of a subquery or function call never leak into the outer FROM list.
+    """
+    names: list[str] = []
+
+    def scan(level: str) -> None:
+        for clause in _FROM_LIST.finditer(level):
+            names.extend(m.group(1) for m in _LIST_ITEM.finditer(clause.group(1)))
+
+    while True:
+        groups = _INNERMOST_PARENS.findall(text)
+        if not groups:
+            break
+        for group in groups:
+            scan(group)
+        text = _INNERMOST_PARENS.sub(f" {_GROUP} ", text)
+    scan(text)
+    return names
+
+
+def referenced_tables(sql: str) -> set[str]:
+    """Return the lower-cased, unqualified names of the tables sql reads from."""
+    text = _strip_literals(sql)
+    ctes = {_table_name(m.group(1)) for m in _CTE_NAME.finditer(text)}
+
+    names = [
+        m.group(2) for m in _FROM_OR_JOIN.finditer(text)
+        if not _FUNCTION_FROM.search(text, 0, m.start())
+    ]
+    names.extend(_from_list_names(text))
+
+    tables = {_table_name(name) for name in names}
+    return tables - ctes - _NOT_TABLES
@@ -1,7 +1,9 @@
 """Streaming utilities for parsing and yielding agent events."""
 
+import time
 from collections.abc import Sequence
 from typing import Any, AsyncIterator, AsyncGenerator
+from src.agent.event_bus import EventBus
 from src.agent.events import AgentEvent, EventType
 from src.log import get_logger
 
@@ -145,7 +147,7 @@ def _interrupt_to_agent_event(hitl_request: dict[str, Any]) -> AgentEvent | None
 async def stream_agent_events(
     graph_stream: AsyncIterator[dict],
     original_query: str,
-    captured_events: list[AgentEvent],
+    events: EventBus,
     full_response_parts: list[str],
 ) -> AsyncGenerator[AgentEvent, None]:
     """
@@ -153,17 +155,71 @@ async def stream_agent_events(
 
     * Buffers LLM tokens and emits them as a single PLAN event (before the
       first tool call) or a single ANSWER event (after the last tool result).
+    * Once a tool result is in and no tool is running, the tokens are
+      probably the answer: the buffered ones and then each new one are also
+      yielded as ANSWER_DELTA right away. If the model calls another tool
+      instead, those deltas were reasoning and ANSWER_RESET withdraws them.
+      The deltas since the last reset always add up to the closing ANSWER
+      (which is stripped of surrounding whitespace).
     * Tool execution details (TOOL_CALL, SQL, EXECUTING, RESULT, ERROR) come
-      exclusively from `captured_events` populated by execute_sql, avoiding
-      the duplicate events that `on_tool_start` used to produce.
+      exclusively from the run's EventBus, fed by execute_sql, and are
+      yielded as soon as they are published; this avoids the duplicate
+      events that `on_tool_start` used to produce.
     * When the graph emits __interrupt__ (HITL), yields INTERRUPT with proposed_sql and nl_query.
     * Mutates `full_response_parts` so the caller can persist the response.
     """
     token_buffer: list[str] = []
     plan_emitted = False
     saw_interrupt = False
+    # Nesting depth of running tools (subagents run inside the `task` tool).
+    tools_running = 0
+    answer_phase = False
+    deltas_sent = False
+    started = time.perf_counter()
+    first_answer_token_ms: float | None = None
+
+    def answer_started() -> None:
+        nonlocal first_answer_token_ms
+        if first_answer_token_ms is None:
+            first_answer_token_ms = (time.perf_counter() - started) * 1e3
+            logger.info("First answer token | ttfat_ms=%.1f", first_answer_token_ms)
+
+    def reset_answer() -> AgentEvent | None:
+        """ANSWER_RESET if deltas went out since the last reset."""
+        nonlocal answer_phase, deltas_sent
+        answer_phase = False
+        if not deltas_sent:
+            return None
+        deltas_sent = False
+        return AgentEvent(type=EventType.ANSWER_RESET)
+
+    def answer_delta(text: str) -> AgentEvent:
+        nonlocal deltas_sent
+        answer_started()
+        deltas_sent = True
+        return AgentEvent(type=EventType.ANSWER_DELTA, content=text)
+
+    def flush_plan() -> AgentEvent | None:
+        """Buffered tokens as the PLAN (once); later reasoning between tools is discarded."""
+        nonlocal plan_emitted
+        plan = None
+        if token_buffer and not plan_emitted:
+            plan_text = "".join(token_buffer).strip()
+            if plan_text:
+                plan = AgentEvent(type=EventType.PLAN, content=plan_text)
+                plan_emitted = True
+        token_buffer.clear()
+        return plan
+
+    async for source, item in events.merge(graph_stream):
+        if source == "tool":
+            # A tool may publish before its on_tool_start is seen here.
+            if (plan := flush_plan()) is not None:
+                yield plan
+            yield item
+            continue
 
-    async for lc_event in graph_stream:
+        lc_event = item
         kind: str = lc_event.get("event", "")
 
         hitl = _extract_interrupt_payload(lc_event)
@@ -172,6 +228,8 @@ async def stream_agent_events(
                 "HITL interrupt detected | keys=%s",
                 list(hitl.keys()) if isinstance(hitl, dict) else [],
             )
+            if (reset := reset_answer()) is not None:
+                yield reset
             interrupt_evt = _interrupt_to_agent_event(hitl)
             if interrupt_evt is not None:
                 yield interrupt_evt
@@ -185,26 +243,26 @@ async def stream_agent_events(
             if chunk and getattr(chunk, "content", None):
                 token_buffer.append(chunk.content)
                 full_response_parts.append(chunk.content)
+                if answer_phase:
+                    yield answer_delta(chunk.content)
 
         elif kind == "on_tool_start":
+            tools_running += 1
+            if (reset := reset_answer()) is not None:
+                yield reset
             # Flush buffered tokens as PLAN (once) before any tool runs
-            if token_buffer and not plan_emitted:
-                plan_text = "".join(token_buffer).strip()
-                if plan_text:
-                    yield AgentEvent(type=EventType.PLAN, content=plan_text)
-                    plan_emitted = True
-                token_buffer.clear()
-            elif token_buffer:
-                # Intermediate reasoning between tool calls — discard
-                token_buffer.clear()
+            if (plan := flush_plan()) is not None:
+                yield plan
 
             tool_name = lc_event.get("name", "")
             logger.info("Tool call started | tool=%s", tool_name)
 
         elif kind == "on_tool_end":
-            for captured in captured_events:
-                yield captured
-            captured_events.clear()
+            tools_running = max(tools_running - 1, 0)
+            answer_phase = tools_running == 0 and not saw_interrupt
+            if answer_phase and token_buffer:
+                # Tokens buffered inside the tool are part of the ANSWER too.
+                yield answer_delta("".join(token_buffer))
 
         elif kind == "on_chat_model_end":
             text_preview, tool_calls = _extract_model_reply(lc_event)
@@ -222,5 +280,6 @@ async def stream_agent_events(
     if token_buffer and not saw_interrupt:
         answer_text = "".join(token_buffer).strip()
         if answer_text:
+            answer_started()
             yield AgentEvent(type=EventType.ANSWER, content=answer_text)
         token_buffer.clear()
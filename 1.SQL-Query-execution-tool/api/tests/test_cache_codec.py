@@ -0,0 +1,157 @@
+"""
+Tests for the binary result-cache codec: header, compression threshold, legacy JSON reads
+and chunked storage of large results.
+"""
+
+import json
+from decimal import Decimal
+
+import pytest
+
+from src.cache import codec, redis_client
+from src.cache.memory import InMemoryCache
+from src.db.result import ColumnarResult
+
+
+def _result(rows: int) -> ColumnarResult:
+    return ColumnarResult(
+        columns=["id", "name", "amount"],
+        rows=[(i, f"customer-{i}", Decimal("1.25")) for i in range(rows)],
+        truncated=True,
+    )
+
+
+def test_small_results_are_not_compressed() -> None:
+    blob = codec.encode(_result(1), min_compress_bytes=1024)
+    assert blob[:4] == codec.MAGIC + bytes((codec.VERSION, codec.COMPRESSION_NONE))
+    decoded = codec.decode(blob)
+    assert decoded.rows == [(0, "customer-0", 1.25)]
+    assert decoded.truncated is True
+
+
+def test_large_results_are_zlib_compressed() -> None:
+    result = _result(2000)
+    blob = codec.encode(result, compression="zlib", min_compress_bytes=1024)
+    assert blob[3] == codec.COMPRESSION_ZLIB
+    assert len(blob) < len(json.dumps(ColumnarResult.records(result), default=str)) / 5
+    assert codec.decode(blob).rows[1999] == (1999, "customer-1999", 1.25)
+
+
+def test_lz4_falls_back_to_zlib_when_not_installed(monkeypatch) -> None:
+    monkeypatch.setattr(codec, "lz4_frame", None)
+    blob = codec.encode(_result(2000), compression="lz4", min_compress_bytes=0)
+    assert blob[3] == codec.COMPRESSION_ZLIB
+    assert codec.decode(blob).row_count == 2000
+
+
+@pytest.mark.parametrize("legacy", [
+    '{"columns": ["id"], "rows": [{"id": 1}], "row_count": 1}',
+    b'{"columns": ["id"], "rows": [[1]], "row_count": 1, "truncated": false}',
+])
+def test_legacy_json_entries_still_decode(legacy) -> None:
+    assert codec.decode(legacy).rows == [(1,)]
+
+
+def test_unknown_version_is_rejected() -> None:
+    blob = codec.MAGIC + bytes((99, codec.COMPRESSION_NONE)) + b"{}"
+    with pytest.raises(ValueError, match="version 99"):
+        codec.decode(blob)
+
+
+@pytest.mark.parametrize("blob", [
+    codec.MAGIC + bytes((codec.VERSION, codec.COMPRESSION_ZLIB)) + b"garbage",
+    codec.MAGIC + bytes((codec.VERSION, codec.COMPRESSION_ZLIB)) + codec.encode(_result(500))[4:40],
+    codec.MAGIC + bytes((codec.VERSION,)),
+], ids=["garbage", "truncated", "short-header"])
+def test_corrupt_blobs_raise_value_error(blob) -> None:
+    with pytest.raises(ValueError):
+        codec.decode(blob)
+
+
+@pytest.mark.asyncio
+async def test_corrupt_entry_is_a_cache_miss(chunked_cache) -> None:
+    key = redis_client.result_key("SELECT 1")
+    await chunked_cache.set(key, codec.MAGIC + bytes((codec.VERSION, codec.COMPRESSION_ZLIB)) + b"garbage")
+    assert await redis_client.get_cached_entry("SELECT 1") is None
+    assert await redis_client.get_cached_page("SELECT 1", offset=0, limit=10) is None
+
+
+@pytest.fixture
+async def chunked_cache(monkeypatch):
+    cache = InMemoryCache(sweep_interval=0)
+    monkeypatch.setattr(redis_client, "_client", cache)
+    monkeypatch.setattr(redis_client, "_l1", None)
+    # Uncompressed, so 100 sample rows (~2.4 KB) make a 100-row chunk.
+    monkeypatch.setattr(redis_client.settings, "result_cache_compression", "none")
+    monkeypatch.setattr(redis_client.settings, "result_cache_chunk_bytes", 2400)
+    yield cache
+    await cache.aclose()
+
+
+@pytest.mark.asyncio
+async def test_large_results_are_stored_in_chunks_under_a_manifest(chunked_cache) -> None:
+    await redis_client.set_cached_result("SELECT * FROM customers", _result(250))
+    key = redis_client.result_key("SELECT * FROM customers")
+    manifest = codec.decode_manifest(await chunked_cache.get(key))
+    assert (manifest["chunk_rows"], manifest["chunks"], manifest["row_count"]) == (100, 3, 250)
+
+    result = await redis_client.get_cached_result("SELECT * FROM customers")
+    assert result.row_count == 250
+    assert result.rows[249] == (249, "customer-249", 1.25)
+    assert result.truncated is True
+
+
+@pytest.mark.asyncio
+async def test_page_reads_only_the_chunks_it_needs(chunked_cache, monkeypatch) -> None:
+    await redis_client.set_cached_result("SELECT * FROM customers", _result(250))
+    read: list[str] = []
+    mget = chunked_cache.mget
+
+    async def tracking_mget(*keys: str):
+        read.extend(keys)
+        return await mget(*keys)
+
+    monkeypatch.setattr(chunked_cache, "mget", tracking_mget)
+    page = await redis_client.get_cached_page("SELECT * FROM customers", offset=90, limit=20)
+    assert [row[0] for row in page.result.rows] == list(range(90, 110))
+    assert page.total_rows == 250
+    assert [k.rsplit(":", 1)[-1] for k in read if ":chunk:" in k] == ["0", "1"]
+
+    tail = await redis_client.get_cached_page("SELECT * FROM customers", offset=240, limit=50)
+    assert [row[0] for row in tail.result.rows] == list(range(240, 250))
+
+
+@pytest.mark.asyncio
+async def test_missing_chunk_is_a_miss_and_invalidation_drops_chunks(chunked_cache) -> None:
+    await redis_client.set_cached_result("SELECT * FROM customers", _result(250))
+    chunk_keys = await redis_client._chunk_keys([redis_client.result_key("SELECT * FROM customers")])
+    assert len(chunk_keys) == 3
+
+    await redis_client.invalidate_table("customers")
+    assert await chunked_cache.exists(*chunk_keys) == 0
+
+    await redis_client.set_cached_result("SELECT * FROM customers", _result(250))
+    key = redis_client.result_key("SELECT * FROM customers")
+    await chunked_cache.delete((await redis_client._chunk_keys([key]))[1])
+    assert await redis_client.get_cached_result("SELECT * FROM customers") is None
+
+
+@pytest.mark.asyncio
+async def test_results_under_the_byte_threshold_are_stored_whole(chunked_cache) -> None:
+    await redis_client.set_cached_result("SELECT * FROM customers", _result(90))
+    key = redis_client.result_key("SELECT * FROM customers")
+    assert not codec.is_manifest(await chunked_cache.get(key))
+
+
+@pytest.mark.asyncio
+async def test_rewrite_gives_old_chunks_a_grace_period(chunked_cache) -> None:
+    await redis_client.set_cached_result("SELECT * FROM customers", _result(250))
+    key = redis_client.result_key("SELECT * FROM customers")
+    old_chunks = await redis_client._chunk_keys([key])
+
+    await redis_client.set_cached_result("SELECT * FROM customers", _result(250))
+    new_chunks = await redis_client._chunk_keys([key])
+    assert set(new_chunks).isdisjoint(old_chunks)
+    grace = redis_client._OLD_CHUNKS_GRACE_SECONDS
+    assert all(0 < ttl <= grace for ttl in [await chunked_cache.ttl(k) for k in old_chunks])
+    assert all(ttl > grace for ttl in [await chunked_cache.ttl(k) for k in new_chunks])
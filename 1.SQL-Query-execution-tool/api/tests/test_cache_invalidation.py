@@ -0,0 +1,82 @@
+"""
+Tests for table tagging of cached results, invalidate_table() and the table version poller.
+"""
+
+import pytest
+
+from src.cache import redis_client
+from src.cache.invalidation import TableVersionPoller
+from src.cache.memory import InMemoryCache
+from src.db.result import ColumnarResult
+
+
+@pytest.fixture
+async def memory_cache(monkeypatch):
+    cache = InMemoryCache(sweep_interval=0)
+    monkeypatch.setattr(redis_client, "_client", cache)
+    monkeypatch.setattr(redis_client, "_l1", None)
+    yield cache
+    await cache.aclose()
+
+
+@pytest.mark.asyncio
+async def test_invalidate_table_drops_only_dependent_entries(memory_cache) -> None:
+    result = ColumnarResult(columns=["n"], rows=[(1,)])
+    await redis_client.set_cached_result("SELECT count(*) FROM orders", result)
+    await redis_client.set_cached_result("SELECT * FROM orders JOIN users ON 1 = 1", result)
+    await redis_client.set_cached_result("SELECT count(*) FROM users", result)
+
+    assert await redis_client.invalidate_table("public.Orders") == 2
+
+    assert await redis_client.get_cached_result("SELECT count(*) FROM orders") is None
+    assert await redis_client.get_cached_result("SELECT * FROM orders JOIN users ON 1 = 1") is None
+    assert await redis_client.get_cached_result("SELECT count(*) FROM users") is not None
+    assert await redis_client.invalidate_table("orders") == 0
+
+
+@pytest.mark.asyncio
+async def test_invalidate_table_is_scoped_to_the_namespace(memory_cache) -> None:
+    result = ColumnarResult(columns=["n"], rows=[(1,)])
+    await redis_client.set_cached_result("SELECT * FROM orders", result, "sales")
+    await redis_client.set_cached_result("SELECT * FROM orders", result, "crm")
+
+    assert await redis_client.invalidate_table("orders", "sales") == 1
+
+    assert await redis_client.get_cached_result("SELECT * FROM orders", "sales") is None
+    assert await redis_client.get_cached_result("SELECT * FROM orders", "crm") is not None
+
+
+class _Adapter:
+    def __init__(self, versions: dict[str, str] | None, cache_namespace: str = "") -> None:
+        self.versions = versions
+        self.cache_namespace = cache_namespace
+
+    async def get_table_versions(self) -> dict[str, str] | None:
+        return self.versions
+
+
+class _Registry:
+    def __init__(self, adapters: dict) -> None:
+        self.adapters = adapters
+
+    def connected(self) -> dict:
+        return self.adapters
+
+
+@pytest.mark.asyncio
+async def test_poller_invalidates_tables_whose_version_moved(memory_cache) -> None:
+    adapter = _Adapter({"orders": "1:0:0", "users": "5:0:0"}, "sales")
+    other = _Adapter({"orders": "1:0:0"}, "crm")
+    poller = TableVersionPoller(
+        _Registry({"default": adapter, "crm": other, "local": _Adapter(None)}), interval=1
+    )
+    result = ColumnarResult(columns=["n"], rows=[(1,)])
+    await redis_client.set_cached_result("SELECT * FROM orders", result, "sales")
+    await redis_client.set_cached_result("SELECT * FROM orders", result, "crm")
+
+    assert await poller.poll() == []  # baseline
+    adapter.versions = {"orders": "9:0:0", "users": "5:0:0"}
+    assert await poller.poll() == ["orders"]
+    assert await redis_client.get_cached_result("SELECT * FROM orders", "sales") is None
+    assert await redis_client.get_cached_result("SELECT * FROM orders", "crm") is not None
+    assert await poller.poll() == []
@@ -0,0 +1,84 @@
+"""
+Tests for stale-while-revalidate: soft-TTL freshness markers, hot-key counting and background refresh.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.cache import redis_client, refresh
+from src.cache.memory import InMemoryCache
+from src.db.result import ColumnarResult
+from src.tools.execute_sql import execute_sql
+
+
+@pytest.fixture
+async def cache(monkeypatch):
+    cache = InMemoryCache(sweep_interval=0)
+    monkeypatch.setattr(redis_client, "_client", cache)
+    monkeypatch.setattr(redis_client, "_l1", None)
+    monkeypatch.setattr(refresh, "_hits", InMemoryCache(sweep_interval=0))
+    monkeypatch.setattr(redis_client.settings, "result_cache_soft_ttl_seconds", 300)
+    monkeypatch.setattr(redis_client.settings, "result_cache_refresh_min_hits", 2)
+    yield cache
+    await cache.aclose()
+
+
+async def _expire_soft_ttl(cache: InMemoryCache, sql: str, namespace: str = "") -> None:
+    await cache.delete(redis_client._fresh_key(redis_client.result_key(sql, namespace)))
+
+
+@pytest.mark.asyncio
+async def test_entry_is_stale_after_soft_ttl_but_still_served(cache) -> None:
+    await redis_client.set_cached_result("SELECT 1", ColumnarResult(columns=["n"], rows=[(1,)]))
+    assert (await redis_client.get_cached_entry("SELECT 1")).stale is False
+
+    await _expire_soft_ttl(cache, "SELECT 1")
+    entry = await redis_client.get_cached_entry("SELECT 1")
+    assert entry.stale is True
+    assert entry.result.rows == [(1,)]
+
+
+@pytest.mark.asyncio
+async def test_only_hot_stale_keys_are_refreshed_once(cache) -> None:
+    calls: list[int] = []
+    release = asyncio.Event()
+
+    async def run() -> ColumnarResult:
+        calls.append(1)
+        await release.wait()
+        result = ColumnarResult(columns=["n"], rows=[(2,)])
+        await redis_client.set_cached_result("SELECT 2", result)
+        return result
+
+    assert await refresh.record_hit("SELECT 2", "", True, run) is False  # not hot yet
+    assert await refresh.record_hit("SELECT 2", "", True, run) is True
+    assert await refresh.record_hit("SELECT 2", "", True, run) is False  # refresh in progress
+    release.set()
+    await asyncio.gather(*refresh._refreshes)
+
+    assert calls == [1]
+    entry = await redis_client.get_cached_entry("SELECT 2")
+    assert entry.stale is False and entry.result.rows == [(2,)]
+    assert await refresh.record_hit("SELECT 2", "", True, run) is True  # lock was released
+    await asyncio.gather(*refresh._refreshes)
+
+
+@pytest.mark.asyncio
+async def test_execute_sql_serves_stale_result_and_refreshes(cache, sqlite_adapter) -> None:
+    sql = "SELECT id FROM test_users ORDER BY id"
+    namespace = sqlite_adapter.cache_namespace
+    await redis_client.set_cached_result(sql, ColumnarResult(columns=["id"], rows=[(99,)]), namespace)
+    await _expire_soft_ttl(cache, sql, namespace)
+
+    for _ in range(2):
+        out = await execute_sql.coroutine(
+            nl_query="ids", sql=sql, adapter=sqlite_adapter, event_bus=[]
+        )
+        assert json.loads(out)["rows"] == [[99]]
+    await asyncio.gather(*refresh._refreshes)
+
+    entry = await redis_client.get_cached_entry(sql, namespace)
+    assert entry.stale is False
+    assert entry.result.rows == [(1,), (2,)]
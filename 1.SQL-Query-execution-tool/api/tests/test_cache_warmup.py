@@ -0,0 +1,74 @@
+"""
+Tests for the query log and result-cache warming from it.
+"""
+
+import pytest
+
+from src.cache import redis_client, warmup
+from src.cache.memory import InMemoryCache
+from src.db.result import ColumnarResult
+from src.tools.execute_sql import execute_sql
+
+
+@pytest.fixture
+async def cache(monkeypatch):
+    cache = InMemoryCache(sweep_interval=0)
+    monkeypatch.setattr(redis_client, "_client", cache)
+    monkeypatch.setattr(redis_client, "_l1", None)
+    yield cache
+    await cache.aclose()
+
+
+async def _log(sql: str, requests: int, runs_ms: list[float], namespace: str = "ns") -> None:
+    for _ in range(requests):
+        await warmup.record_request(sql, namespace)
+    for ms in runs_ms:
+        await warmup.record_execution(sql, namespace, ms)
+
+
+@pytest.mark.asyncio
+async def test_top_queries_rank_by_requests_then_cost(cache) -> None:
+    await _log("SELECT 1", requests=5, runs_ms=[40.0, 60.0])
+    await _log("select  1 ;", requests=1, runs_ms=[])  # same fingerprint as SELECT 1
+    await _log("SELECT 2", requests=6, runs_ms=[10.0])
+    await _log("SELECT 3", requests=6, runs_ms=[5.0])
+    await _log("SELECT slow", requests=50, runs_ms=[9000.0])
+    await _log("SELECT never_run", requests=50, runs_ms=[])
+
+    top = await warmup.top_queries("ns", limit=3, max_avg_ms=1000)
+    assert [(q.sql, q.requests, q.avg_ms) for q in top] == [
+        ("SELECT 3", 6, 5.0),
+        ("SELECT 2", 6, 10.0),
+        ("select  1 ;", 6, 50.0),
+    ]
+    assert await warmup.top_queries("other", limit=3, max_avg_ms=1000) == []
+
+
+@pytest.mark.asyncio
+async def test_execute_sql_logs_requests_and_executions(cache, sqlite_adapter) -> None:
+    for _ in range(2):
+        await execute_sql.coroutine(
+            nl_query="list users",
+            sql="SELECT id FROM test_users",
+            adapter=sqlite_adapter,
+            event_bus=[],
+        )
+    [logged] = await warmup.top_queries(sqlite_adapter.cache_namespace, limit=10, max_avg_ms=60000)
+    assert logged.sql == "SELECT id FROM test_users"
+    assert logged.requests == 2  # the second request was a cache hit
+
+
+@pytest.mark.asyncio
+async def test_warm_cache_runs_uncached_top_queries(cache, sqlite_adapter) -> None:
+    ns = sqlite_adapter.cache_namespace
+    await _log("SELECT id FROM test_users", requests=3, runs_ms=[1.0], namespace=ns)
+    await _log("SELECT name FROM test_users", requests=2, runs_ms=[1.0], namespace=ns)
+    await _log("SELECT * FROM missing_table", requests=1, runs_ms=[1.0], namespace=ns)
+    await redis_client.set_cached_result(
+        "SELECT name FROM test_users", ColumnarResult(["name"], [("alice",), ("bob",)]), ns
+    )
+
+    assert await warmup.warm_cache(sqlite_adapter, limit=10, concurrency=2, max_avg_ms=100) == 1
+    cached = await redis_client.get_cached_result("SELECT id FROM test_users", ns)
+    assert cached.rows == [(1,), (2,)]
+
@@ -1,8 +1,10 @@
+import asyncio
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from src.api.routes.chat import _resolve_runtime_config
+from src.agent.events import AgentEvent, EventType
+from src.api.routes.chat import _bounded_events, _resolve_runtime_config, settings
 
 
 @pytest.mark.asyncio
@@ -41,3 +43,68 @@ async def test_resolve_runtime_config_allows_explicit_empty_override() -> None:
         assert config["enabled_skills"] == []
         assert config["skill_dirs"] == []
         assert config["mcp_servers"] == []
+
+
+class _FakeRequest:
+    def __init__(self, disconnect_after: int | None = None) -> None:
+        self._polls = 0
+        self._disconnect_after = disconnect_after
+
+    async def is_disconnected(self) -> bool:
+        self._polls += 1
+        return self._disconnect_after is not None and self._polls > self._disconnect_after
+
+
+async def _slow_events(closed: list[bool]):
+    try:
+        yield AgentEvent(type=EventType.THINKING, content="start")
+        await asyncio.sleep(30)
+        yield AgentEvent(type=EventType.DONE)
+    finally:
+        closed.append(True)
+
+
+@pytest.mark.asyncio
+async def test_bounded_events_stops_on_client_disconnect(monkeypatch) -> None:
+    monkeypatch.setattr("src.api.routes.chat._DISCONNECT_POLL_SECONDS", 0.01)
+    closed: list[bool] = []
+    events = [
+        e async for e in _bounded_events(_slow_events(closed), _FakeRequest(disconnect_after=2), "s1")
+    ]
+    assert [e.type for e in events] == [EventType.THINKING]
+    assert closed == [True]
+
+
+@pytest.mark.asyncio
+async def test_bounded_events_emits_error_on_deadline(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "deepagent_timeout_seconds", 0.1)
+    closed: list[bool] = []
+    events = [e async for e in _bounded_events(_slow_events(closed), _FakeRequest(), "s1")]
+    assert [e.type for e in events] == [EventType.THINKING, EventType.ERROR]
+    assert "timed out" in events[-1].content
+    assert closed == [True]
+
+
+@pytest.mark.asyncio
+async def test_bounded_events_runs_the_agent_in_one_task() -> None:
+    """Context bound by the agent before a yield is still set after it."""
+    import contextvars
+
+    bound = contextvars.ContextVar("bound", default=None)
+    tasks = []
+
+    async def agent_events():
+        bound.set("run-1")
+        tasks.append(asyncio.current_task())
+        yield AgentEvent(type=EventType.THINKING, content=bound.get())
+        await asyncio.sleep(0)
+        tasks.append(asyncio.current_task())
+        yield AgentEvent(type=EventType.ANSWER, content=bound.get())
+        raise RuntimeError("agent failed")
+
+    seen = []
+    with pytest.raises(RuntimeError, match="agent failed"):
+        async for event in _bounded_events(agent_events(), _FakeRequest(), "s1"):
+            seen.append(event.content)
+    assert seen == ["run-1", "run-1"]
+    assert tasks[0] is tasks[1]
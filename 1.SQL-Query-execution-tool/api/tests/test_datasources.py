@@ -0,0 +1,87 @@
+"""
+Tests for DatasourceRegistry: lazy connect, idle eviction and the max-connected cap.
+"""
+
+import pytest
+
+from src.db.adapters.factory import DEFAULT_DATASOURCE, DatasourceRegistry
+
+
+@pytest.fixture
+def registry(tmp_path) -> DatasourceRegistry:
+    configs = {
+        name: {"db_type": "sqlite", "dsn": f"sqlite+aiosqlite:///{tmp_path / name}.db"}
+        for name in (DEFAULT_DATASOURCE, "sales", "ops")
+    }
+    return DatasourceRegistry(configs, idle_seconds=60, max_connected=2)
+
+
+@pytest.mark.asyncio
+async def test_get_does_not_connect_until_acquire(registry) -> None:
+    adapter = registry.get("sales")
+    assert registry.status()["sales"]["connected"] is False
+    assert await registry.acquire("sales") is adapter
+    assert registry.status()["sales"]["connected"] is True
+    assert (await adapter.execute_query("SELECT 1 AS one")).rows == [(1,)]
+    await registry.close_all()
+
+
+@pytest.mark.asyncio
+async def test_unknown_datasource_raises(registry) -> None:
+    with pytest.raises(ValueError, match="Unknown datasource 'nope'"):
+        registry.get("nope")
+
+
+@pytest.mark.asyncio
+async def test_idle_datasources_are_evicted_and_reconnect(registry, monkeypatch) -> None:
+    await registry.acquire()
+    adapter = await registry.acquire("sales")
+    now = registry._last_used["sales"]
+    monkeypatch.setattr("src.db.adapters.factory.time.monotonic", lambda: now + 120)
+
+    # The default datasource is never evicted.
+    assert await registry.evict_idle() == ["sales"]
+    assert registry.status()[DEFAULT_DATASOURCE]["connected"] is True
+
+    # The same adapter instance reconnects on next use.
+    assert await registry.acquire("sales") is adapter
+    assert (await adapter.execute_query("SELECT 1 AS one")).rows == [(1,)]
+    await registry.close_all()
+
+
+@pytest.mark.asyncio
+async def test_max_connected_evicts_least_recently_used(registry) -> None:
+    await registry.acquire()
+    await registry.acquire("sales")
+    await registry.acquire("ops")
+    connected = {ds for ds, s in registry.status().items() if s["connected"]}
+    assert connected == {DEFAULT_DATASOURCE, "ops"}
+    await registry.close_all()
+
+
+@pytest.mark.asyncio
+async def test_leased_datasources_are_not_evicted(registry, monkeypatch) -> None:
+    adapter = await registry.acquire("sales")
+    now = registry._last_used["sales"]
+    async with registry.hold(adapter):
+        monkeypatch.setattr("src.db.adapters.factory.time.monotonic", lambda: now + 120)
+        assert await registry.evict_idle() == []
+        await registry.acquire("ops")
+        await registry.acquire()  # over max_connected: "ops" goes, not the leased "sales"
+        assert registry.status()["sales"] == {"db_type": "sqlite", "connected": True, "leases": 1, "idle_seconds": 120.0}
+        assert (await adapter.execute_query("SELECT 1 AS one")).rows == [(1,)]
+
+    # Released: idle again from now on.
+    assert registry.status()["sales"]["leases"] == 0
+    monkeypatch.setattr("src.db.adapters.factory.time.monotonic", lambda: now + 240)
+    assert await registry.evict_idle() == ["sales"]
+    await registry.close_all()
+
+
+@pytest.mark.asyncio
+async def test_hold_reconnects_an_evicted_datasource(registry) -> None:
+    adapter = await registry.acquire("sales")
+    await registry._disconnect("sales", reason="idle")
+    async with registry.hold(adapter):
+        assert (await adapter.execute_query("SELECT 1 AS one")).rows == [(1,)]
+    await registry.close_all()
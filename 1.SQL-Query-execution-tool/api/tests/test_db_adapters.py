@@ -2,6 +2,9 @@
 Tests for DatabaseAdapter (SQLite in-memory): execute_query, get_tables, get_columns.
 """
 
+import asyncio
+import time
+
 import pytest
 from src.db.adapters.sqlite import SQLiteAdapter
 
@@ -9,11 +12,10 @@ from src.db.adapters.sqlite import SQLiteAdapter
 @pytest.mark.asyncio
 async def test_execute_query_returns_columns_and_rows(sqlite_adapter) -> None:
     result = await sqlite_adapter.execute_query("SELECT id, name FROM test_users ORDER BY id")
-    assert result["columns"] == ["id", "name"]
-    assert result["row_count"] == 2
-    assert len(result["rows"]) == 2
-    assert result["rows"][0]["name"] == "alice"
-    assert result["rows"][1]["name"] == "bob"
+    assert result.columns == ["id", "name"]
+    assert result.row_count == 2
+    assert result.rows == [(1, "alice"), (2, "bob")]
+    assert result.records()[1]["name"] == "bob"
 
 
 @pytest.mark.asyncio
@@ -47,3 +49,97 @@ async def test_ping(sqlite_adapter) -> None:
 @pytest.mark.asyncio
 async def test_dialect(sqlite_adapter) -> None:
     assert sqlite_adapter.dialect == "sqlite"
+
+
+@pytest.mark.asyncio
+async def test_execute_query_stream_yields_batches(sqlite_adapter) -> None:
+    batches = [
+        b async for b in sqlite_adapter.execute_query_stream(
+            "SELECT id, name FROM test_users ORDER BY id", batch_size=1
+        )
+    ]
+    assert len(batches) == 2
+    assert all(b.columns == ["id", "name"] for b in batches)
+    assert [b.rows[0][1] for b in batches] == ["alice", "bob"]
+
+
+@pytest.mark.asyncio
+async def test_execute_query_stream_empty_result_yields_columns(sqlite_adapter) -> None:
+    batches = [
+        b async for b in sqlite_adapter.execute_query_stream(
+            "SELECT id, name FROM test_users WHERE id < 0"
+        )
+    ]
+    assert len(batches) == 1
+    assert batches[0].columns == ["id", "name"]
+    assert batches[0].row_count == 0
+
+
+@pytest.mark.asyncio
+async def test_execute_query_stream_raw_path_matches_sqlalchemy_path(sqlite_adapter, monkeypatch) -> None:
+    from src.db.adapters.base import DatabaseAdapter
+
+    sql = "SELECT id, name FROM test_users ORDER BY id"
+    raw = [b async for b in sqlite_adapter.execute_query_stream(sql, batch_size=1)]
+    monkeypatch.setattr(
+        sqlite_adapter, "_stream_batches", DatabaseAdapter._stream_batches.__get__(sqlite_adapter)
+    )
+    generic = [b async for b in sqlite_adapter.execute_query_stream(sql, batch_size=1)]
+    assert raw == generic
+    assert raw[0].rows == [(1, "alice")]
+
+
+@pytest.mark.asyncio
+async def test_execute_query_stream_select_only(sqlite_adapter) -> None:
+    with pytest.raises(ValueError, match="Potentially unsafe SQL detected"):
+        async for _ in sqlite_adapter.execute_query_stream("DELETE FROM test_users"):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_get_schema_snapshot_matches_per_table_calls(sqlite_adapter) -> None:
+    from sqlalchemy import text
+
+    async with sqlite_adapter._engine.begin() as conn:
+        await conn.execute(text(
+            "CREATE TABLE test_orders (id INTEGER PRIMARY KEY, "
+            "user_id INTEGER NOT NULL REFERENCES test_users(id), note TEXT)"
+        ))
+    snapshot = await sqlite_adapter.get_schema_snapshot()
+    assert list(snapshot) == await sqlite_adapter.get_tables()
+    for table, entry in snapshot.items():
+        assert entry["columns"] == await sqlite_adapter.get_columns(table)
+        assert entry["foreign_keys"] == await sqlite_adapter.get_foreign_keys(table)
+    assert snapshot["test_orders"]["foreign_keys"] == [
+        {"column": "user_id", "foreign_table": "test_users", "foreign_column": "id"}
+    ]
+
+
+_SLOW_SQL = (
+    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) "
+    "SELECT count(*) FROM n"
+)
+
+
+@pytest.mark.asyncio
+async def test_execute_query_statement_timeout_interrupts(sqlite_adapter) -> None:
+    started = time.monotonic()
+    with pytest.raises(Exception, match="interrupted"):
+        await sqlite_adapter.execute_query(_SLOW_SQL, timeout=0.2)
+    assert time.monotonic() - started < 5
+    # The connection is usable again once the handler is cleared.
+    result = await sqlite_adapter.execute_query("SELECT count(*) FROM test_users")
+    assert result.rows == [(2,)]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_query_is_aborted_in_database(sqlite_adapter) -> None:
+    task = asyncio.create_task(sqlite_adapter.execute_query(_SLOW_SQL))
+    await asyncio.sleep(0.2)
+    task.cancel()
+    started = time.monotonic()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert time.monotonic() - started < 5
+    result = await sqlite_adapter.execute_query("SELECT count(*) FROM test_users")
+    assert result.rows == [(2,)]
@@ -0,0 +1,93 @@
+"""
+Tests for ReplicaRoutedAdapter: read routing, failover and catalog pinning (SQLite files).
+"""
+
+from contextlib import aclosing
+
+import pytest
+from sqlalchemy import text
+
+from src.db.adapters.replicas import ReplicaRoutedAdapter
+from src.db.adapters.sqlite import SQLiteAdapter
+
+
+async def _make_node(path, label: str, extra_table: str | None = None) -> SQLiteAdapter:
+    adapter = SQLiteAdapter(dsn=f"sqlite+aiosqlite:///{path}")
+    await adapter.connect()
+    async with adapter._engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE node (label TEXT)"))
+        await conn.execute(text("INSERT INTO node VALUES (:label)"), {"label": label})
+        if extra_table:
+            await conn.execute(text(f"CREATE TABLE {extra_table} (id INTEGER)"))
+    return adapter
+
+
+@pytest.fixture
+async def routed(tmp_path):
+    primary = await _make_node(tmp_path / "primary.db", "primary", extra_table="only_on_primary")
+    replica = await _make_node(tmp_path / "replica.db", "replica")
+    adapter = ReplicaRoutedAdapter(primary, [replica], health_interval=0)
+    await adapter.connect()
+    yield adapter
+    await adapter.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_healthy_replica(routed) -> None:
+    result = await routed.execute_query("SELECT label FROM node")
+    assert result.rows == [("replica",)]
+    batches = [b async for b in routed.execute_query_stream("SELECT label FROM node")]
+    assert batches[0].rows == [("replica",)]
+    assert routed.replica_status()[0]["healthy"] is True
+
+
+@pytest.mark.asyncio
+async def test_catalog_is_pinned_to_primary(routed) -> None:
+    assert "only_on_primary" in await routed.get_tables()
+    assert "only_on_primary" in await routed.get_schema_snapshot()
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_replica_falls_back_to_primary(routed) -> None:
+    replica = routed._nodes[0].adapter
+    await replica.disconnect()
+    await routed.check_replicas()
+    assert routed.replica_status()[0]["healthy"] is False
+    result = await routed.execute_query("SELECT label FROM node")
+    assert result.rows == [("primary",)]
+
+
+@pytest.mark.asyncio
+async def test_sql_errors_on_replica_are_not_retried(routed) -> None:
+    with pytest.raises(Exception, match="no such table"):
+        await routed.execute_query("SELECT * FROM only_on_primary")
+    with pytest.raises(ValueError):
+        await routed.execute_query("DELETE FROM node")
+
+
+@pytest.mark.asyncio
+async def test_primary_fallback_stream_is_closed_early(routed, monkeypatch) -> None:
+    closed = []
+
+    async def unreachable(sql, batch_size=500, timeout=None):
+        raise ConnectionError("replica down")
+        yield
+
+    primary_stream = routed._primary.execute_query_stream
+
+    async def tracked(sql, batch_size=500, timeout=None):
+        try:
+            async with aclosing(primary_stream(sql, batch_size, timeout=timeout)) as batches:
+                async for batch in batches:
+                    yield batch
+        finally:
+            closed.append(True)
+
+    monkeypatch.setattr(routed._nodes[0].adapter, "execute_query_stream", unreachable)
+    monkeypatch.setattr(routed._primary, "execute_query_stream", tracked)
+    stream = routed.execute_query_stream("SELECT label FROM node")
+    batch = await stream.__anext__()
+    assert batch.rows == [("primary",)]
+    await stream.aclose()
+    assert closed == [True]
+    assert routed.replica_status()[0]["healthy"] is False
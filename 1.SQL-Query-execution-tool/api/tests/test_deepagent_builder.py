@@ -1,24 +1,28 @@
 """
-Tests for deepagent_builder: supervisor graph gets schema tool + enabled skill tools.
+Tests for deepagent_builder: supervisor graph gets schema tool + enabled skill tools,
+and compiled graphs are cached per configuration.
 """
 
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from src.agent.deepagent_builder import build_supervisor_graph
+from src.agent import deepagent_builder
+from src.agent.deepagent_builder import build_supervisor_graph, get_supervisor_graph
+from src.agent.event_bus import EventBus
+from src.agent.run_context import RunContext, bind_run
 from src.skills.registry import SkillTarget, get_tools_for_target
 
 
 @pytest.fixture
 def mock_deps() -> tuple[MagicMock, MagicMock, list, MagicMock]:
-    """Minimal mocks for adapter, semantic_layer, captured_events, checkpointer."""
+    """Minimal mocks for adapter, semantic_layer, event bus, checkpointer."""
     adapter = MagicMock()
     adapter.dialect = "postgresql"
     semantic_layer = MagicMock()
-    captured_events: list = []
+    event_bus: list = []
     checkpointer = MagicMock()
-    return adapter, semantic_layer, captured_events, checkpointer
+    return adapter, semantic_layer, event_bus, checkpointer
 
 
 @patch("src.agent.deepagent_builder.get_llm")
@@ -27,13 +31,13 @@ def test_build_supervisor_graph_includes_schema_tool(
 ) -> None:
     """Without enabled skills, tools should contain at least the schema tool."""
     m_llm.return_value = MagicMock()
-    adapter, semantic_layer, captured_events, checkpointer = mock_deps
+    adapter, semantic_layer, event_bus, checkpointer = mock_deps
     with patch("src.agent.deepagent_builder.get_settings") as m_get:
         m_get.return_value.enabled_skills = []
         m_get.return_value.model_switch_enabled = False
         with patch("src.agent.deepagent_builder.create_deep_agent") as m_create:
             m_create.return_value = MagicMock()
-            build_supervisor_graph(adapter, semantic_layer, captured_events, checkpointer)
+            build_supervisor_graph(adapter.dialect, checkpointer)
             m_create.assert_called_once()
             call_kw = m_create.call_args[1]
             tools = call_kw["tools"]
@@ -46,7 +50,7 @@ def test_build_supervisor_graph_includes_enabled_skill_tools(
 ) -> None:
     """With enabled_skills=['export_csv'], tools should include schema + export_csv tool."""
     m_llm.return_value = MagicMock()
-    adapter, semantic_layer, captured_events, checkpointer = mock_deps
+    adapter, semantic_layer, event_bus, checkpointer = mock_deps
     skill_tools = get_tools_for_target(["export_csv"], SkillTarget.SUPERVISOR)
     assert len(skill_tools) >= 1, "export_csv skill should be registered and provide at least one tool"
     with patch("src.agent.deepagent_builder.get_settings") as m_get:
@@ -54,7 +58,7 @@ def test_build_supervisor_graph_includes_enabled_skill_tools(
         m_get.return_value.model_switch_enabled = False
         with patch("src.agent.deepagent_builder.create_deep_agent") as m_create:
             m_create.return_value = MagicMock()
-            build_supervisor_graph(adapter, semantic_layer, captured_events, checkpointer)
+            build_supervisor_graph(adapter.dialect, checkpointer)
             call_kw = m_create.call_args[1]
             tools = call_kw["tools"]
             assert len(tools) >= 2, "Should have get_schema_context plus at least one skill tool"
@@ -68,7 +72,7 @@ def test_build_supervisor_graph_injects_skill_docs_into_prompt(
     from src.skills.skill_loader import SkillDoc
 
     m_llm.return_value = MagicMock()
-    adapter, semantic_layer, captured_events, checkpointer = mock_deps
+    adapter, semantic_layer, event_bus, checkpointer = mock_deps
     fake_doc = SkillDoc(
         path="/fake/path/SKILL.md",
         title="Test Skill",
@@ -81,7 +85,7 @@ def test_build_supervisor_graph_injects_skill_docs_into_prompt(
         with patch("src.agent.deepagent_builder.load_skills_from_dirs", return_value=[fake_doc]):
             with patch("src.agent.deepagent_builder.create_deep_agent") as m_create:
                 m_create.return_value = MagicMock()
-                build_supervisor_graph(adapter, semantic_layer, captured_events, checkpointer)
+                build_supervisor_graph(adapter.dialect, checkpointer)
                 call_kw = m_create.call_args[1]
                 prompt = call_kw["system_prompt"]
                 assert "Use this skill to test prompt injection" in prompt
@@ -94,7 +98,7 @@ def test_build_supervisor_graph_includes_mcp_tools_when_returned(
 ) -> None:
     """When get_mcp_tools_for_supervisor returns tools, they are included in the graph."""
     m_llm.return_value = MagicMock()
-    adapter, semantic_layer, captured_events, checkpointer = mock_deps
+    adapter, semantic_layer, event_bus, checkpointer = mock_deps
     mock_mcp_tool = MagicMock()
     mock_mcp_tool.name = "mcp_echo"
     with patch("src.agent.deepagent_builder.get_settings") as m_get:
@@ -105,7 +109,7 @@ def test_build_supervisor_graph_includes_mcp_tools_when_returned(
             m_mcp.return_value = [mock_mcp_tool]
             with patch("src.agent.deepagent_builder.create_deep_agent") as m_create:
                 m_create.return_value = MagicMock()
-                build_supervisor_graph(adapter, semantic_layer, captured_events, checkpointer)
+                build_supervisor_graph(adapter.dialect, checkpointer)
                 call_kw = m_create.call_args[1]
                 tools = call_kw["tools"]
                 tool_names = [getattr(t, "name", None) for t in tools]
@@ -117,7 +121,7 @@ def test_build_supervisor_graph_adds_model_switch_middleware_when_enabled(
     m_llm: MagicMock, mock_deps: tuple
 ) -> None:
     m_llm.return_value = MagicMock()
-    adapter, semantic_layer, captured_events, checkpointer = mock_deps
+    adapter, semantic_layer, event_bus, checkpointer = mock_deps
     with patch("src.agent.deepagent_builder.get_settings") as m_get:
         m_get.return_value.enabled_skills = []
         m_get.return_value.skill_dirs = []
@@ -127,7 +131,56 @@ def test_build_supervisor_graph_adds_model_switch_middleware_when_enabled(
                 m_mw.return_value = MagicMock()
                 with patch("src.agent.deepagent_builder.create_deep_agent") as m_create:
                     m_create.return_value = MagicMock()
-                    build_supervisor_graph(adapter, semantic_layer, captured_events, checkpointer)
+                    build_supervisor_graph(adapter.dialect, checkpointer)
                     call_kw = m_create.call_args[1]
                     assert "middleware" in call_kw
                     assert len(call_kw["middleware"]) == 1
+
+
+@pytest.fixture
+def graph_cache(monkeypatch):
+    deepagent_builder.clear_graph_cache()
+    monkeypatch.setattr(deepagent_builder.get_settings(), "agent_graph_cache_size", 2)
+    with patch("src.agent.deepagent_builder.build_supervisor_graph", side_effect=lambda *a: MagicMock()) as m_build:
+        yield m_build
+    deepagent_builder.clear_graph_cache()
+
+
+def test_graph_cache_reuses_graph_for_equivalent_config(graph_cache: MagicMock) -> None:
+    checkpointer = MagicMock()
+    first = get_supervisor_graph("postgresql", checkpointer, {"enabled_skills": ["a", "b"], "mcp_servers": []})
+    again = get_supervisor_graph("postgresql", checkpointer, {"enabled_skills": ["b", "a"], "skill_dirs": []})
+    assert again is first
+    assert graph_cache.call_count == 1
+
+    assert get_supervisor_graph("mysql", checkpointer, {"enabled_skills": ["a", "b"]}) is not first
+    assert get_supervisor_graph("postgresql", checkpointer, {"enabled_skills": ["a"]}) is not first
+    assert graph_cache.call_count == 3
+    # Size 2: the least recently used graph was evicted.
+    get_supervisor_graph("postgresql", checkpointer, {"enabled_skills": ["a", "b"]})
+    assert graph_cache.call_count == 4
+
+
+def test_graph_cache_keys_on_model_settings(graph_cache: MagicMock, monkeypatch) -> None:
+    checkpointer = MagicMock()
+    first = get_supervisor_graph("postgresql", checkpointer, {})
+    monkeypatch.setattr(deepagent_builder.get_settings(), "llm_model", "another-model")
+    assert get_supervisor_graph("postgresql", checkpointer, {}) is not first
+
+
+@pytest.mark.asyncio
+async def test_cached_graph_tools_use_the_bound_run() -> None:
+    """The schema tool of a shared graph reads the semantic layer of the current run."""
+    from unittest.mock import AsyncMock
+
+    with patch("src.agent.deepagent_builder.get_llm"), \
+         patch("src.agent.deepagent_builder.get_mcp_tools_for_supervisor", return_value=[]), \
+         patch("src.agent.deepagent_builder.create_deep_agent") as m_create:
+        build_supervisor_graph("postgresql", MagicMock(), {})
+    schema_tool = m_create.call_args[1]["tools"][0]
+
+    for text in ("schema one", "schema two"):
+        layer = MagicMock()
+        layer.build_prompt_context = AsyncMock(return_value=text)
+        bind_run(RunContext(MagicMock(), layer, EventBus()))
+        assert await schema_tool() == text
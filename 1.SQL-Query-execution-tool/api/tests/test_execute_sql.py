@@ -0,0 +1,124 @@
+"""
+Tests for the execute_sql tool: bounded streaming and cache interaction.
+"""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.agent.events import EventType
+from src.tools.execute_sql import _fetch_bounded, execute_sql, read_result_page
+
+
+@pytest.fixture
+def no_cache():
+    with patch("src.tools.execute_sql.get_cached_entry", new_callable=AsyncMock) as get_mock, \
+         patch("src.tools.execute_sql.set_cached_result", new_callable=AsyncMock) as set_mock:
+        get_mock.return_value = None
+        yield set_mock
+
+
+@pytest.mark.asyncio
+async def test_fetch_bounded_truncates_at_max_rows(sqlite_adapter) -> None:
+    result = await _fetch_bounded(
+        sqlite_adapter, "SELECT id, name FROM test_users ORDER BY id", batch_size=1, max_rows=1
+    )
+    assert result.columns == ["id", "name"]
+    assert result.row_count == 1
+    assert result.rows == [(1, "alice")]
+    assert result.truncated is True
+
+
+@pytest.mark.asyncio
+async def test_fetch_bounded_exact_fit_is_not_truncated(sqlite_adapter) -> None:
+    result = await _fetch_bounded(
+        sqlite_adapter, "SELECT id FROM test_users", batch_size=1, max_rows=2
+    )
+    assert result.row_count == 2
+    assert result.truncated is False
+
+
+@pytest.mark.asyncio
+async def test_execute_sql_emits_result_and_caches(sqlite_adapter, no_cache) -> None:
+    events: list = []
+    out = await execute_sql.coroutine(
+        nl_query="list users",
+        sql="```sql\nSELECT id, name FROM test_users ORDER BY id\n```",
+        adapter=sqlite_adapter,
+        event_bus=events,
+    )
+    payload = json.loads(out)
+    assert payload["error"] is None
+    assert payload["row_count"] == 2
+    assert payload["truncated"] is False
+    assert payload["columns"] == ["id", "name"]
+    assert payload["rows"] == [[1, "alice"], [2, "bob"]]
+    result_events = [e for e in events if e.type == EventType.RESULT]
+    assert len(result_events) == 1
+    assert result_events[0].row_count == 2
+    no_cache.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_execute_sql_stores_large_results_in_chunks(sqlite_adapter, monkeypatch) -> None:
+    from sqlalchemy import text
+    from src.cache import codec, redis_client
+    from src.cache.memory import InMemoryCache
+
+    cache = InMemoryCache(sweep_interval=0)
+    monkeypatch.setattr(redis_client, "_client", cache)
+    monkeypatch.setattr(redis_client, "_l1", None)
+    monkeypatch.setattr(redis_client.settings, "result_cache_chunk_bytes", 512)
+    async with sqlite_adapter._engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE events (id INTEGER PRIMARY KEY)"))
+        await conn.execute(text("INSERT INTO events (id) VALUES (:id)"), [{"id": i} for i in range(600)])
+
+    sql = "SELECT id FROM events ORDER BY id"
+    out = json.loads(await execute_sql.coroutine(
+        nl_query="list events", sql=sql, adapter=sqlite_adapter, event_bus=[]
+    ))
+    assert out["row_count"] == 600
+
+    namespace = sqlite_adapter.cache_namespace
+    stored = await cache.get(redis_client.result_key(sql, namespace))
+    assert codec.is_manifest(stored)
+    assert codec.decode_manifest(stored)["chunks"] > 1
+    page = await redis_client.get_cached_page(sql, offset=390, limit=20, namespace=namespace)
+    assert [row[0] for row in page.result.rows] == list(range(390, 410))
+    await cache.aclose()
+
+
+@pytest.mark.asyncio
+async def test_llm_gets_the_first_page_and_reads_the_next_from_the_cache(
+    sqlite_adapter, monkeypatch
+) -> None:
+    from sqlalchemy import text
+    from src.cache import redis_client
+    from src.cache.memory import InMemoryCache
+    from src.tools import execute_sql as execute_sql_module
+
+    cache = InMemoryCache(sweep_interval=0)
+    monkeypatch.setattr(redis_client, "_client", cache)
+    monkeypatch.setattr(redis_client, "_l1", None)
+    monkeypatch.setattr(execute_sql_module.settings, "sql_llm_page_rows", 100)
+    async with sqlite_adapter._engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE events (id INTEGER PRIMARY KEY)"))
+        await conn.execute(text("INSERT INTO events (id) VALUES (:id)"), [{"id": i} for i in range(250)])
+
+    sql = "SELECT id FROM events ORDER BY id"
+    events: list = []
+    first = json.loads(await execute_sql.coroutine(
+        nl_query="list events", sql=sql, adapter=sqlite_adapter, event_bus=events
+    ))
+    assert (first["row_count"], first["total_rows"], first["next_offset"]) == (100, 250, 100)
+    assert [e.row_count for e in events if e.type == EventType.RESULT] == [250]
+
+    second = json.loads(await read_result_page.coroutine(sql=sql, offset=200, adapter=sqlite_adapter))
+    assert [row[0] for row in second["rows"]] == list(range(200, 250))
+    assert second["next_offset"] is None
+
+    await cache.delete(redis_client.result_key(sql, sqlite_adapter.cache_namespace))
+    gone = json.loads(await read_result_page.coroutine(sql=sql, offset=100, adapter=sqlite_adapter))
+    assert gone["error"]
+    await cache.aclose()
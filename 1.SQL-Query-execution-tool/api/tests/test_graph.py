@@ -13,7 +13,8 @@ import asyncio
 import pytest
 
 from src.agent.deepagent_builder import build_supervisor_graph
-from src.agent.events import AgentEvent
+from src.agent.event_bus import EventBus
+from src.agent.run_context import RunContext, bind_run
 from src.db.adapters import get_adapter
 from src.semantic.layer import SemanticLayer
 from langgraph.checkpoint.memory import InMemorySaver
@@ -32,10 +33,10 @@ async def adapter():
 async def test_build_supervisor_graph(adapter):
     """Verify that the supervisor graph compiles without errors."""
     sem = SemanticLayer(adapter)
-    events: list[AgentEvent] = []
+    events = EventBus()
     ckpt = InMemorySaver()
 
-    graph = build_supervisor_graph(adapter, sem, events, ckpt)
+    graph = build_supervisor_graph(adapter.dialect, ckpt)
 
     assert graph is not None
     assert hasattr(graph, "astream_events")
@@ -45,10 +46,11 @@ async def test_build_supervisor_graph(adapter):
 async def test_graph_end_to_end(adapter):
     """Run a simple query through the graph and verify streaming output."""
     sem = SemanticLayer(adapter)
-    events: list[AgentEvent] = []
+    events = EventBus()
     ckpt = InMemorySaver()
 
-    graph = build_supervisor_graph(adapter, sem, events, ckpt)
+    bind_run(RunContext(adapter, sem, events))
+    graph = build_supervisor_graph(adapter.dialect, ckpt)
     config = {"configurable": {"thread_id": "test-123"}}
     inp = {"messages": [
         {"role": "user", "content": "Show me all departments"}]}
@@ -0,0 +1,44 @@
+"""
+Tests for the LLM client registry: shared clients per parameters and a shared HTTP pool.
+"""
+
+import pytest
+
+pytest.importorskip("langchain_openai", reason="langchain-openai not installed")
+
+from src.llm import llm_factory
+from src.llm.llm_factory import close_llm_clients, get_llm
+
+
+@pytest.fixture
+async def openai_settings(monkeypatch):
+    monkeypatch.setattr(llm_factory.settings, "llm_provider", "openai")
+    monkeypatch.setattr(llm_factory.settings, "llm_api_key", "sk-test")
+    monkeypatch.setattr(llm_factory.settings, "llm_model", "gpt-4o")
+    await close_llm_clients()
+    yield
+    await close_llm_clients()
+
+
+@pytest.mark.asyncio
+async def test_same_parameters_share_one_client(openai_settings) -> None:
+    assert get_llm() is get_llm()
+    assert get_llm(model="gpt-4o") is get_llm()
+    assert get_llm(model="gpt-4o-mini") is not get_llm()
+
+
+@pytest.mark.asyncio
+async def test_clients_share_the_http_pool(openai_settings) -> None:
+    main, light = get_llm(), get_llm(model="gpt-4o-mini")
+    assert main.http_async_client is light.http_async_client
+    assert main.http_client is light.http_client
+    assert main.http_async_client is llm_factory._http_async_client
+
+
+@pytest.mark.asyncio
+async def test_close_drops_clients_and_pools(openai_settings) -> None:
+    first = get_llm()
+    pool = first.http_async_client
+    await close_llm_clients()
+    assert pool.is_closed
+    assert get_llm() is not first
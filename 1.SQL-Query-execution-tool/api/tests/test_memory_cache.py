@@ -0,0 +1,118 @@
+"""
+Tests for InMemoryCache: TTL expiry, LRU eviction under the byte budget, sweeps and stats.
+"""
+
+import pytest
+
+from src.cache import memory
+from src.cache.memory import InMemoryCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(memory.time, "monotonic", clock)
+    return clock
+
+
+@pytest.mark.asyncio
+async def test_setex_expires(clock) -> None:
+    cache = InMemoryCache(sweep_interval=0)
+    await cache.setex("k", 10, "v")
+    assert await cache.get("k") == "v"
+    clock.now += 11
+    assert await cache.get("k") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["bytes"] == 0
+
+
+@pytest.mark.asyncio
+async def test_set_supports_nx_and_px(clock) -> None:
+    cache = InMemoryCache(sweep_interval=0)
+    assert await cache.set("lock", "a", nx=True, px=500) is True
+    assert await cache.set("lock", "b", nx=True) is None
+    assert await cache.get("lock") == "a"
+    clock.now += 1
+    assert await cache.set("lock", "b", nx=True) is True
+    assert await cache.ttl("lock") == -1
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_under_byte_budget() -> None:
+    cache = InMemoryCache(max_bytes=30, sweep_interval=0)
+    await cache.set("a", "x" * 9)  # 10 bytes each
+    await cache.set("b", "x" * 9)
+    await cache.set("c", "x" * 9)
+    await cache.get("a")  # a is now most recently used
+    await cache.set("d", "x" * 9)
+    assert await cache.exists("a", "b", "c", "d") == 3
+    assert await cache.get("b") is None
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] == 30
+
+
+@pytest.mark.asyncio
+async def test_value_over_budget_is_not_stored() -> None:
+    cache = InMemoryCache(max_bytes=10, sweep_interval=0)
+    await cache.set("small", "v")
+    await cache.set("big", "x" * 100)
+    assert await cache.get("big") is None
+    assert await cache.get("small") == "v"
+
+
+@pytest.mark.asyncio
+async def test_sweep_drops_expired_keys_without_access(clock) -> None:
+    cache = InMemoryCache(sweep_interval=0)
+    await cache.setex("short", 5, "v")
+    await cache.setex("long", 50, "v")
+    await cache.set("forever", "v")
+    clock.now += 10
+    assert cache.sweep() == 1
+    assert cache.stats()["entries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_overwrites_keep_the_expiry_heap_bounded(clock) -> None:
+    cache = InMemoryCache(sweep_interval=0)
+    await cache.setex("other", 1000, "v")
+    for i in range(10_000):
+        clock.now += 0.001
+        await cache.setex("hot", 60, str(i))
+    assert len(cache._expiries) <= 2 * cache.stats()["entries"]
+    clock.now += 100
+    assert cache.sweep() == 1
+    assert await cache.get("other") == "v"
+
+
+@pytest.mark.asyncio
+async def test_stats_hit_ratio_and_getdel() -> None:
+    cache = InMemoryCache(sweep_interval=0)
+    await cache.set("k", "v")
+    await cache.get("k")
+    await cache.get("missing")
+    assert await cache.getdel("k") == "v"
+    assert await cache.delete("k") == 0
+    stats = cache.stats()
+    assert stats["hit_ratio"] == 0.5
+    assert stats["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_set_members_keep_their_expiry(clock) -> None:
+    cache = InMemoryCache(sweep_interval=0)
+    assert await cache.sadd("tag", "a", "b") == 2
+    assert await cache.expire("tag", 10)
+    assert await cache.sadd("tag", "b", "c") == 1
+    assert await cache.smembers("tag") == {"a", "b", "c"}
+    assert await cache.srem("tag", "a", "x") == 1
+    clock.now += 11
+    assert await cache.smembers("tag") == set()
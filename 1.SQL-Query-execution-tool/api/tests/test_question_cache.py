@@ -0,0 +1,131 @@
+"""
+Tests for the question cache: MinHash matching, scoping, invalidation and replay in DeepAgent.run.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.agent.deep_agent import DeepAgent
+from src.agent.events import AgentEvent, EventType
+from src.cache import question_cache, redis_client
+from src.cache.memory import InMemoryCache
+from src.utils import minhash
+
+_EVENTS = [
+    AgentEvent(type=EventType.THINKING, content="Planning..."),
+    AgentEvent(type=EventType.SQL, content="SELECT name FROM public.customers LIMIT 5"),
+    AgentEvent(type=EventType.RESULT, columns=["name"], rows=[["Ann"]], row_count=1),
+    AgentEvent(type=EventType.ANSWER, content="Ann is a customer."),
+]
+
+
+@pytest.fixture
+async def cache(monkeypatch):
+    cache = InMemoryCache(sweep_interval=0)
+    monkeypatch.setattr(redis_client, "_client", cache)
+    monkeypatch.setattr(redis_client, "_l1", None)
+    monkeypatch.setattr(question_cache.settings, "question_cache_enabled", True)
+    monkeypatch.setattr(question_cache.settings, "question_cache_similarity", 0.0)
+    yield cache
+    await cache.aclose()
+
+
+def test_minhash_similarity_tracks_word_overlap() -> None:
+    a = minhash.signature("top 5 customers by revenue last month")
+    b = minhash.signature("Top 5 customers by revenue, last month?")
+    c = minhash.signature("how many orders were cancelled")
+    assert minhash.similarity(a, b) == 1.0
+    assert minhash.similarity(a, c) < 0.2
+    assert len(minhash.lsh_bands(a)) == minhash.BANDS
+    assert minhash.lsh_bands(a) == minhash.lsh_bands(b)
+
+
+@pytest.mark.asyncio
+async def test_exact_question_round_trip_keeps_only_replayable_events(cache) -> None:
+    assert await question_cache.set_cached_answer("s1", "Top 5 customers?", _EVENTS) is True
+
+    events = await question_cache.get_cached_answer("s1", "  top 5 CUSTOMERS ")
+    assert [e.type for e in events] == [EventType.SQL, EventType.RESULT, EventType.ANSWER]
+    assert events[1].rows == [["Ann"]]
+    assert await question_cache.get_cached_answer("s2", "Top 5 customers?") is None
+
+
+@pytest.mark.asyncio
+async def test_runs_without_answer_or_with_errors_are_not_cached(cache) -> None:
+    error = AgentEvent(type=EventType.ERROR, content="boom")
+    assert await question_cache.set_cached_answer("s", "q", _EVENTS[:3]) is False
+    assert await question_cache.set_cached_answer("s", "q", [*_EVENTS, error]) is False
+    assert await question_cache.get_cached_answer("s", "q") is None
+
+
+@pytest.mark.asyncio
+async def test_near_duplicates_match_only_with_identical_numbers(cache, monkeypatch) -> None:
+    question = "show the top 5 customers by total revenue in 2024 please"
+    await question_cache.set_cached_answer("s", question, _EVENTS)
+    rephrased = "please show the top 5 customers by total revenue in 2024"
+
+    assert await question_cache.get_cached_answer("s", rephrased) is None
+    monkeypatch.setattr(question_cache.settings, "question_cache_similarity", 0.6)
+    assert await question_cache.get_cached_answer("s", rephrased) is not None
+    assert await question_cache.get_cached_answer("s", rephrased.replace("5", "10")) is None
+    assert await question_cache.get_cached_answer("s", "how many orders were cancelled") is None
+
+
+@pytest.mark.asyncio
+async def test_operators_and_signs_are_part_of_the_question(cache, monkeypatch) -> None:
+    assert question_cache.normalize_question("Orders with amount>1000?") == "orders with amount > 1000"
+    assert question_cache.normalize_question("growth of -5%") == "growth of -5%"
+    await question_cache.set_cached_answer("s", "orders with amount > 1000", _EVENTS)
+
+    assert await question_cache.get_cached_answer("s", "Orders with amount > 1000?") is not None
+    assert await question_cache.get_cached_answer("s", "orders with amount < 1000") is None
+    monkeypatch.setattr(question_cache.settings, "question_cache_similarity", 0.5)
+    assert await question_cache.get_cached_answer("s", "list orders with amount < 1000") is None
+    assert await question_cache.get_cached_answer("s", "list orders with amount > 1000") is not None
+
+
+@pytest.mark.asyncio
+async def test_table_invalidation_drops_cached_answers(cache) -> None:
+    await question_cache.set_cached_answer("s", "Top 5 customers?", _EVENTS)
+    assert await redis_client.invalidate_table("customers") == 1
+    assert await question_cache.get_cached_answer("s", "Top 5 customers?") is None
+
+
+@pytest.mark.asyncio
+async def test_scope_depends_on_schema_and_runtime_config() -> None:
+    adapter = MagicMock(cache_namespace="ns")
+    adapter.get_schema_fingerprint = AsyncMock(return_value="v1")
+    base = await question_cache.question_scope(adapter, None)
+    assert base == await question_cache.question_scope(adapter, {"enabled_skills": []})
+    assert base != await question_cache.question_scope(adapter, {"enabled_skills": ["csv"]})
+
+    adapter.get_schema_fingerprint = AsyncMock(return_value="v2")
+    assert base != await question_cache.question_scope(adapter, None)
+    adapter.get_schema_fingerprint = AsyncMock(return_value=None)
+    assert await question_cache.question_scope(adapter, None) is None
+
+
+@pytest.mark.asyncio
+async def test_thread_marker_is_consumed_once(cache) -> None:
+    await question_cache.remember_thread("t1", "s", "q")
+    assert await question_cache.recall_thread("t1") == ("s", "q")
+    assert await question_cache.recall_thread("t1") is None
+
+
+@pytest.mark.asyncio
+async def test_run_replays_cached_first_turn_without_building_graph(cache) -> None:
+    adapter = MagicMock(dialect="postgresql", cache_namespace="ns")
+    adapter.get_schema_fingerprint = AsyncMock(return_value="v1")
+    scope = await question_cache.question_scope(adapter, None)
+    await question_cache.set_cached_answer(scope, "Top 5 customers?", _EVENTS)
+
+    agent = DeepAgent(adapter)
+    with patch("src.agent.deep_agent.get_supervisor_graph", side_effect=AssertionError):
+        events = [e async for e in agent.run("top 5 customers", "sess-1")]
+
+    assert [e.type for e in events] == [
+        EventType.THINKING, EventType.SQL, EventType.RESULT, EventType.ANSWER, EventType.DONE,
+    ]
+    history = await redis_client.get_session_history("sess-1")
+    assert history[-1] == {"role": "assistant", "content": "Ann is a customer."}
@@ -0,0 +1,42 @@
+"""
+Tests for ColumnarResult and the RESULT event wire formats.
+"""
+
+import json
+
+from src.agent.events import AgentEvent, EventType, to_wire
+from src.db.result import ColumnarResult
+
+
+def test_payload_round_trip() -> None:
+    result = ColumnarResult(columns=["id", "name"], rows=[(1, "a"), (2, "b")], truncated=True)
+    restored = ColumnarResult.from_payload(json.loads(json.dumps(result.to_payload())))
+    assert restored == result
+    assert restored.row_count == 2
+
+
+def test_from_payload_accepts_legacy_records() -> None:
+    legacy = {"columns": ["id", "name"], "rows": [{"id": 1, "name": "a"}], "row_count": 1}
+    restored = ColumnarResult.from_payload(legacy)
+    assert restored.rows == [(1, "a")]
+    assert restored.truncated is False
+
+
+def test_to_wire_expands_records_by_default() -> None:
+    event = AgentEvent(type=EventType.RESULT, columns=["id", "name"], rows=[(1, "a")], row_count=1)
+    assert to_wire(event)["rows"] == [{"id": 1, "name": "a"}]
+
+
+def test_to_wire_columnar_is_smaller() -> None:
+    columns = [f"column_{i}" for i in range(20)]
+    rows = [tuple(range(20)) for _ in range(200)]
+    event = AgentEvent(type=EventType.RESULT, columns=columns, rows=rows, row_count=len(rows))
+    columnar = json.dumps(to_wire(event, "columnar"))
+    records = json.dumps(to_wire(event, "records"))
+    assert json.loads(columnar)["rows"][0] == list(range(20))
+    assert len(columnar) * 2 < len(records)
+
+
+def test_to_wire_leaves_non_result_events_untouched() -> None:
+    event = AgentEvent(type=EventType.SQL, content="SELECT 1")
+    assert to_wire(event, "columnar") == {"type": EventType.SQL, "content": "SELECT 1"}
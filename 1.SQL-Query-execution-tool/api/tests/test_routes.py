@@ -5,11 +5,13 @@ Requires full API dependencies (deepagents, langchain, etc.) to import main.
 Skip this module if not installed: pytest -k "not test_routes" or install requirements.txt.
 """
 
+import json
+
 import pytest
 
 pytest.importorskip("deepagents", reason="deepagents not installed; skip route tests")
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from fastapi.testclient import TestClient
 
@@ -42,6 +44,7 @@ def mock_adapter_and_redis() -> None:
 
     mock_redis = AsyncMock()
     mock_redis.ping = AsyncMock(return_value=None)
+    mock_redis.get = AsyncMock(return_value=None)
 
     with patch("src.db.adapters.factory.get_adapter", return_value=mock_adapter), \
          patch("src.api.routes.chat.get_redis", new_callable=AsyncMock, return_value=mock_redis), \
@@ -75,6 +78,55 @@ def test_chat_init_returns_stream_url(client: TestClient) -> None:
     assert "/api/chat/stream/" in data["stream_url"]
 
 
+def test_chat_init_rejects_unknown_datasource(client: TestClient) -> None:
+    """POST /api/chat with a datasource that is not configured returns 404."""
+    resp = client.post(
+        "/api/chat",
+        json={"query": "How many users?", "session_id": "s", "datasource": "nope"},
+    )
+    assert resp.status_code == 404
+    assert "Unknown datasource" in resp.json()["detail"]
+
+
+def test_cache_invalidate_by_table(client: TestClient) -> None:
+    """POST /api/cache/invalidate?table=... reports dropped entries per table of one datasource."""
+    with patch("src.api.routes.cache.get_adapter", return_value=MagicMock(cache_namespace="ns")) as get, \
+         patch("src.api.routes.cache.invalidate_table", new_callable=AsyncMock,
+               side_effect=[3, 0]) as invalidate:
+        resp = client.post("/api/cache/invalidate?table=orders&table=users&datasource=sales")
+    assert resp.status_code == 200
+    assert resp.json() == {"invalidated": {"orders": 3, "users": 0}}
+    get.assert_called_once_with("sales")
+    assert [c.args for c in invalidate.await_args_list] == [("orders", "ns"), ("users", "ns")]
+
+
+def test_cache_result_page(client: TestClient) -> None:
+    """GET /api/cache/results pages a cached result; 404 when it is not cached."""
+    from src.cache.redis_client import CachedPage
+    from src.db.result import ColumnarResult
+
+    page = CachedPage(ColumnarResult(["id"], [(5,), (6,)]), offset=5, total_rows=40)
+    with patch("src.api.routes.cache.get_adapter", return_value=MagicMock(cache_namespace="ns")), \
+         patch("src.api.routes.cache.get_cached_page", new_callable=AsyncMock,
+               side_effect=[page, None]) as get_page:
+        resp = client.get("/api/cache/results", params={"sql": "SELECT id FROM t", "offset": 5, "limit": 2})
+        missing = client.get("/api/cache/results", params={"sql": "SELECT 1"})
+    assert resp.status_code == 200
+    assert resp.json()["rows"] == [{"id": 5}, {"id": 6}]
+    assert resp.json()["total_rows"] == 40
+    assert get_page.await_args_list[0].args == ("SELECT id FROM t", 5, 2, "ns")
+    assert missing.status_code == 404
+
+
+def test_stream_already_open_returns_409(client: TestClient) -> None:
+    """GET /api/chat/stream/{id} while another connection holds the claim returns 409."""
+    from src.cache.claims import Claim
+
+    with patch("src.api.routes.chat.claim_first", new_callable=AsyncMock, return_value=Claim(0, None)):
+        resp = client.get("/api/chat/stream/abc")
+    assert resp.status_code == 409
+
+
 def test_chat_init_rejects_empty_query(client: TestClient) -> None:
     """POST /api/chat with empty query returns 422."""
     resp = client.post(
@@ -124,6 +176,36 @@ def test_approve_edit_accepts_edited_sql(client: TestClient) -> None:
     assert "stream_url" in resp.json()
 
 
+def test_approve_rejects_a_datasource_other_than_the_interrupted_one(client: TestClient) -> None:
+    """POST /api/chat/approve naming another datasource than the thread's returns 409."""
+    with patch("src.api.routes.chat.get_redis", new_callable=AsyncMock) as get_redis:
+        get_redis.return_value.get = AsyncMock(return_value="sales")
+        resp = client.post(
+            "/api/chat/approve",
+            json={
+                "thread_id": "thread-abc",
+                "session_id": "sess-1",
+                "action": "approve",
+                "datasource": "default",
+            },
+        )
+    assert resp.status_code == 409
+
+
+def test_approve_resumes_on_the_recorded_datasource(client: TestClient) -> None:
+    """POST /api/chat/approve without a datasource uses the one recorded at the interrupt."""
+    with patch("src.api.routes.chat.get_redis", new_callable=AsyncMock) as get_redis:
+        redis = get_redis.return_value
+        redis.get = AsyncMock(return_value="default")
+        resp = client.post(
+            "/api/chat/approve",
+            json={"thread_id": "thread-abc", "session_id": "sess-1", "action": "approve"},
+        )
+    assert resp.status_code == 200
+    payload = json.loads(redis.setex.await_args.args[2])
+    assert payload["datasource"] == "default"
+
+
 def test_agent_config_get_returns_expected_shape(client: TestClient) -> None:
     resp = client.get("/api/agent-config")
     assert resp.status_code == 200
@@ -0,0 +1,76 @@
+"""
+Tests for relevance-ranked schema pruning (BM25 index and SemanticLayer integration).
+"""
+
+import pytest
+from sqlalchemy import text
+
+from src.semantic import layer as layer_module
+from src.semantic.layer import SemanticLayer
+from src.semantic.models import SemanticColumn, SemanticTable
+from src.semantic.registry import SemanticRegistry
+from src.semantic.retrieval import build_schema_index, tokenize
+
+
+def _columns(*names: str) -> list[dict]:
+    return [{"column": n, "type": "INTEGER", "nullable": "YES", "default": None} for n in names]
+
+
+def _fk(column: str, table: str) -> dict:
+    return {"column": column, "foreign_table": table, "foreign_column": "id"}
+
+
+SNAPSHOT = {
+    "customers": {"columns": _columns("id", "name", "country"), "foreign_keys": []},
+    "orders": {"columns": _columns("id", "customer_id", "total"), "foreign_keys": [_fk("customer_id", "customers")]},
+    "order_items": {"columns": _columns("id", "order_id", "sku"), "foreign_keys": [_fk("order_id", "orders")]},
+    "employees": {"columns": _columns("id", "name", "salary"), "foreign_keys": []},
+    "warehouses": {"columns": _columns("id", "city"), "foreign_keys": []},
+}
+
+
+def test_tokenize_splits_identifiers_and_drops_question_words() -> None:
+    assert tokenize("How many orderItems per customer_id?") == ["order", "item", "customer", "id"]
+
+
+def test_select_ranks_tables_and_adds_referenced_tables() -> None:
+    index = build_schema_index(SNAPSHOT, {})
+    assert index.select("total of orders", top_k=1) == ["orders", "customers"]
+    # order_items references orders but does not match, so it is not pulled in.
+    assert "order_items" not in index.select("total of orders", top_k=1)
+    assert index.select("weather tomorrow", top_k=3) == []
+
+
+def test_select_uses_semantic_descriptions() -> None:
+    staff = SemanticTable(
+        name="employees",
+        display_name="Staff",
+        description="People on the payroll.",
+        columns=[SemanticColumn(name="salary", display_name="Pay", description="Monthly wage.")],
+        common_queries=["Who earns the highest wage?"],
+    )
+    index = build_schema_index(SNAPSHOT, {"employees": staff})
+    assert index.select("average wage of the staff", top_k=1) == ["employees"]
+
+
+@pytest.mark.asyncio
+async def test_build_prompt_context_prunes_large_schemas(sqlite_adapter, monkeypatch) -> None:
+    async with sqlite_adapter._engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE invoices (id INTEGER PRIMARY KEY, user_id INTEGER REFERENCES test_users(id), amount REAL)"))
+        await conn.execute(text("CREATE TABLE shipments (id INTEGER PRIMARY KEY, carrier TEXT)"))
+        await conn.execute(text("CREATE TABLE audit_log (id INTEGER PRIMARY KEY, action TEXT)"))
+    monkeypatch.setattr(layer_module.settings, "schema_prune_top_k", 1)
+    monkeypatch.setattr(layer_module.settings, "schema_prune_min_tables", 3)
+    layer = SemanticLayer(sqlite_adapter, registry=SemanticRegistry())
+
+    full = await layer.build_prompt_context()
+    pruned = await layer.build_prompt_context("total invoice amount")
+    assert "Table: shipments" in full and "Table: audit_log" in full
+    assert "Table: invoices" in pruned and "Table: test_users" in pruned
+    assert "Table: shipments" not in pruned
+    assert "Other tables (2, not shown;" in pruned and "audit_log" in pruned
+    # No match: the full context.
+    assert await layer.build_prompt_context("weather tomorrow") == full
+
+    monkeypatch.setattr(layer_module.settings, "schema_prune_min_tables", 10)
+    assert await layer.build_prompt_context("total invoice amount") == full
@@ -46,3 +46,49 @@ async def test_build_prompt_context_with_semantic_registry(sqlite_adapter) -> No
     ctx = await layer.build_prompt_context()
     assert "test_users" in ctx
     assert "no semantic definition" in ctx or "id" in ctx
+
+
+@pytest.mark.asyncio
+async def test_build_prompt_context_uses_bulk_snapshot(sqlite_adapter, monkeypatch) -> None:
+    """Prompt context is built from one snapshot, not per-table catalog calls."""
+    async def _per_table(*_args, **_kwargs):
+        raise AssertionError("per-table introspection should not be used")
+
+    monkeypatch.setattr(sqlite_adapter, "get_columns", _per_table)
+    monkeypatch.setattr(sqlite_adapter, "get_foreign_keys", _per_table)
+    layer = SemanticLayer(sqlite_adapter, registry=SemanticRegistry())
+    ctx = await layer.build_prompt_context()
+    assert "  - name (TEXT, NOT NULL)" in ctx
+    assert "test_users" in await sqlite_adapter.get_schema_context()
+
+
+@pytest.mark.asyncio
+async def test_build_prompt_context_is_cached_until_schema_changes(sqlite_adapter) -> None:
+    from sqlalchemy import text
+    from src.semantic.layer import get_schema_cache_stats
+
+    layer = SemanticLayer(sqlite_adapter, registry=SemanticRegistry())
+    before = get_schema_cache_stats()
+    first = await layer.build_prompt_context()
+    second = await SemanticLayer(sqlite_adapter, registry=layer._registry).build_prompt_context()
+    assert second == first
+    after = get_schema_cache_stats()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+
+    async with sqlite_adapter._engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE test_audit (id INTEGER PRIMARY KEY)"))
+    rebuilt = await layer.build_prompt_context()
+    assert "test_audit" in rebuilt
+    assert get_schema_cache_stats()["misses"] - after["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_schema_fingerprint_changes_on_ddl(sqlite_adapter) -> None:
+    from sqlalchemy import text
+
+    before = await sqlite_adapter.get_schema_fingerprint()
+    assert before == await sqlite_adapter.get_schema_fingerprint()
+    async with sqlite_adapter._engine.begin() as conn:
+        await conn.execute(text("ALTER TABLE test_users ADD COLUMN email TEXT"))
+    assert await sqlite_adapter.get_schema_fingerprint() != before
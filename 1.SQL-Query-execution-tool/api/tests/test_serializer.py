@@ -0,0 +1,70 @@
+"""
+Tests for src.utils.serializer: database types, both backends and custom encoders.
+"""
+
+import json
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from src.utils import serializer
+
+ROW = (
+    Decimal("12.50"),
+    Decimal("10.00"),
+    Decimal("0.1000000000000000000001"),
+    datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+    date(2024, 5, 1),
+    time(8, 15),
+    timedelta(minutes=1, seconds=30),
+    uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    b"\x00\xff",
+    None,
+)
+EXPECTED = [
+    12.5,
+    10,
+    "0.1000000000000000000001",
+    "2024-05-01T12:30:00+00:00",
+    "2024-05-01",
+    "08:15:00",
+    90.0,
+    "12345678-1234-5678-1234-567812345678",
+    "AP8=",
+    None,
+]
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch) -> str:
+    if request.param == "stdlib":
+        monkeypatch.setattr(serializer, "orjson", None)
+    elif serializer.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+def test_database_types_are_encoded(backend) -> None:
+    payload = {"columns": ["a"], "rows": [ROW]}
+    assert json.loads(serializer.dumps(payload))["rows"] == [EXPECTED]
+    assert serializer.loads(serializer.dumps_bytes(payload))["rows"] == [EXPECTED]
+
+
+def test_non_ascii_is_kept(backend) -> None:
+    assert serializer.dumps({"name": "Zoë"}) == '{"name":"Zoë"}'
+
+
+def test_unknown_type_raises(backend) -> None:
+    with pytest.raises(TypeError):
+        serializer.dumps({"x": object()})
+
+
+def test_register_encoder(backend, monkeypatch) -> None:
+    class Money:
+        def __init__(self, cents: int) -> None:
+            self.cents = cents
+
+    monkeypatch.setitem(serializer._ENCODERS, Money, lambda m: m.cents / 100)
+    assert serializer.dumps([Money(1250)]) == "[12.5]"
@@ -0,0 +1,133 @@
+"""
+Tests for single-flight SQL execution: in-process coalescing and the Redis lock + channel path.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.cache import claims
+from src.cache import single_flight as sf
+from src.cache.redis_client import InMemoryCache
+from src.db.result import ColumnarResult
+
+
+class _FakePubSub:
+    def __init__(self, redis: "_FakeRedis") -> None:
+        self._redis = redis
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    async def subscribe(self, channel: str) -> None:
+        self._redis.subscribers.setdefault(channel, []).append(self._queue)
+
+    async def get_message(self, ignore_subscribe_messages: bool, timeout: float):
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def unsubscribe(self, channel: str) -> None:
+        self._redis.subscribers[channel].remove(self._queue)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class _FakeRedis:
+    """Just enough of redis.asyncio for the lock + pub/sub protocol."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+        self.subscribers: dict[str, list[asyncio.Queue]] = {}
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def exists(self, key):
+        return int(key in self.data)
+
+    def register_script(self, source):
+        # claims.release(): delete the lock only if the token still owns it.
+        async def delete_if_equals(keys, args, client):
+            if client.data.get(keys[0]) == args[0]:
+                del client.data[keys[0]]
+                return 1
+            return 0
+        return delete_if_equals
+
+    async def publish(self, channel, message):
+        for queue in self.subscribers.get(channel, []):
+            queue.put_nowait({"type": "message", "data": message})
+
+    def pubsub(self) -> _FakePubSub:
+        return _FakePubSub(self)
+
+
+def _counting_run(calls: list[int], delay: float = 0.05):
+    async def run() -> ColumnarResult:
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return ColumnarResult(columns=["n"], rows=[(len(calls),)])
+    return run
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_sql_runs_once_in_process() -> None:
+    calls: list[int] = []
+    with patch("src.cache.single_flight.get_redis", new_callable=AsyncMock, return_value=InMemoryCache()):
+        results = await asyncio.gather(
+            *(sf.single_flight("SELECT 1", _counting_run(calls)) for _ in range(5))
+        )
+    assert len(calls) == 1
+    assert all(r.rows == [(1,)] for r in results)
+    assert sf._IN_FLIGHT == {}
+
+
+@pytest.mark.asyncio
+async def test_leader_error_reaches_all_waiters() -> None:
+    async def boom() -> ColumnarResult:
+        await asyncio.sleep(0.05)
+        raise ValueError("bad sql")
+
+    with patch("src.cache.single_flight.get_redis", new_callable=AsyncMock, return_value=InMemoryCache()):
+        results = await asyncio.gather(
+            *(sf.single_flight("SELECT x", boom) for _ in range(3)), return_exceptions=True
+        )
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_hands_over_to_waiter() -> None:
+    calls: list[int] = []
+    with patch("src.cache.single_flight.get_redis", new_callable=AsyncMock, return_value=InMemoryCache()):
+        leader = asyncio.create_task(sf.single_flight("SELECT 2", _counting_run(calls, delay=1)))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(sf.single_flight("SELECT 2", _counting_run(calls, delay=0.01)))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        result = await waiter
+    assert len(calls) == 2
+    assert result.rows == [(2,)]
+
+
+@pytest.mark.asyncio
+async def test_workers_share_result_through_redis_channel(monkeypatch) -> None:
+    monkeypatch.setattr(sf, "_POLL_SECONDS", 0.01)
+    monkeypatch.setattr(claims, "_scripts", {})
+    redis = _FakeRedis()
+    calls: list[int] = []
+    with patch("src.cache.single_flight.get_redis", new_callable=AsyncMock, return_value=redis), \
+         patch("src.cache.claims.get_redis", new_callable=AsyncMock, return_value=redis), \
+         patch("src.cache.single_flight.get_cached_result", new_callable=AsyncMock, return_value=None):
+        key = sf.result_key("SELECT 3")
+        # Call the cross-worker path directly so the in-process map doesn't coalesce first.
+        results = await asyncio.gather(
+            *(sf._run_across_workers("SELECT 3", "", key, _counting_run(calls)) for _ in range(3))
+        )
+    assert len(calls) == 1
+    assert all(r.rows == [(1,)] for r in results)
+    assert redis.data == {}
@@ -46,3 +46,10 @@ def test_export_result_csv_empty_rows_returns_header_only() -> None:
     lines = list(reader)
     assert len(lines) == 1
     assert lines[0] == ["x"]
+
+
+def test_export_result_csv_accepts_columnar_rows() -> None:
+    """Rows given as arrays in column order are written as-is."""
+    result = export_result_csv_tool(columns=["name", "count"], rows=[["a", 1], ["b", 2]])
+    lines = list(csv.reader(io.StringIO(result)))
+    assert lines == [["name", "count"], ["a", "1"], ["b", "2"]]
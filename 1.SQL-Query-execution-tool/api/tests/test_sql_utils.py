@@ -0,0 +1,55 @@
+"""
+Tests for SQL canonicalization / fingerprints and referenced-table extraction.
+"""
+
+import pytest
+
+from src.utils.sql import canonicalize, fingerprint, referenced_tables
+
+
+@pytest.mark.parametrize(
+    ("a", "b"),
+    [
+        ("SELECT  *\n  FROM orders\n", "select * from orders"),
+        ("SELECT * FROM orders; ;", "SELECT * FROM orders"),
+        ("SELECT id -- primary key\nFROM /* all */ orders", "select id from orders"),
+        ("SELECT a FROM t WHERE x>=-2.5e-1", "select a from t where x >= - 2.5e-1"),
+        ("SELECT Name FROM Users", "select name from users"),
+    ],
+)
+def test_equivalent_statements_share_a_fingerprint(a: str, b: str) -> None:
+    assert fingerprint(a) == fingerprint(b)
+
+
+@pytest.mark.parametrize(
+    ("a", "b"),
+    [
+        ("SELECT * FROM users WHERE name = 'Bob'", "SELECT * FROM users WHERE name = 'bob'"),
+        ('SELECT "Name" FROM t', "SELECT name FROM t"),
+        ("SELECT '--not a comment' FROM t", "SELECT '' FROM t"),
+        ("SELECT $$ A $$", "SELECT $$ a $$"),
+        ("SELECT 'it''s A'", "SELECT 'it''s a'"),
+    ],
+)
+def test_literals_and_quoted_identifiers_are_kept_exactly(a: str, b: str) -> None:
+    assert fingerprint(a) != fingerprint(b)
+
+
+def test_canonical_form() -> None:
+    sql = "SELECT a->>'Key', x||Y FROM T\n WHERE id IN (1,2) ;"
+    assert canonicalize(sql) == "select a ->> 'Key' , x || y from t where id in ( 1 , 2 )"
+
+
+@pytest.mark.parametrize(
+    ("sql", "tables"),
+    [
+        ('SELECT o.id FROM public.Orders o JOIN "Customers" c ON c.id = o.cid', {"orders", "customers"}),
+        ("SELECT * FROM a, b AS bb, (SELECT x, y FROM c, d) s WHERE z IN (SELECT 1 FROM e)", {"a", "b", "c", "d", "e"}),
+        ("WITH t AS (SELECT * FROM items) SELECT * FROM t WHERE name = 'from nowhere'", {"items"}),
+        ("SELECT EXTRACT(year FROM created_at), count(*) FROM sales -- from comments", {"sales"}),
+        ("SELECT * FROM `shop`.`orders` LEFT OUTER JOIN refunds USING (id)", {"orders", "refunds"}),
+        ("SELECT 1", set()),
+    ],
+)
+def test_referenced_tables(sql: str, tables: set[str]) -> None:
+    assert referenced_tables(sql) == tables
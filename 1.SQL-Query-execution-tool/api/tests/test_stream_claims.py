@@ -0,0 +1,80 @@
+"""
+Tests for atomic SSE stream claims: exactly-once claiming under parallel EventSource retries.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("deepagents", reason="deepagents not installed; skip chat route tests")
+
+from src.api.routes import chat
+from src.api.schemas import ChatRequest
+from src.cache import claims, redis_client
+from src.cache.memory import InMemoryCache
+
+
+@pytest.fixture
+async def cache(monkeypatch):
+    cache = InMemoryCache(sweep_interval=0)
+    monkeypatch.setattr(redis_client, "_client", cache)
+    yield cache
+    await cache.aclose()
+
+
+@pytest.mark.asyncio
+async def test_parallel_retries_claim_a_stream_exactly_once(cache) -> None:
+    await chat._set_pending("s1", ChatRequest(query="How many users?", session_id="sess"))
+
+    owners = [f"conn-{i}" for i in range(20)]
+    results = await asyncio.gather(*(chat._claim_stream("s1", owner) for owner in owners))
+
+    winners = [(owner, c) for owner, c in zip(owners, results) if c.data is not None]
+    assert len(winners) == 1
+    owner, claim = winners[0]
+    assert claim.index == 0
+    assert ChatRequest.model_validate_json(claim.data).query == "How many users?"
+    assert all(c.index == 0 and c.data is None for c in results if c is not claim)
+
+    # Only the owner can release; afterwards the stream id is spent.
+    await chat._release_stream("s1", "conn-other", approve=False)
+    assert (await chat._claim_stream("s1", "late")).data is None
+    await chat._release_stream("s1", owner, approve=False)
+    assert await chat._claim_stream("s1", "late") is None
+
+
+@pytest.mark.asyncio
+async def test_approve_payload_is_claimed_through_the_second_pair(cache) -> None:
+    await chat._set_approve_pending("s2", "thread-1", "sess", [{"type": "approve"}], {}, datasource="sales")
+
+    claim = await chat._claim_stream("s2", "conn")
+    assert claim.index == 1
+    assert chat._parse_approve(claim.data) == ("thread-1", "sess", [{"type": "approve"}], {}, "records", "sales", False)
+    assert await cache.get("approve_claimed:s2") == "conn"
+
+
+@pytest.mark.asyncio
+async def test_redis_claim_is_one_script_call(monkeypatch) -> None:
+    calls: list[tuple] = []
+
+    class _Script:
+        async def __call__(self, keys, args, client):
+            calls.append((keys, args))
+            return [2, '{"thread_id": "t"}']
+
+    class _Redis:
+        def register_script(self, source):
+            return _Script()
+
+    async def get_redis():
+        return _Redis()
+
+    monkeypatch.setattr(claims, "get_redis", get_redis)
+    monkeypatch.setattr(claims, "_scripts", {})
+    claim = await chat._claim_stream("s3", "conn")
+
+    assert claim == claims.Claim(1, '{"thread_id": "t"}')
+    assert calls == [(
+        ["pending:s3", "claimed:s3", "approve_pending:s3", "approve_claimed:s3"],
+        ["conn", chat._CLAIMED_TTL, chat._APPROVE_CLAIMED_TTL],
+    )]
@@ -8,6 +8,7 @@ from unittest.mock import AsyncMock
 import pytest
 from langgraph.types import Interrupt
 
+from src.agent.event_bus import EventBus
 from src.agent.events import AgentEvent, EventType
 from src.utils.streaming import stream_agent_events
 
@@ -36,10 +37,9 @@ async def test_stream_yields_interrupt_event_when_stream_contains_interrupt():
         # Simulate LangGraph emitting interrupt (e.g. from tool or chain end)
         yield {"event": "on_chain_end", "data": {"output": {"__interrupt__": hitl_payload}}}
 
-    captured: list[AgentEvent] = []
     full_parts: list[str] = []
     out = []
-    async for evt in stream_agent_events(mock_stream(), "How many users?", captured, full_parts):
+    async for evt in stream_agent_events(mock_stream(), "How many users?", EventBus(), full_parts):
         out.append(evt)
 
     interrupt_events = [e for e in out if e.type == EventType.INTERRUPT]
@@ -66,7 +66,7 @@ async def test_stream_yields_interrupt_when_payload_is_interrupt_tuple():
             "data": {"output": {"__interrupt__": (Interrupt(value=hitl_payload, id="it-1"),)}},
         }
 
-    out = [e async for e in stream_agent_events(mock_stream(), "Users by dept", [], [])]
+    out = [e async for e in stream_agent_events(mock_stream(), "Users by dept", EventBus(), [])]
     interrupt_events = [e for e in out if e.type == EventType.INTERRUPT]
     assert len(interrupt_events) == 1
     assert interrupt_events[0].proposed_sql == "SELECT department_id, COUNT(*) FROM users GROUP BY department_id"
@@ -88,7 +88,7 @@ async def test_stream_yields_interrupt_when_tool_name_is_wrapped_alias():
     async def mock_stream():
         yield {"event": "on_chain_end", "data": {"output": {"__interrupt__": hitl_payload}}}
 
-    out = [e async for e in stream_agent_events(mock_stream(), "dept counts", [], [])]
+    out = [e async for e in stream_agent_events(mock_stream(), "dept counts", EventBus(), [])]
     interrupt_events = [e for e in out if e.type == EventType.INTERRUPT]
     assert len(interrupt_events) == 1
     assert interrupt_events[0].proposed_sql == "SELECT d, COUNT(*) FROM t GROUP BY d"
@@ -102,7 +102,7 @@ async def test_stream_keeps_unknown_interrupt_payload_instead_of_dropping():
     async def mock_stream():
         yield {"event": "on_chain_end", "data": {"output": {"__interrupt__": hitl_payload}}}
 
-    out = [e async for e in stream_agent_events(mock_stream(), "q", [], [])]
+    out = [e async for e in stream_agent_events(mock_stream(), "q", EventBus(), [])]
     interrupt_events = [e for e in out if e.type == EventType.INTERRUPT]
     assert len(interrupt_events) == 1
 
@@ -128,7 +128,127 @@ async def test_stream_finds_interrupt_in_deep_nested_payload():
             },
         }
 
-    out = [e async for e in stream_agent_events(mock_stream(), "q", [], [])]
+    out = [e async for e in stream_agent_events(mock_stream(), "q", EventBus(), [])]
     interrupt_events = [e for e in out if e.type == EventType.INTERRUPT]
     assert len(interrupt_events) == 1
     assert interrupt_events[0].proposed_sql == "SELECT 1"
+
+
+@pytest.mark.asyncio
+async def test_tool_events_are_yielded_while_the_tool_runs():
+    """Events published on the bus reach the consumer before the graph moves on."""
+    bus = EventBus()
+    tool_may_finish = asyncio.Event()
+
+    async def mock_stream():
+        yield {"event": "on_chat_model_stream", "data": {"chunk": type("C", (), {"content": "Plan: count"})()}}
+        yield {"event": "on_tool_start", "name": "task"}
+        bus.append(AgentEvent(type=EventType.SQL, content="SELECT 1"))
+        await tool_may_finish.wait()  # the query is still running
+        bus.append(AgentEvent(type=EventType.RESULT, columns=["n"], rows=[[1]], row_count=1))
+        yield {"event": "on_tool_end", "name": "task"}
+        yield {"event": "on_chat_model_stream", "data": {"chunk": type("C", (), {"content": "One."})()}}
+
+    stream = stream_agent_events(mock_stream(), "q", bus, [])
+    assert (await anext(stream)).type == EventType.PLAN
+    sql = await asyncio.wait_for(anext(stream), timeout=1)
+    assert sql.type == EventType.SQL
+    tool_may_finish.set()
+    rest = [e.type async for e in stream]
+    assert rest == [EventType.RESULT, EventType.ANSWER_DELTA, EventType.ANSWER]
+
+
+@pytest.mark.asyncio
+async def test_answer_tokens_stream_as_deltas_after_the_last_tool():
+    def token(text):
+        return {"event": "on_chat_model_stream", "data": {"chunk": type("C", (), {"content": text})()}}
+
+    async def mock_stream():
+        yield token("Plan")
+        yield {"event": "on_tool_start", "name": "task"}
+        yield {"event": "on_tool_start", "name": "execute_sql_query"}
+        yield token("subagent summary")  # the task tool is still running
+        yield {"event": "on_tool_end", "name": "execute_sql_query"}
+        yield {"event": "on_tool_end", "name": "task"}
+        yield token("Let me check again.")  # reasoning: another tool follows
+        yield {"event": "on_tool_start", "name": "task"}
+        yield {"event": "on_tool_end", "name": "task"}
+        yield token("There are ")
+        yield token("42 orders.")
+
+    out = await _collect(stream_agent_events(mock_stream(), "q", EventBus(), []))
+    streamed = [(e.type, e.content) for e in out if e.type in (EventType.ANSWER_DELTA, EventType.ANSWER_RESET)]
+    assert streamed == [
+        (EventType.ANSWER_DELTA, "subagent summary"),
+        (EventType.ANSWER_DELTA, "Let me check again."),
+        (EventType.ANSWER_RESET, None),
+        (EventType.ANSWER_DELTA, "There are "),
+        (EventType.ANSWER_DELTA, "42 orders."),
+    ]
+    last_reset = max(i for i, e in enumerate(out) if e.type == EventType.ANSWER_RESET)
+    deltas = [e.content for e in out[last_reset:] if e.type == EventType.ANSWER_DELTA]
+    assert out[-1] == AgentEvent(type=EventType.ANSWER, content="".join(deltas).strip())
+    assert out[-1].content == "There are 42 orders."
+
+
+@pytest.mark.asyncio
+async def test_interrupt_withdraws_answer_deltas_already_sent():
+    async def mock_stream():
+        yield {"event": "on_tool_start", "name": "task"}
+        yield {"event": "on_tool_end", "name": "task"}
+        yield {"event": "on_chat_model_stream", "data": {"chunk": type("C", (), {"content": "Checking"})()}}
+        yield {
+            "event": "on_chain_stream",
+            "data": {"chunk": {"__interrupt__": ({"action_requests": [
+                {"name": "execute_sql_query", "args": {"sql": "SELECT 1"}}
+            ]},)}},
+        }
+
+    out = await _collect(stream_agent_events(mock_stream(), "q", EventBus(), []))
+    assert [e.type for e in out] == [
+        EventType.ANSWER_DELTA, EventType.ANSWER_RESET, EventType.INTERRUPT
+    ]
+
+
+@pytest.mark.asyncio
+async def test_no_answer_deltas_after_an_interrupt():
+    async def mock_stream():
+        yield {"event": "on_tool_start", "name": "task"}
+        yield {"event": "on_tool_end", "name": "task"}
+        yield {
+            "event": "on_chain_stream",
+            "data": {"chunk": {"__interrupt__": ({"action_requests": [
+                {"name": "execute_sql_query", "args": {"sql": "SELECT 1"}}
+            ]},)}},
+        }
+        yield {"event": "on_chat_model_stream", "data": {"chunk": type("C", (), {"content": "x"})()}}
+
+    out = await _collect(stream_agent_events(mock_stream(), "q", EventBus(), []))
+    assert [e.type for e in out] == [EventType.INTERRUPT]
+
+
+@pytest.mark.asyncio
+async def test_graph_errors_propagate_and_closing_stops_the_graph():
+    async def failing_stream():
+        yield {"event": "on_chain_start"}
+        raise RuntimeError("graph failed")
+
+    with pytest.raises(RuntimeError, match="graph failed"):
+        await _collect(stream_agent_events(failing_stream(), "q", EventBus(), []))
+
+    closed = asyncio.Event()
+
+    async def endless_stream():
+        try:
+            while True:
+                yield {"event": "on_chat_model_stream", "data": {"chunk": type("C", (), {"content": "x"})()}}
+                await asyncio.sleep(0)
+        finally:
+            closed.set()
+
+    bus = EventBus()
+    bus.append(AgentEvent(type=EventType.THINKING, content="first"))
+    stream = stream_agent_events(endless_stream(), "q", bus, [])
+    assert (await anext(stream)).type == EventType.THINKING
+    await stream.aclose()
+    await asyncio.wait_for(closed.wait(), timeout=1)
@@ -0,0 +1,141 @@
+"""
+Tests for the L1 (per-worker) result cache in front of Redis and its pub/sub invalidation.
+"""
+
+import asyncio
+import pytest
+
+from src.cache import redis_client
+from src.cache.tiered import INVALIDATION_CHANNEL, L1Cache
+from src.db.result import ColumnarResult
+
+
+class _FakePubSub:
+    def __init__(self, redis: "_FakeRedis") -> None:
+        self._redis = redis
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    async def subscribe(self, channel: str) -> None:
+        self._redis.subscribers.setdefault(channel, []).append(self._queue)
+        self._queue.put_nowait({"type": "subscribe", "data": 1})
+
+    async def listen(self):
+        while True:
+            yield await self._queue.get()
+
+    async def aclose(self) -> None:
+        for queues in self._redis.subscribers.values():
+            if self._queue in queues:
+                queues.remove(self._queue)
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+        self.subscribers: dict[str, list[asyncio.Queue]] = {}
+        self.gets = 0
+
+    async def get(self, key):
+        self.gets += 1
+        return self.data.get(key)
+
+    async def mget(self, *keys):
+        self.gets += 1
+        return [self.data.get(key) for key in keys]
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def set(self, key, value, ex=None, get=False):
+        previous = self.data.get(key)
+        self.data[key] = value
+        return previous if get else True
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def publish(self, channel, message):
+        for queue in self.subscribers.get(channel, []):
+            queue.put_nowait({"type": "message", "data": message})
+
+    def pubsub(self) -> _FakePubSub:
+        return _FakePubSub(self)
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+async def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(redis_client, "_client", redis)
+    monkeypatch.setattr(redis_client, "_bytes_client", redis)
+    monkeypatch.setattr(redis_client, "_l1", None)
+    yield redis
+    if redis_client._l1 is not None:
+        await redis_client._l1.close()
+
+
+@pytest.mark.asyncio
+async def test_hot_key_is_served_from_l1(fake_redis) -> None:
+    result = ColumnarResult(columns=["n"], rows=[(1,)])
+    await redis_client.set_cached_result("SELECT 1", result)
+    for _ in range(3):
+        assert (await redis_client.get_cached_result("SELECT 1")).rows == [(1,)]
+    assert fake_redis.gets == 0
+    assert redis_client.get_result_cache_stats()["hits"] == 3
+
+
+@pytest.mark.asyncio
+async def test_l2_hit_populates_l1(fake_redis) -> None:
+    await redis_client.set_cached_result("SELECT 2", ColumnarResult(columns=["n"], rows=[(2,)]))
+    await redis_client._l1._cache.flushdb()
+    await redis_client.get_cached_result("SELECT 2")
+    await redis_client.get_cached_result("SELECT 2")
+    assert fake_redis.gets == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_key_is_canonical_and_per_database(fake_redis) -> None:
+    await redis_client.set_cached_result("SELECT 4 AS n", ColumnarResult(columns=["n"], rows=[(4,)]), "db1")
+    hit = await redis_client.get_cached_result("select 4\n  as N; -- again", "db1")
+    assert hit is not None and hit.rows == [(4,)]
+    assert await redis_client.get_cached_result("SELECT 4 AS n", "db2") is None
+
+
+@pytest.mark.asyncio
+async def test_overwrite_in_one_worker_invalidates_other_workers() -> None:
+    redis = _FakeRedis()
+    worker_a = L1Cache(max_bytes=1024, ttl_seconds=60)
+    worker_b = L1Cache(max_bytes=1024, ttl_seconds=60)
+    worker_a.attach(redis)
+    worker_b.attach(redis)
+    await _settle()
+    assert len(redis.subscribers[INVALIDATION_CHANNEL]) == 2
+
+    await worker_a.put("k", "old", 60)
+    await worker_b.put("k", "old", 60)
+    await worker_a.invalidate(redis, "k")
+    await worker_a.put("k", "new", 60)
+    await _settle()
+
+    assert await worker_b.get("k") is None
+    # The publishing worker ignores its own message and keeps the new value.
+    assert await worker_a.get("k") == "new"
+    await worker_a.close()
+    await worker_b.close()
+
+
+@pytest.mark.asyncio
+async def test_l1_disabled_for_in_memory_client(monkeypatch) -> None:
+    from src.cache.memory import InMemoryCache
+
+    cache = InMemoryCache()
+    monkeypatch.setattr(redis_client, "_client", cache)
+    monkeypatch.setattr(redis_client, "_l1", None)
+    await redis_client.set_cached_result("SELECT 3", ColumnarResult(columns=["n"], rows=[(3,)]))
+    assert (await redis_client.get_cached_result("SELECT 3")).rows == [(3,)]
+    assert redis_client._l1 is None
+    await cache.aclose()